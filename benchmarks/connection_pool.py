@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+#  connection_pool.py
+"""
+Count the connections opened by :meth:`PyPIJSON.get_many_metadata <pypi_json.PyPIJSON.get_many_metadata>`
+against a local server, for different connection pool sizes.
+
+When more threads make requests at once than the pool can hold,
+urllib3 discards the surplus connections once each request finishes, and opens new ones for later requests.
+The number of workers should exceed the default pool size (10) to show this;
+each discarded connection is reported as a "pool is full" discard.
+
+Usage:
+
+.. code-block:: bash
+
+	$ python benchmarks/connection_pool.py [--requests N] [--workers N]
+"""
+
+# stdlib
+import argparse
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# this package
+from pypi_json import PyPIJSON
+
+BODY = b'{"info": {"name": "foo", "version": "1.0"}, "last_serial": 1}'
+
+
+class CountingServer(ThreadingHTTPServer):
+	"""
+	A HTTP server which counts the connections made to it.
+	"""
+
+	daemon_threads = True
+	request_queue_size = 256
+	connections = 0
+
+	def process_request(self, request, client_address) -> None:  # noqa: MAN001
+		self.connections += 1
+		super().process_request(request, client_address)
+
+
+class Handler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def do_GET(self) -> None:  # noqa: N802
+		# Simulate the server's response time, so that requests overlap.
+		time.sleep(0.02)
+		self.send_response(200)
+		if self.headers.get("Connection", '').lower() == "close":
+			self.send_header("Connection", "close")
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(BODY)))
+		self.end_headers()
+		self.wfile.write(BODY)
+
+	def log_message(self, *args) -> None:  # noqa: MAN002
+		pass
+
+
+class DiscardCounter(logging.Handler):
+	"""
+	Counts urllib3's "Connection pool is full, discarding connection" warnings.
+	"""
+
+	discards = 0
+
+	def emit(self, record: logging.LogRecord) -> None:
+		if record.getMessage().startswith("Connection pool is full"):
+			self.discards += 1
+
+
+def run(
+		endpoint: str,
+		server: CountingServer,
+		counter: DiscardCounter,
+		requests: int,
+		workers: int,
+		pool_maxsize: Optional[int],
+		keep_alive: bool = True,
+		) -> None:
+	server.connections = 0
+	counter.discards = 0
+	projects = [f"project-{i}" for i in range(requests)]
+
+	with PyPIJSON(endpoint, pool_maxsize=pool_maxsize, keep_alive=keep_alive) as client:
+		start = time.perf_counter()
+		for _, result in client.get_many_metadata(projects, max_workers=workers):
+			if isinstance(result, Exception):
+				raise result
+		elapsed = time.perf_counter() - start
+
+	label = f"pool_maxsize={pool_maxsize or 'default'}, keep_alive={keep_alive}"
+	print(
+			f"{label:<40} {server.connections:>6} connections {counter.discards:>6} discards "
+			f"{elapsed * 1000:>8.1f} ms"
+			)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--requests", type=int, default=500, help="The number of requests to make.")
+	parser.add_argument(
+			"--workers",
+			type=int,
+			default=32,
+			help="The number of threads making requests. Should exceed the default pool size of 10.",
+			)
+	args = parser.parse_args()
+
+	# Count urllib3's "Connection pool is full" warnings rather than printing them.
+	counter = DiscardCounter()
+	pool_logger = logging.getLogger("urllib3.connectionpool")
+	pool_logger.addHandler(counter)
+	pool_logger.propagate = False
+
+	server = CountingServer(("127.0.0.1", 0), Handler)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	endpoint = f"http://127.0.0.1:{server.server_address[1]}/pypi"
+
+	print(f"{args.requests} requests from {args.workers} threads\n")
+	run(endpoint, server, counter, args.requests, args.workers, None)
+	run(endpoint, server, counter, args.requests, args.workers, args.workers)
+	run(endpoint, server, counter, args.requests, args.workers, args.workers, keep_alive=False)
+
+	server.shutdown()
+
+
+if __name__ == "__main__":
+	main()
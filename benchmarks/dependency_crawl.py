@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+#
+#  dependency_crawl.py
+"""
+Compare crawling a dependency graph one project at a time with :func:`pypi_json.dependencies.crawl_dependencies`,
+against a local server which adds a fixed latency to each response.
+
+Usage:
+
+.. code-block:: bash
+
+	$ python benchmarks/dependency_crawl.py [--projects N] [--latency MS] [--workers N]
+"""
+
+# stdlib
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+# 3rd party
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.dependencies import crawl_dependencies
+
+
+def make_graph(projects: int, seed: int = 0) -> Dict[str, List[str]]:
+	"""
+	Returns a random acyclic graph in which every project is reachable from ``project-0``.
+	"""
+
+	rng = random.Random(seed)
+	graph: Dict[str, List[str]] = {f"project-{i}": [] for i in range(projects)}
+
+	for i in range(1, projects):
+		parent = rng.randrange(max(0, i - 40), i)
+		graph[f"project-{parent}"].append(f"project-{i}")
+
+	for i in range(projects):
+		for j in rng.sample(range(i + 1, projects), min(2, projects - i - 1)):
+			graph[f"project-{i}"].append(f"project-{j}")
+
+	return graph
+
+
+class Server(ThreadingHTTPServer):
+	daemon_threads = True
+	request_queue_size = 256
+	latency = 0.02
+	graph: Dict[str, List[str]] = {}
+
+
+class Handler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+	server: Server
+
+	# Send the headers and body together, so Nagle's algorithm doesn't add a delay before the body.
+	wbufsize = -1
+
+	def do_GET(self) -> None:  # noqa: N802
+		time.sleep(self.server.latency)
+		name = self.path.split('/')[2]
+		document = {
+				"info": {"name": name, "version": "1.0", "requires_dist": self.server.graph[name]},
+				"last_serial": 1,
+				"releases": {"1.0": []},
+				"urls": [],
+				}
+		body = json.dumps(document).encode("UTF-8")
+		self.send_response(200)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args) -> None:  # noqa: MAN002
+		pass
+
+
+def crawl_serially(client: PyPIJSON, root: str) -> int:
+	seen = {root}
+	queue = deque([root])
+
+	while queue:
+		metadata = client.get_metadata(queue.popleft())
+		for requirement in metadata.info["requires_dist"] or []:
+			name = canonicalize_name(Requirement(requirement).name)
+			if name not in seen:
+				seen.add(name)
+				queue.append(name)
+
+	return len(seen)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--projects", type=int, default=300, help="The number of projects in the graph.")
+	parser.add_argument("--latency", type=float, default=20, help="The latency of each response, in milliseconds.")
+	parser.add_argument("--workers", type=int, default=32, help="The number of threads making requests.")
+	args = parser.parse_args()
+
+	server = Server(("127.0.0.1", 0), Handler)
+	server.latency = args.latency / 1000
+	server.graph = make_graph(args.projects)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	endpoint = f"http://127.0.0.1:{server.server_address[1]}/pypi"
+
+	with PyPIJSON(endpoint) as client:
+		start = time.perf_counter()
+		count = crawl_serially(client, "project-0")
+		elapsed = time.perf_counter() - start
+	print(f"{'serial':<24} {count:>5} projects {elapsed * 1000:>9.1f} ms")
+
+	with PyPIJSON(endpoint, pool_maxsize=args.workers) as client:
+		start = time.perf_counter()
+		graph = crawl_dependencies(client, ["project-0"], max_workers=args.workers)
+		elapsed = time.perf_counter() - start
+	depth = max(node.depth for node in graph.nodes.values())
+	print(f"{'crawl_dependencies':<24} {len(graph):>5} projects {elapsed * 1000:>9.1f} ms ({depth + 1} levels)")
+
+	server.shutdown()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+#
+#  json_decoders.py
+"""
+Compare the JSON decoders in :mod:`pypi_json.decoders` on the large responses recorded in ``tests/cassettes``.
+
+Usage:
+
+.. code-block:: bash
+
+	$ python benchmarks/json_decoders.py [--repeat N]
+"""
+
+# stdlib
+import argparse
+import base64
+import gzip
+import json
+import pathlib
+import timeit
+from typing import Iterator, Tuple
+
+# this package
+from pypi_json import ProjectMetadata
+from pypi_json.decoders import available_decoders
+
+CASSETTES_DIR = pathlib.Path(__file__).parent.parent / "tests" / "cassettes"
+
+
+def iter_documents(min_size: int = 100_000) -> Iterator[Tuple[str, bytes]]:
+	"""
+	Yield the URL and decompressed body of each recorded JSON API response larger than ``min_size`` bytes.
+	"""
+
+	for cassette in sorted(CASSETTES_DIR.glob("*.json")):
+		for interaction in json.loads(cassette.read_text())["http_interactions"]:
+			response = interaction["response"]
+			if response["status"]["code"] != 200:
+				continue
+
+			body = response["body"]
+			if "base64_string" in body:
+				content = base64.b64decode(body["base64_string"])
+			else:
+				content = body["string"].encode("UTF-8")
+
+			headers = {k.lower(): v for k, v in response["headers"].items()}
+			if headers.get("content-encoding") == ["gzip"]:
+				content = gzip.decompress(content)
+
+			if len(content) >= min_size:
+				yield interaction["request"]["uri"], content
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+	parser.add_argument("--repeat", type=int, default=20, help="Number of times to decode each document.")
+	args = parser.parse_args()
+
+	decoders = available_decoders()
+	print(f"{'document':<45} {'size':>10}  " + "  ".join(f"{name:>10}" for name in decoders))
+
+	for url, content in iter_documents():
+		timings = []
+
+		for decoder in decoders.values():
+			elapsed = timeit.timeit(lambda: ProjectMetadata(**decoder(content)), number=args.repeat)
+			timings.append(elapsed / args.repeat * 1000)
+
+		print(
+				f"{url[len('https://pypi.org/pypi/'):]:<45} {len(content):>10,}  "
+				+ "  ".join(f"{t:>8.2f}ms" for t in timings)
+				)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+#
+#  rate_limiter.py
+"""
+Compare urllib3 retries with a :class:`~pypi_json.ratelimit.RateLimiter` against a local server
+which throttles clients making too many requests at once.
+
+The server handles up to ``--capacity`` requests at once,
+and responds to any more with ``429 Too Many Requests`` and a ``Retry-After`` header.
+
+Usage:
+
+.. code-block:: bash
+
+	$ python benchmarks/rate_limiter.py [--requests N] [--workers N] [--capacity N]
+"""
+
+# stdlib
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.ratelimit import RateLimiter
+from pypi_json.transport import make_retry
+
+BODY = b'{"info": {"name": "foo", "version": "1.0"}, "last_serial": 1}'
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+	"""
+	A HTTP server which throttles requests beyond its capacity.
+	"""
+
+	daemon_threads = True
+	request_queue_size = 256
+	capacity = 8
+	active = 0
+	throttled = 0
+
+	def __init__(self, *args, **kwargs) -> None:  # noqa: MAN002
+		super().__init__(*args, **kwargs)
+		self.lock = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+	server: ThrottlingServer
+
+	def do_GET(self) -> None:  # noqa: N802
+		with self.server.lock:
+			throttle = self.server.active >= self.server.capacity
+			if throttle:
+				self.server.throttled += 1
+			else:
+				self.server.active += 1
+
+		if throttle:
+			self.send_response(429)
+			self.send_header("Retry-After", '1')
+			self.send_header("Content-Length", '0')
+			self.end_headers()
+			return
+
+		try:
+			time.sleep(0.02)
+			self.send_response(200)
+			self.send_header("Content-Type", "application/json")
+			self.send_header("Content-Length", str(len(BODY)))
+			self.end_headers()
+			self.wfile.write(BODY)
+		finally:
+			with self.server.lock:
+				self.server.active -= 1
+
+	def log_message(self, *args) -> None:  # noqa: MAN002
+		pass
+
+
+def run(label: str, client: PyPIJSON, server: ThrottlingServer, requests: int, workers: int) -> None:
+	server.throttled = 0
+	projects = [f"project-{i}" for i in range(requests)]
+	failures = 0
+
+	with client:
+		start = time.perf_counter()
+		for _, result in client.get_many_metadata(projects, max_workers=workers):
+			if isinstance(result, Exception):
+				failures += 1
+		elapsed = time.perf_counter() - start
+
+	print(f"{label:<24} {server.throttled:>5} throttled {failures:>5} failed {elapsed * 1000:>9.1f} ms")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--requests", type=int, default=500, help="The number of requests to make.")
+	parser.add_argument("--workers", type=int, default=32, help="The number of threads making requests.")
+	parser.add_argument("--capacity", type=int, default=8, help="The number of requests the server handles at once.")
+	args = parser.parse_args()
+
+	server = ThrottlingServer(("127.0.0.1", 0), Handler)
+	server.capacity = args.capacity
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	endpoint = f"http://127.0.0.1:{server.server_address[1]}/pypi"
+
+	print(f"{args.requests} requests from {args.workers} threads, server capacity {args.capacity}\n")
+
+	client = PyPIJSON(endpoint, pool_maxsize=args.workers, retries=make_retry(10))
+	run("urllib3 retries", client, server, args.requests, args.workers)
+
+	rate_limiter = RateLimiter(max_concurrency=args.workers, max_retries=10)
+	client = PyPIJSON(endpoint, pool_maxsize=args.workers, rate_limiter=rate_limiter)
+	run("RateLimiter", client, server, args.requests, args.workers)
+
+	rate_limiter = RateLimiter(max_concurrency=args.workers, max_retries=10, pause_on_throttle=True)
+	client = PyPIJSON(endpoint, pool_maxsize=args.workers, rate_limiter=rate_limiter)
+	run("RateLimiter (pause)", client, server, args.requests, args.workers)
+
+	server.shutdown()
+
+
+if __name__ == "__main__":
+	main()
@@ -32,8 +32,30 @@ PyPI JSON API client library.
 #
 
 # stdlib
+import json
+import os
 import platform
-from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, NamedTuple, Optional, Tuple, Union
+import re
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import (
+		IO,
+		TYPE_CHECKING,
+		Any,
+		ClassVar,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		NamedTuple,
+		Optional,
+		Tuple,
+		Union
+		)
 
 # 3rd party
 import requests
@@ -41,10 +63,27 @@ from apeye import URL
 from apeye.requests_url import RequestsURL, TrailingRequestsURL
 from packaging.requirements import InvalidRequirement
 from packaging.tags import Tag
-from packaging.utils import canonicalize_name, parse_wheel_filename
+from packaging.utils import canonicalize_name
 from packaging.version import Version
+from urllib3.util.retry import Retry
 
 # this package
+from pypi_json._concurrency import SingleFlight, imap_unordered
+from pypi_json.cache import DiskCache, MemoryCache
+from pypi_json.core_metadata import DEFAULT_BLOCK_SIZE, get_core_metadata
+from pypi_json.decoders import JSONDecoder, get_decoder
+from pypi_json.download import (
+		DEFAULT_CHUNK_SIZE,
+		DownloadResult,
+		FileLike,
+		ProgressCallback,
+		download_files,
+		stream_download
+		)
+from pypi_json.metrics import MetricsCallback, RequestMetrics, get_retry_count
+from pypi_json.ratelimit import RateLimiter
+from pypi_json.store import MetadataStore
+from pypi_json.transport import configure_session
 from pypi_json.typehints import (
 		DistributionPackageDict,
 		FileURL,
@@ -53,6 +92,8 @@ from pypi_json.typehints import (
 		Self,
 		VulnerabilityInfoDict
 		)
+from pypi_json.versions import VersionIndex
+from pypi_json.wheels import TagPriorities, WheelTagIndex, tag_priorities
 
 # from urllib.parse import urlparse, urlunparse
 
@@ -66,7 +107,7 @@ __license__: str = "MIT License"
 __version__: str = "0.5.0.post1"
 __email__: str = "dominic@davis-foster.co.uk"
 
-__all__ = ["PyPIJSON", "ProjectMetadata", "USER_AGENT"]
+__all__ = ["PyPIJSON", "ProjectMetadata", "LazyProjectMetadata", "ReleaseFile", "ReleaseInfo", "USER_AGENT"]
 
 #: The User-Agent header used for requests; not used when the user provides their own session object.
 USER_AGENT: str = ' '.join([
@@ -76,29 +117,113 @@ USER_AGENT: str = ' '.join([
 		])
 
 
-class ProjectMetadata(NamedTuple):
+_last_serial_re = re.compile(rb'"last_serial"\s*:\s*(\d+)')
+
+
+def _get_last_serial(response: requests.Response) -> Optional[int]:
+	# Prefer the header, as it avoids scanning the body.
+	header = response.headers.get("X-PyPI-Last-Serial")
+	if header is not None and header.isdigit():
+		return int(header)
+
+	match = _last_serial_re.search(response.content)
+	if match is None:
+		return None
+
+	return int(match.group(1))
+
+
+class ReleaseFile(NamedTuple):
 	"""
-	Represents a project's metadata from the PyPI JSON API.
+	A file belonging to one of a project's releases.
 
-	:param info: Generic information about a specific version of a project.
+	Yielded by :meth:`ProjectMetadata.iter_release_files`.
 
-	:bold-title:`Attributes:`
+	.. versionadded:: 0.6.0
+	"""
 
-	.. autosummary::
+	#: The release's key in :attr:`ProjectMetadata.releases`.
+	version: str
 
-		~pypi_json.ProjectMetadata.name
-		~pypi_json.ProjectMetadata.version
+	#: The URL from which the file can be downloaded.
+	url: str
 
-	**Methods:**
+	#: The sha256 digest of the file.
+	digest: str
 
-	.. autosummary::
 
-		~pypi_json.ProjectMetadata.get_latest_version
-		~pypi_json.ProjectMetadata.get_releases_with_digests
-		~pypi_json.ProjectMetadata.get_releases
-		~pypi_json.ProjectMetadata.get_wheel_tag_mapping
+class ReleaseInfo(NamedTuple):
+	"""
+	Details of one of a project's releases, derived from :attr:`ProjectMetadata.releases`.
+
+	Returned by :meth:`ProjectMetadata.get_release_info` and :meth:`PyPIJSON.get_release_info`.
+
+	.. versionadded:: 0.6.0
 	"""
 
+	#: The release's key in :attr:`ProjectMetadata.releases`.
+	version: str
+
+	#: The files associated with the release.
+	files: List[DistributionPackageDict]
+
+	#: Whether the release has been yanked, as defined in :pep:`592`.
+	#: A release is considered yanked if it has files and all of them have been yanked.
+	yanked: bool = False
+
+	#: The reason given for yanking the release, if any.
+	yanked_reason: Optional[str] = None
+
+	#: The Python versions supported by the release, taken from its files.
+	requires_python: Optional[str] = None
+
+	#: The time the first file of the release was uploaded, in ISO 8601 format.
+	upload_time: Optional[str] = None
+
+	#: The release's requirements, or :py:obj:`None` if they were not fetched.
+	#: An empty list means the release has no requirements.
+	requires_dist: Optional[List[str]] = None
+
+	#: Known vulnerabilities affecting the release, or :py:obj:`None` if they were not fetched.
+	vulnerabilities: Optional[List[VulnerabilityInfoDict]] = None
+
+	@classmethod
+	def from_files(cls, version: str, files: List[DistributionPackageDict]) -> "ReleaseInfo":
+		"""
+		Construct a :class:`~.ReleaseInfo` from a release's entry in :attr:`ProjectMetadata.releases`.
+
+		:param version:
+		:param files:
+		"""
+
+		yanked = bool(files) and all(file.get("yanked", False) for file in files)
+		yanked_reason = None
+		requires_python = None
+		upload_times = []
+
+		for file in files:
+			if yanked_reason is None and file.get("yanked_reason"):
+				yanked_reason = file["yanked_reason"]
+			if requires_python is None and file.get("requires_python"):
+				requires_python = file["requires_python"]
+			upload_time = file.get("upload_time_iso_8601") or file.get("upload_time")
+			if upload_time:
+				upload_times.append(upload_time)
+
+		return cls(
+				version=version,
+				files=files,
+				yanked=yanked,
+				yanked_reason=yanked_reason if yanked else None,
+				requires_python=requires_python,
+				upload_time=min(upload_times) if upload_times else None,
+				)
+
+
+class _ProjectMetadata(NamedTuple):
+	# The fields of :class:`~.ProjectMetadata`.
+	# They are kept on a separate base class so that subclasses can memoize values in the instance ``__dict__``.
+
 	#: Generic information about a specific version of a project.
 	info: ProjectInfoDict
 
@@ -131,6 +256,45 @@ class ProjectMetadata(NamedTuple):
 	(*New in version 0.5.0*)
 	"""
 
+
+class ProjectMetadata(_ProjectMetadata):
+	"""
+	Represents a project's metadata from the PyPI JSON API.
+
+	:param info: Generic information about a specific version of a project.
+
+	:bold-title:`Attributes:`
+
+	.. autosummary::
+
+		~pypi_json.ProjectMetadata.name
+		~pypi_json.ProjectMetadata.version
+		~pypi_json.ProjectMetadata.version_index
+
+	**Methods:**
+
+	.. autosummary::
+
+		~pypi_json.ProjectMetadata.get_latest_version
+		~pypi_json.ProjectMetadata.iter_release_files
+		~pypi_json.ProjectMetadata.get_release_info
+		~pypi_json.ProjectMetadata.get_releases_with_digests
+		~pypi_json.ProjectMetadata.get_releases
+		~pypi_json.ProjectMetadata.get_wheel_tag_mapping
+		~pypi_json.ProjectMetadata.select_best_wheel
+		~pypi_json.ProjectMetadata.get_wheel_availability
+
+	.. versionchanged:: 0.6.0
+
+		Parsed versions, and the results of :meth:`~.ProjectMetadata.get_releases` and
+		:meth:`~.ProjectMetadata.get_releases_with_digests`, are now memoized on the instance.
+		See :attr:`~.ProjectMetadata.version_index`.
+	"""
+
+	def __getstate__(self) -> None:
+		# Memoized values are not pickled; they are rebuilt on demand.
+		return None
+
 	@property
 	def name(self) -> str:
 		"""
@@ -145,7 +309,32 @@ class ProjectMetadata(NamedTuple):
 		Return the release version.
 		"""
 
-		return Version(self.info["version"])
+		try:
+			return self.__dict__["_version"]
+		except KeyError:
+			version = self.__dict__["_version"] = Version(self.info["version"])
+			return version
+
+	@property
+	def version_index(self) -> VersionIndex:
+		"""
+		A sorted index of the versions in :attr:`~.ProjectMetadata.releases`.
+
+		The index is built on first access and reused afterwards.
+
+		.. versionadded:: 0.6.0
+		"""
+
+		try:
+			return self.__dict__["_version_index"]
+		except KeyError:
+			pass
+
+		if self.releases is None:
+			self._raise_missing_releases_key()
+
+		index = self.__dict__["_version_index"] = VersionIndex(self.releases)
+		return index
 
 	def _raise_missing_releases_key(self) -> "NoReturn":
 		raise DeprecationWarning(
@@ -153,48 +342,157 @@ class ProjectMetadata(NamedTuple):
 				"Please call the .get_metadata() method without supplying a version.",
 				)
 
-	def get_latest_version(self) -> Version:
+	def get_latest_version(self, *, prereleases: bool = True, yanked: bool = True) -> Version:
 		"""
 		Returns the version number of the latest release on PyPI for this project.
 
 		Version numbers are sorted using the rules in :pep:`386`.
+
+		.. versionchanged:: 0.6.0
+
+			Added the ``prereleases`` and ``yanked`` keyword arguments.
+
+		:param prereleases: Whether to consider pre-releases and development releases.
+		:param yanked: Whether to consider versions which have been yanked.
+
+		:raises ValueError: If no versions match.
+		"""
+
+		latest = self.version_index.latest(prereleases=prereleases, yanked=yanked)
+		if latest is None:
+			raise ValueError("No matching versions found.")
+		return latest
+
+	def iter_release_files(self, version: Union[str, Version, None] = None) -> Iterator[ReleaseFile]:
+		"""
+		Iterate over the files of the project's releases, without copying :attr:`~.ProjectMetadata.releases`.
+
+		.. versionadded:: 0.6.0
+
+		:param version: If given, only the files for this version are returned.
+
+		:raises InvalidRequirement: If ``version`` cannot be found.
 		"""
 
 		if self.releases is None:
 			self._raise_missing_releases_key()
-		return max(map(Version, self.releases))
 
-	def get_releases_with_digests(self) -> Dict[str, List[FileURL]]:
-		"""
-		Returns a dictionary mapping PyPI release versions to download URLs and the sha256sum of the file contents.
+		if version is None:
+			releases: Iterable[Tuple[str, List[DistributionPackageDict]]] = self.releases.items()
+		else:
+			key = self._get_release_key(version)
+			releases = [(key, self.releases[key])]
+
+		for release, release_data in releases:
+			for file in release_data:
+				yield ReleaseFile._make((release, file["url"], file["digests"]["sha256"]))
+
+	def get_release_info(
+			self,
+			versions: Optional[Iterable[Union[str, Version]]] = None,
+			) -> Dict[str, ReleaseInfo]:
 		"""
+		Returns details of the project's releases, derived from :attr:`~.ProjectMetadata.releases`
+		without making any further requests.
+
+		The :attr:`~.ReleaseInfo.requires_dist` and :attr:`~.ReleaseInfo.vulnerabilities` fields are only available
+		for the release described by :attr:`~.ProjectMetadata.info`, and are :py:obj:`None` for the others.
+		Use :meth:`PyPIJSON.get_release_info <.PyPIJSON.get_release_info>` to fetch them for every release.
+
+		.. versionadded:: 0.6.0
+
+		:param versions: The versions to return details for. If :py:obj:`None` all releases are included.
+
+		:returns: A mapping of release keys in :attr:`~.ProjectMetadata.releases` to :class:`~.ReleaseInfo` objects.
+
+		:raises InvalidRequirement: If one of ``versions`` cannot be found.
+		"""  # noqa: D400
 
 		if self.releases is None:
 			self._raise_missing_releases_key()
 
-		pypi_releases = {}
+		if versions is None:
+			keys: Iterable[str] = self.releases
+		else:
+			keys = map(self._get_release_key, versions)
 
-		for release, release_data in self.releases.items():
+		current = self.info["version"]
+		release_info = {}
 
-			release_urls: List[FileURL] = []
+		for key in keys:
+			info = ReleaseInfo.from_files(key, self.releases[key])
 
-			for file in release_data:
-				release_urls.append({"url": file["url"], "digest": file["digests"]["sha256"]})
-			pypi_releases[release] = release_urls
+			if key == current:
+				info = info._replace(
+						requires_dist=self.info.get("requires_dist") or [],
+						vulnerabilities=self.vulnerabilities,
+						)
+
+			release_info[key] = info
+
+		return release_info
+
+	def get_releases_with_digests(self) -> Dict[str, List[FileURL]]:
+		"""
+		Returns a dictionary mapping PyPI release versions to download URLs and the sha256sum of the file contents.
+
+		.. versionchanged:: 0.6.0
+
+			The dictionary is built on first call and the same object is returned afterwards,
+			so it must not be modified.
+		"""
+
+		try:
+			return self.__dict__["_releases_with_digests"]
+		except KeyError:
+			pass
+
+		if self.releases is None:
+			self._raise_missing_releases_key()
 
-		return pypi_releases
+		releases = self.__dict__["_releases_with_digests"] = {
+				release: [{"url": file["url"], "digest": file["digests"]["sha256"]} for file in release_data]
+				for release, release_data in self.releases.items()
+				}
+		return releases
 
 	def get_releases(self) -> Dict[str, List[str]]:
 		"""
 		Returns a dictionary mapping PyPI release versions to download URLs.
+
+		.. versionchanged:: 0.6.0
+
+			The dictionary is built on first call and the same object is returned afterwards,
+			so it must not be modified.
 		"""
 
-		pypi_releases = {}
+		try:
+			return self.__dict__["_releases"]
+		except KeyError:
+			pass
+
+		if self.releases is None:
+			self._raise_missing_releases_key()
+
+		releases = self.__dict__["_releases"] = {
+				release: [file["url"] for file in release_data]
+				for release, release_data in self.releases.items()
+				}
+		return releases
 
-		for release, release_data in self.get_releases_with_digests().items():
-			pypi_releases[release] = [file["url"] for file in release_data]
+	def _get_release_key(self, version: Union[str, int, Version]) -> str:
+		if self.releases is None:
+			self._raise_missing_releases_key()
+
+		version = str(version)
+
+		if version in self.releases:
+			return version
 
-		return pypi_releases
+		try:
+			return self.version_index.key_for(version)
+		except KeyError:
+			raise InvalidRequirement(f"Cannot find version {version} on PyPI.") from None
 
 	def get_wheel_tag_mapping(
 			self,
@@ -211,33 +509,304 @@ class ProjectMetadata(NamedTuple):
 			and a list of download URLs for non-wheel artifacts (e.g. sdists).
 		"""
 
-		releases = self.get_releases()
+		index = self._get_wheel_tag_index(version)
+
+		tag_url_map = {}
+		urls: Dict[str, URL] = {}
+
+		for tag, file in index.wheels.items():
+			if file["url"] not in urls:
+				urls[file["url"]] = URL(file["url"])
+			tag_url_map[tag] = urls[file["url"]]
+
+		non_wheel_urls = [URL(file["url"]) for file in index.non_wheels]
+
+		return tag_url_map, non_wheel_urls
+
+	def select_best_wheel(
+			self,
+			version: Union[str, int, Version, None] = None,
+			tags: Union[Iterable[Tag], TagPriorities, None] = None,
+			) -> Optional[DistributionPackageDict]:
+		"""
+		Returns the most preferred wheel for the given version which is compatible with the given tags.
+
+		The tags of each release's wheels are indexed the first time the release is queried.
+		When selecting wheels for many projects or versions, pass the result of
+		:func:`pypi_json.wheels.tag_priorities` as ``tags`` to avoid recomputing the tag order each time.
+
+		.. versionadded:: 0.6.0
+
+		:param version: The version to select a wheel for. If :py:obj:`None` the current version is used.
+		:param tags: The supported tags, most preferred first.
+			If :py:obj:`None` the tags supported by the running interpreter (from :func:`packaging.tags.sys_tags`) are used.
+
+		:returns: The wheel's entry from :attr:`~.ProjectMetadata.releases`,
+			or :py:obj:`None` if there are no compatible wheels.
+		"""
+
+		return self._get_wheel_tag_index(version).best(tags)
+
+	def get_wheel_availability(
+			self,
+			platforms: Mapping[str, Union[Iterable[Tag], TagPriorities]],
+			) -> Dict[str, Dict[str, Optional[DistributionPackageDict]]]:
+		"""
+		Returns a matrix of the best wheel for each release on each of the given platforms.
+
+		All releases are examined in a single pass,
+		with the tag order for each platform computed once and each release's wheels indexed once.
+
+		.. versionadded:: 0.6.0
+
+		:param platforms: A mapping of platform names to the tags supported on that platform, most preferred first,
+			or to a mapping from :func:`pypi_json.wheels.tag_priorities`.
+
+		:returns: A mapping of versions to a mapping of platform names to the best wheel for that platform,
+			or :py:obj:`None` if the version has no compatible wheel.
+		"""
+
+		if self.releases is None:
+			self._raise_missing_releases_key()
+
+		priorities = {name: tag_priorities(tags) for name, tags in platforms.items()}
+		matrix: Dict[str, Dict[str, Optional[DistributionPackageDict]]] = {}
+
+		for version, files in self.releases.items():
+			if files:
+				index = self._get_wheel_tag_index(version)
+				matrix[version] = {name: index.best(tags) for name, tags in priorities.items()}
+			else:
+				matrix[version] = dict.fromkeys(priorities)
+
+		return matrix
+
+	def _get_wheel_tag_index(self, version: Union[str, int, Version, None]) -> WheelTagIndex:
+		if self.releases is None:
+			self._raise_missing_releases_key()
 
 		if version is None:
 			version = self.info["version"]
 
-		version = str(version)
-
-		if version not in releases:
-			raise InvalidRequirement(f"Cannot find version {version} on PyPI.")
+		version = self._get_release_key(version)
+		indexes: Dict[str, WheelTagIndex] = self.__dict__.setdefault("_wheel_tag_indexes", {})
 
-		download_urls = list(map(URL, releases[version]))
+		try:
+			return indexes[version]
+		except KeyError:
+			pass
 
-		if not download_urls:
+		if not self.releases[version]:
 			raise ValueError(f"Version {version} has no files on PyPI.")
 
-		tag_url_map = {}
-		non_wheel_urls = []
+		index = indexes[version] = WheelTagIndex(self.releases[version])
+		return index
 
-		for url in download_urls:
-			if url.suffix == ".whl":
-				tags = parse_wheel_filename(url.name)[3]
-				for tag in tags:
-					tag_url_map[tag] = url
-			else:
-				non_wheel_urls.append(url)
 
-		return tag_url_map, non_wheel_urls
+_json_decoder = json.JSONDecoder()
+_whitespace_re = re.compile(r"[ \t\n\r]*")
+
+# Matches up to the next bracket or brace which is not inside a string.
+_until_bracket_re = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+_string_re = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_scalar_re = re.compile(r"[^,}\] \t\n\r]*")
+
+
+def _skip_value(text: str, pos: int) -> int:
+	"""
+	Returns the position after the JSON value starting at ``pos``, without decoding it.
+	"""
+
+	char = text[pos:pos + 1]
+
+	if char == '"':
+		return _string_re.match(text, pos).end()  # type: ignore[union-attr]
+	elif char not in {'[', '{'}:
+		return _scalar_re.match(text, pos).end()  # type: ignore[union-attr]
+
+	depth = 0
+	match = _until_bracket_re.match
+
+	while True:
+		pos = match(text, pos).end()  # type: ignore[union-attr]
+		if pos >= len(text):
+			raise ValueError("Unterminated JSON value.")
+
+		if text[pos] in "[{":
+			depth += 1
+		else:
+			depth -= 1
+
+		pos += 1
+		if not depth:
+			return pos
+
+
+def _lazy_field(name: str, doc: str) -> property:
+
+	def getter(self: "LazyProjectMetadata") -> Any:
+		return self._get(name)
+
+	return property(getter, doc=doc)
+
+
+class LazyProjectMetadata(ProjectMetadata):
+	"""
+	A :class:`~.ProjectMetadata` which keeps the raw JSON response, and only decodes each field when it is accessed.
+
+	The top-level keys of the document are scanned in order, stopping as soon as the requested one is reached.
+	The values of other keys passed along the way are skipped over without being decoded,
+	and are only decoded if they are accessed later. So reading :attr:`~.ProjectMetadata.info`,
+	:attr:`~.ProjectMetadata.urls` or :attr:`~.ProjectMetadata.vulnerabilities` doesn't require
+	the (potentially very large) ``releases`` mapping to be decoded at all.
+	Once decoded, values are kept for subsequent accesses.
+
+	Instances compare equal to, and can be used in place of, :class:`~.ProjectMetadata` objects.
+	Pickling or calling :meth:`~.LazyProjectMetadata._replace` produces a regular :class:`~.ProjectMetadata`.
+
+	.. versionadded:: 0.6.0
+
+	:param content: The raw JSON document.
+	"""
+
+	_raw: Optional[bytes]
+	_text: Optional[str]
+	_values: Dict[str, Any]
+	_skipped: Dict[str, int]
+	_pos: int
+	_lock: threading.Lock
+
+	def __new__(cls, content: bytes) -> "LazyProjectMetadata":  # noqa: D102
+		self = tuple.__new__(cls, (None, ) * len(cls._fields))
+		self._raw = content
+		self._text = None
+		self._values = {}
+		self._skipped = {}
+		self._pos = 0
+		self._lock = threading.Lock()
+		return self
+
+	def _get(self, name: str) -> Any:
+		if name not in self._values and (self._pos >= 0 or name in self._skipped):
+			with self._lock:
+				self._decode_until(name)
+
+		if name in self._values:
+			return self._values[name]
+		elif name in self._field_defaults:
+			return self._field_defaults[name]
+		else:
+			raise ValueError(f"The JSON document has no {name!r} key.")
+
+	def _decode_until(self, name: str) -> None:
+		# Must be called with the lock held.
+		# self._pos is the position to continue scanning from, or -1 once the whole document has been scanned.
+		# self._skipped maps keys whose values were skipped over to the positions of those values.
+
+		if name in self._values:
+			return
+
+		if self._text is None:
+			# Decoded to text once, on first access, rather than for each field.
+			assert self._raw is not None
+			self._text = self._raw.decode(json.detect_encoding(self._raw))
+			self._raw = None
+
+		text = self._text
+
+		if name in self._skipped:
+			self._values[name], _ = _json_decoder.raw_decode(text, self._skipped.pop(name))
+			self._release_text()
+			return
+
+		if self._pos < 0:
+			return
+
+		pos = self._pos
+
+		if not pos:
+			pos = _whitespace_re.match(text, pos).end()  # type: ignore[union-attr]
+			if text[pos:pos + 1] != '{':
+				raise ValueError("The JSON document is not an object.")
+			pos += 1
+
+		while True:
+			pos = _whitespace_re.match(text, pos).end()  # type: ignore[union-attr]
+
+			if text[pos:pos + 1] == ',':
+				pos = _whitespace_re.match(text, pos + 1).end()  # type: ignore[union-attr]
+			elif text[pos:pos + 1] == '}':
+				self._pos = -1
+				self._release_text()
+				return
+
+			key, pos = scanstring(text, pos + 1)
+			pos = _whitespace_re.match(text, pos).end() + 1  # type: ignore[union-attr]  # skip the colon
+			pos = _whitespace_re.match(text, pos).end()  # type: ignore[union-attr]
+
+			if key == name:
+				self._values[key], pos = _json_decoder.raw_decode(text, pos)
+				self._pos = pos
+				return
+
+			self._skipped[key] = pos
+			pos = _skip_value(text, pos)
+
+	def _release_text(self) -> None:
+		# The text is no longer needed once every value has been decoded.
+		if self._pos < 0 and not self._skipped:
+			self._text = None
+
+	info = _lazy_field("info", "Generic information about a specific version of a project.")
+	last_serial = _lazy_field(
+			"last_serial",
+			"Monotonically increasing integer sequence that changes every time the project is updated.",
+			)
+	releases = _lazy_field("releases", "A mapping of version numbers to a list of artifacts associated with a version.")
+	urls = _lazy_field("urls", "A list of release artifacts associated with this version.")
+	vulnerabilities = _lazy_field("vulnerabilities", "Details of vulnerabilities affecting this version.")
+	ownership = _lazy_field("ownership", "Information about the project's roles and organization membership.")
+
+	def __iter__(self) -> Iterator[Any]:
+		return iter([self._get(name) for name in self._fields])
+
+	def __getitem__(self, item: Any) -> Any:
+		return tuple(self)[item]
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, tuple):
+			return tuple(self) == tuple(other)
+		return NotImplemented
+
+	def __ne__(self, other: object) -> bool:
+		if isinstance(other, tuple):
+			return tuple(self) != tuple(other)
+		return NotImplemented
+
+	__hash__ = None  # type: ignore[assignment]
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.LazyProjectMetadata` object.
+		"""
+
+		fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+		return f"{self.__class__.__name__}({fields})"
+
+	def __reduce__(self) -> Tuple[Any, ...]:
+		return (ProjectMetadata, tuple(self))
+
+	def _replace(self, **kwargs: Any) -> ProjectMetadata:  # type: ignore[override]
+		return self.materialize()._replace(**kwargs)
+
+	def materialize(self) -> ProjectMetadata:
+		"""
+		Decode all fields, and return them as a regular :class:`~.ProjectMetadata`.
+
+		The raw JSON document can then be discarded by dropping references to this object.
+		"""
+
+		return ProjectMetadata(*self)
 
 
 class PyPIJSON:
@@ -265,6 +834,37 @@ class PyPIJSON:
 		either a ``(username, password)`` pair or `another authentication object accepted by requests`_.
 
 	:param session: Optional :class:`requests.Session` object to use instead of creating a fresh one.
+	:param disk_cache: Optional :class:`~pypi_json.cache.DiskCache` in which to store responses.
+		Stored responses are revalidated with conditional requests, and reused if they have not changed.
+	:param memory_cache: Optional :class:`~pypi_json.cache.MemoryCache` in which to keep
+		:class:`~.ProjectMetadata` objects, so repeated lookups within a process don't make any requests.
+	:param json_decoder: Function to decode JSON responses with.
+		Defaults to the fastest installed decoder; see :mod:`pypi_json.decoders`.
+	:param store: Optional :class:`~pypi_json.store.MetadataStore` to read metadata from and write metadata into.
+		Metadata found in the store is returned without making any requests; use :meth:`~.PyPIJSON.sync`
+		to bring it up to date.
+	:param pool_connections: The number of hosts to keep connection pools for.
+	:param pool_maxsize: The maximum number of connections to keep open to each host.
+		When making requests from many threads at once (e.g. with :meth:`~.PyPIJSON.get_many_metadata`)
+		this should be at least the number of threads, otherwise connections are discarded and reopened.
+	:param retries: The retry policy, either a :class:`urllib3.util.retry.Retry` object or a number of retries.
+		By default failed requests are not retried.
+		See :func:`pypi_json.transport.make_retry` for how a number of retries is interpreted.
+	:param keep_alive: If :py:obj:`False` connections are closed after each request.
+	:param rate_limiter: Optional :class:`~pypi_json.ratelimit.RateLimiter` to send every request through.
+		Throttled requests are retried after backing off, rather than raising :exc:`requests.HTTPError`.
+		The same rate limiter may be shared between several clients.
+	:param metrics_callback: Optional function to call with a :class:`~pypi_json.metrics.RequestMetrics`
+		after each call to :meth:`~.PyPIJSON.get_metadata` or :meth:`~.PyPIJSON.download_file`.
+
+	The connection pool, retry and rate limiting options are applied to the session created by the client,
+	or to the session passed in if any of them are given.
+
+	.. versionchanged:: 0.6.0
+
+		Added the ``disk_cache``, ``memory_cache``, ``json_decoder``, ``store``,
+		``pool_connections``, ``pool_maxsize``, ``retries``, ``keep_alive``, ``rate_limiter``
+		and ``metrics_callback`` parameters.
 
 	.. _another authentication object accepted by requests: https://requests.readthedocs.io/en/master/user/authentication/
 
@@ -284,11 +884,56 @@ class PyPIJSON:
 	representing the PyPI JSON API, with an authenticated requests session.
 	"""
 
+	disk_cache: Optional[DiskCache]
+	"""
+	The :class:`~pypi_json.cache.DiskCache` responses are stored in, if any.
+
+	.. versionadded:: 0.6.0
+	"""
+
+	memory_cache: Optional[MemoryCache]
+	"""
+	The :class:`~pypi_json.cache.MemoryCache` metadata is kept in, if any.
+
+	.. versionadded:: 0.6.0
+	"""
+
+	json_decoder: JSONDecoder
+	"""
+	The function used to decode JSON responses.
+
+	.. versionadded:: 0.6.0
+	"""
+
+	store: Optional[MetadataStore]
+	"""
+	The :class:`~pypi_json.store.MetadataStore` metadata is read from and written into, if any.
+
+	.. versionadded:: 0.6.0
+	"""
+
+	metrics_callback: Optional[MetricsCallback]
+	"""
+	The function called with the :class:`~pypi_json.metrics.RequestMetrics` for each call, if any.
+
+	.. versionadded:: 0.6.0
+	"""
+
 	def __init__(
 			self,
 			endpoint: Union[str, URL] = "https://pypi.org/pypi",
 			auth: Any = None,
 			session: Optional[requests.Session] = None,
+			disk_cache: Optional[DiskCache] = None,
+			memory_cache: Optional[MemoryCache] = None,
+			json_decoder: Optional[JSONDecoder] = None,
+			store: Optional[MetadataStore] = None,
+			pool_connections: Optional[int] = None,
+			pool_maxsize: Optional[int] = None,
+			retries: Union[int, Retry, None] = None,
+			keep_alive: bool = True,
+			rate_limiter: Optional[RateLimiter] = None,
+			metrics_callback: Optional[MetricsCallback] = None,
 			) -> None:
 
 		if isinstance(endpoint, RequestsURL):
@@ -298,14 +943,36 @@ class PyPIJSON:
 
 		self.endpoint = TrailingRequestsURL(endpoint)
 
+		configure = (
+				pool_connections is not None or pool_maxsize is not None or retries is not None or not keep_alive
+				or rate_limiter is not None
+				)
+
 		if session is None:
 			session = requests.Session()
 			session.headers["User-Agent"] = USER_AGENT
+			configure = True
+
+		if configure:
+			configure_session(
+					session,
+					pool_connections=pool_connections,
+					pool_maxsize=pool_maxsize,
+					retries=retries,
+					keep_alive=keep_alive,
+					rate_limiter=rate_limiter,
+					)
 
 		if auth is not None:
 			session.auth = auth
 
 		self.endpoint.session = session
+		self.disk_cache = disk_cache
+		self.memory_cache = memory_cache
+		self.json_decoder = get_decoder() if json_decoder is None else json_decoder
+		self.store = store
+		self.metrics_callback = metrics_callback
+		self._in_flight = SingleFlight()
 
 	@property
 	def endpoint_url(self) -> str:
@@ -328,13 +995,27 @@ class PyPIJSON:
 
 		return f"<{self.__class__.__name__}({self.endpoint_url!r})>"
 
-	def get_metadata(self, project: str, version: Union[str, Version, None] = None) -> ProjectMetadata:
+	def get_metadata(
+			self,
+			project: str,
+			version: Union[str, Version, None] = None,
+			*,
+			lazy: bool = False,
+			) -> ProjectMetadata:
 		"""
 		Returns metadata for the given project on PyPI.
 
 		:param project:
 		:param version: The desired version.
 			If :py:obj:`None` the metadata for the latest release if returned.
+		:param lazy: If :py:obj:`True` return a :class:`~.LazyProjectMetadata`,
+			which only decodes each field of the response when it is accessed.
+			This is much cheaper when only :attr:`ProjectMetadata.info <.ProjectMetadata.info>` is needed.
+
+		.. versionchanged:: 0.6.0
+
+			* Added the ``lazy`` argument.
+			* Concurrent calls for the same project and version from different threads now share a single request.
 
 		:raises:
 
@@ -342,13 +1023,99 @@ class PyPIJSON:
 			* :exc:`requests.HTTPError` if an error occurs when communicating with PyPI.
 		"""
 
-		if version is None:
-			query_url = self.endpoint / project / "json"
+		if self.metrics_callback is None:
+			return self._get_metadata(project, version, lazy, None)
+
+		with self._measure("get_metadata", project, version) as metrics:
+			metrics["source"] = "shared"
+			return self._get_metadata(project, version, lazy, metrics)
+
+	def get_raw_metadata(self, project: str, version: Union[str, Version, None] = None) -> bytes:
+		"""
+		Returns the JSON document for the given project on PyPI, as the undecoded bytes of the response.
+
+		Unlike :meth:`~.PyPIJSON.get_metadata` a request is always made,
+		although it is revalidated against the :attr:`~.PyPIJSON.disk_cache` where possible.
+		The document is written to the :attr:`~.PyPIJSON.store`, if there is one.
+
+		.. versionadded:: 0.6.0
+
+		:param project:
+		:param version: The desired version.
+			If :py:obj:`None` the metadata for the latest release if returned.
+
+		:raises:
+
+			* :exc:`packaging.requirements.InvalidRequirement` if the project cannot be found on PyPI.
+			* :exc:`requests.HTTPError` if an error occurs when communicating with PyPI.
+		"""
+
+		return self._fetch_metadata(project, version)
+
+	def _get_metadata(
+			self,
+			project: str,
+			version: Union[str, Version, None],
+			lazy: bool,
+			metrics: Optional[Dict[str, Any]],
+			) -> ProjectMetadata:
+		if self.memory_cache is not None:
+			cached_metadata = self.memory_cache.get(project, version, lazy=lazy)
+			if cached_metadata is not None:
+				if metrics is not None:
+					metrics["source"] = "memory"
+				return cached_metadata
+
+		key = (canonicalize_name(project), None if version is None else str(version), lazy)
+		return self._in_flight.do(key, lambda: self._load_metadata(project, version, lazy, metrics))
+
+	def _load_metadata(
+			self,
+			project: str,
+			version: Union[str, Version, None],
+			lazy: bool,
+			metrics: Optional[Dict[str, Any]] = None,
+			) -> ProjectMetadata:
+		content = None if self.store is None else self.store.read(project, version)
+
+		if content is None:
+			content = self._fetch_metadata(project, version, metrics)
+		elif metrics is not None:
+			metrics["source"] = "store"
+			metrics["size"] = len(content)
+
+		start = time.perf_counter()
+
+		metadata: ProjectMetadata
+		if lazy:
+			decoded = start
+			metadata = LazyProjectMetadata(content)
 		else:
-			query_url = self.endpoint / project / str(version) / "json"
+			data = self.json_decoder(content)
+			decoded = time.perf_counter()
+			metadata = ProjectMetadata(**data)
+
+		if metrics is not None:
+			metrics["decode_time"] = decoded - start
+			metrics["parse_time"] = time.perf_counter() - decoded
+
+		if self.memory_cache is not None:
+			self.memory_cache.set(project, version, metadata, lazy=lazy)
 
-		response: requests.Response = query_url.get(timeout=self.timeout)
+		return metadata
 
+	def _get_query_url(self, project: str, version: Union[str, Version, None] = None) -> TrailingRequestsURL:
+		if version is None:
+			return self.endpoint / project / "json"
+		else:
+			return self.endpoint / project / str(version) / "json"
+
+	@staticmethod
+	def _check_response(
+			response: requests.Response,
+			project: str,
+			version: Union[str, Version, None] = None,
+			) -> None:
 		if response.status_code == 404:
 			if version is None:
 				raise InvalidRequirement(f"No such project {project!r}")
@@ -361,7 +1128,297 @@ class PyPIJSON:
 					response=response,
 					)
 
-		return ProjectMetadata(**response.json())
+	@contextmanager
+	def _measure(
+			self,
+			operation: str,
+			target: str,
+			version: Union[str, Version, None] = None,
+			) -> Iterator[Dict[str, Any]]:
+		"""
+		Report the :class:`~pypi_json.metrics.RequestMetrics` for the call in the body of the ``with`` block
+		to :attr:`~.PyPIJSON.metrics_callback`, with the other fields taken from the dictionary it yields.
+		"""
+
+		assert self.metrics_callback is not None
+
+		metrics: Dict[str, Any] = {}
+		error: Optional[BaseException] = None
+		start = time.perf_counter()
+
+		try:
+			yield metrics
+		except BaseException as e:
+			error = e
+			raise
+		finally:
+			self.metrics_callback(
+					RequestMetrics(
+							operation=operation,
+							target=target,
+							version=None if version is None else str(version),
+							total_time=time.perf_counter() - start,
+							error=error,
+							**metrics,
+							)
+					)
+
+	def _get(
+			self,
+			url: Union[str, RequestsURL],
+			metrics: Optional[Dict[str, Any]],
+			**kwargs: Any,
+			) -> requests.Response:
+		start = time.perf_counter()
+
+		if isinstance(url, RequestsURL):
+			response = url.get(**kwargs)
+		else:
+			response = self.endpoint.session.get(url, **kwargs)
+
+		if metrics is not None:
+			# The response has been read in full, so the time after the headers arrived was spent downloading it.
+			request_time = response.elapsed.total_seconds()
+			download_time = max(0.0, time.perf_counter() - start - request_time)
+			metrics["source"] = "network"
+			metrics["status_code"] = response.status_code
+			metrics["size"] = len(response.content)
+			metrics["retries"] = metrics.get("retries", 0) + get_retry_count(response)
+			metrics["request_time"] = metrics.get("request_time", 0.0) + request_time
+			metrics["download_time"] = metrics.get("download_time", 0.0) + download_time
+
+		return response
+
+	def _fetch_metadata(
+			self,
+			project: str,
+			version: Union[str, Version, None] = None,
+			metrics: Optional[Dict[str, Any]] = None,
+			) -> bytes:
+		"""
+		Returns the raw JSON document for the given project, revalidating against the disk cache where possible.
+		"""
+
+		query_url = self._get_query_url(project, version)
+		cache_key = str(query_url)
+		cache_entry = None if self.disk_cache is None else self.disk_cache.get(cache_key)
+
+		if self.disk_cache is not None and cache_entry is not None:
+			response = self._get(query_url, metrics, timeout=self.timeout, headers=cache_entry.conditional_headers())
+
+			if response.status_code == 304:
+				content = self.disk_cache.read(cache_key)
+				if content is not None:
+					if metrics is not None:
+						metrics["source"] = "disk_cache"
+						metrics["size"] = len(content)
+					if self.store is not None:
+						self.store.set(
+								project,
+								version,
+								content,
+								last_serial=cache_entry.last_serial,
+								etag=cache_entry.etag,
+								last_modified=cache_entry.last_modified,
+								)
+					return content
+
+				# The entry was evicted in the meantime
+				response = self._get(query_url, metrics, timeout=self.timeout)
+
+		else:
+			response = self._get(query_url, metrics, timeout=self.timeout)
+
+		self._check_response(response, project, version)
+		content = response.content
+
+		etag = response.headers.get("ETag")
+		last_modified = response.headers.get("Last-Modified")
+		last_serial = _get_last_serial(response)
+
+		if self.disk_cache is not None and (etag is not None or last_modified is not None):
+			self.disk_cache.set(
+					cache_key,
+					content,
+					etag=etag,
+					last_modified=last_modified,
+					last_serial=last_serial,
+					)
+
+		if self.store is not None:
+			self.store.set(
+					project,
+					version,
+					content,
+					last_serial=last_serial,
+					etag=etag,
+					last_modified=last_modified,
+					)
+
+		return content
+
+	def _sync_one(self, project: str, version: Union[str, Version, None] = None) -> bool:
+		assert self.store is not None
+
+		entry = self.store.get(project, version)
+		query_url = self._get_query_url(project, version)
+
+		if entry is None:
+			response = query_url.get(timeout=self.timeout)
+		else:
+			response = query_url.get(timeout=self.timeout, headers=entry.conditional_headers())
+
+			if response.status_code == 304:
+				self.store.touch(project, version)
+				return False
+
+		if response.status_code == 404:
+			self.store.delete(project, version)
+
+		self._check_response(response, project, version)
+
+		last_serial = _get_last_serial(response)
+		changed = entry is None or last_serial is None or entry.last_serial != last_serial
+
+		self.store.set(
+				project,
+				version,
+				response.content,
+				last_serial=last_serial,
+				etag=response.headers.get("ETag"),
+				last_modified=response.headers.get("Last-Modified"),
+				)
+
+		if changed and self.memory_cache is not None:
+			self.memory_cache.invalidate(project, version)
+
+		return changed
+
+	def sync(
+			self,
+			projects: Iterable[Union[str, Tuple[str, Union[str, Version, None]]]],
+			max_workers: int = 10,
+			) -> Iterator[Tuple[Any, Union[bool, Exception]]]:
+		"""
+		Bring the metadata for the given projects in :attr:`~.PyPIJSON.store` up to date.
+
+		Stored documents are revalidated with conditional requests,
+		so only projects which have changed since they were stored are downloaded again.
+		Projects which are not yet in the store are fetched and stored.
+
+		Results are yielded as ``(project, changed)`` tuples in the order they complete, where ``changed``
+		is :py:obj:`True` if the project was fetched for the first time or its ``last_serial`` has changed.
+		As with :meth:`~.PyPIJSON.get_many_metadata`, exceptions are yielded in place of the result.
+		Projects which no longer exist are removed from the store.
+
+		.. versionadded:: 0.6.0
+
+		:param projects: An iterable of project names, or ``(project, version)`` tuples.
+		:param max_workers: The maximum number of requests to make at once.
+
+		:raises ValueError: If this client does not have a :attr:`~.PyPIJSON.store`.
+		"""
+
+		if self.store is None:
+			raise ValueError("Cannot sync without a 'store'")
+
+		def sync_one(project: Union[str, Tuple[str, Union[str, Version, None]]]) -> bool:
+			if isinstance(project, str):
+				return self._sync_one(project)
+			else:
+				return self._sync_one(*project)
+
+		return imap_unordered(sync_one, projects, max_workers)
+
+	def get_many_metadata(
+			self,
+			projects: Iterable[Union[str, Tuple[str, Union[str, Version, None]]]],
+			max_workers: int = 10,
+			) -> Iterator[Tuple[Any, Union[ProjectMetadata, Exception]]]:
+		"""
+		Fetch metadata for many projects concurrently, using a pool of threads which share this client's session.
+
+		Results are yielded as ``(project, metadata)`` tuples in the order they complete,
+		which is not necessarily the order of ``projects``.
+		If fetching the metadata for a project fails the exception is yielded in place of the metadata,
+		rather than being raised, so one bad project name does not abort the whole batch.
+
+		``projects`` is consumed lazily, with at most ``2 * max_workers`` requests queued at once.
+		Closing the iterator early cancels any requests which have not yet started.
+
+		.. versionadded:: 0.6.0
+
+		:param projects: An iterable of project names, or ``(project, version)`` tuples.
+			The first element of each yielded tuple is the corresponding item from this iterable.
+		:param max_workers: The maximum number of requests to make at once.
+			The default matches the size of the connection pool of a default :class:`requests.Session`.
+		"""
+
+		def fetch(project: Union[str, Tuple[str, Union[str, Version, None]]]) -> ProjectMetadata:
+			if isinstance(project, str):
+				return self.get_metadata(project)
+			else:
+				return self.get_metadata(*project)
+
+		yield from imap_unordered(fetch, projects, max_workers)
+
+	def get_release_info(
+			self,
+			project: str,
+			versions: Optional[Iterable[Union[str, Version]]] = None,
+			*,
+			details: bool = False,
+			max_workers: int = 10,
+			) -> Dict[str, ReleaseInfo]:
+		"""
+		Returns details of many releases of a project, fetching the project's metadata once.
+
+		The files, yanked state, ``requires_python`` and upload time of every release are derived from
+		:attr:`ProjectMetadata.releases <.ProjectMetadata.releases>`.
+		The per-version endpoint of the API is only queried when ``details`` is :py:obj:`True`, to fill in
+		the :attr:`~.ReleaseInfo.requires_dist` and :attr:`~.ReleaseInfo.vulnerabilities` fields,
+		and then only for releases other than the latest, with up to ``max_workers`` requests made at once.
+
+		.. versionadded:: 0.6.0
+
+		:param project:
+		:param versions: The versions to return details for. If :py:obj:`None` all releases are included.
+		:param details: Whether to fetch the :attr:`~.ReleaseInfo.requires_dist`
+			and :attr:`~.ReleaseInfo.vulnerabilities` fields for every release.
+		:param max_workers: The maximum number of requests to make at once.
+
+		:returns: A mapping of release keys in :attr:`ProjectMetadata.releases <.ProjectMetadata.releases>`
+			to :class:`~.ReleaseInfo` objects.
+
+		:raises:
+
+			* :exc:`packaging.requirements.InvalidRequirement` if the project or one of ``versions``
+			  cannot be found on PyPI.
+			* :exc:`requests.HTTPError` if an error occurs when communicating with PyPI.
+		"""
+
+		release_info = self.get_metadata(project).get_release_info(versions)
+
+		if not details:
+			return release_info
+
+		missing = [key for key, info in release_info.items() if info.requires_dist is None]
+
+		results = imap_unordered(lambda key: self.get_metadata(project, key), missing, max_workers)
+
+		try:
+			for key, metadata in results:
+				if isinstance(metadata, Exception):
+					raise metadata
+
+				release_info[key] = release_info[key]._replace(
+						requires_dist=metadata.info.get("requires_dist") or [],
+						vulnerabilities=metadata.vulnerabilities,
+						)
+		finally:
+			results.close()
+
+		return release_info
 
 	def download_file(self, url: Union[str, URL]) -> requests.Response:
 		"""
@@ -373,7 +1430,152 @@ class PyPIJSON:
 		if isinstance(url, URL):
 			url = str(url)
 
-		return self.endpoint.session.get(url)
+		if self.metrics_callback is None:
+			return self.endpoint.session.get(url)
+
+		with self._measure("download_file", url) as metrics:
+			return self._get(url, metrics)
+
+	def download_to(
+			self,
+			file: FileLike,
+			destination: Union[str, "os.PathLike[str]", IO[bytes]],
+			*,
+			sha256: Optional[str] = None,
+			chunk_size: int = DEFAULT_CHUNK_SIZE,
+			progress: Optional[ProgressCallback] = None,
+			resume: bool = False,
+			segments: int = 1,
+			) -> str:
+		"""
+		Download a file from PyPI to the given path or file object, without holding the whole file in memory.
+
+		The file is streamed in chunks of ``chunk_size`` bytes, and its size and sha256 digest are checked
+		as the data arrives. When ``file`` is an entry from :attr:`ProjectMetadata.urls <.ProjectMetadata.urls>`
+		or :attr:`ProjectMetadata.releases <.ProjectMetadata.releases>` the expected size and digest are taken from it.
+
+		.. versionadded:: 0.6.0
+
+		:param file: The URL of the file, or an entry from :attr:`ProjectMetadata.urls <.ProjectMetadata.urls>`.
+		:param destination: The path or binary file object to write the file to.
+			If a path to an existing directory the file is created inside it with its original filename.
+		:param sha256: The expected sha256 digest of the file, overriding the one from ``file``.
+		:param chunk_size: The number of bytes to read into memory at once.
+		:param progress: A function to call with the file, the number of bytes received so far
+			and the expected size after each chunk is received.
+		:param resume: If :py:obj:`True` a failed download leaves its ``.part`` file behind,
+			and calling this method again continues from where it stopped using an HTTP ``Range`` request.
+			Requires ``destination`` to be a path.
+		:param segments: The number of ranged requests to split the file into and download in parallel,
+			which can improve throughput on high-latency links. Requires the expected size of the file to be known,
+			and ``destination`` to be a path.
+
+		:raises:
+
+			* :exc:`pypi_json.download.DigestMismatchError` if the size or digest of the file are not as expected.
+			* :exc:`requests.HTTPError` if an error occurs when downloading the file.
+
+		:returns: The sha256 digest of the file, as a hexadecimal string.
+
+		.. seealso:: :func:`pypi_json.download.stream_download`
+		"""
+
+		return stream_download(
+				self.endpoint.session,
+				file,
+				destination,
+				sha256=sha256,
+				chunk_size=chunk_size,
+				timeout=self.timeout,
+				progress=progress,
+				resume=resume,
+				segments=segments,
+				)
+
+	def download_files(
+			self,
+			files: Iterable[FileLike],
+			directory: Union[str, "os.PathLike[str]"],
+			*,
+			max_workers: int = 10,
+			chunk_size: int = DEFAULT_CHUNK_SIZE,
+			progress: Optional[ProgressCallback] = None,
+			resume: bool = False,
+			) -> Iterator[DownloadResult]:
+		"""
+		Download many files from PyPI concurrently into ``directory``, verifying their digests.
+
+		This can be used to mirror every file in :attr:`ProjectMetadata.urls <.ProjectMetadata.urls>`,
+		or every file returned by :meth:`ProjectMetadata.get_releases_with_digests
+		<.ProjectMetadata.get_releases_with_digests>`.
+		Files which already exist with the expected digest are skipped.
+
+		Results are yielded in the order the downloads complete, and include the time taken and throughput.
+		Failed downloads are reported through :attr:`DownloadResult.error <pypi_json.download.DownloadResult.error>`
+		rather than being raised.
+
+		.. versionadded:: 0.6.0
+
+		:param files:
+		:param directory: The directory to download the files into. It will be created if it does not exist.
+		:param max_workers: The maximum number of files to download at once.
+		:param chunk_size: The number of bytes to read into memory at once.
+		:param progress: A function to call with the file, the number of bytes received so far
+			and the expected size after each chunk is received.
+			It is called from the worker threads, so must be thread safe.
+		:param resume: Whether to keep the partial files from failed downloads, and resume them on a later call.
+
+		.. seealso:: :func:`pypi_json.download.download_files`
+		"""
+
+		return download_files(
+				self.endpoint.session,
+				files,
+				directory,
+				max_workers=max_workers,
+				chunk_size=chunk_size,
+				timeout=self.timeout,
+				progress=progress,
+				resume=resume,
+				)
+
+	def get_core_metadata(
+			self,
+			file: FileLike,
+			*,
+			sidecar: bool = True,
+			block_size: int = DEFAULT_BLOCK_SIZE,
+			) -> Message:
+		"""
+		Returns the core metadata (the ``METADATA`` file) of a distribution, without downloading the distribution.
+
+		The :pep:`658` ``.metadata`` file served alongside the distribution is used if there is one.
+		Otherwise, for wheels, the zip file's central directory and ``*.dist-info/METADATA`` member
+		are read with HTTP ``Range`` requests, which usually transfers a few kilobytes however large the wheel.
+
+		.. versionadded:: 0.6.0
+
+		:param file: The URL of the file, or an entry from :attr:`ProjectMetadata.urls <.ProjectMetadata.urls>`.
+		:param sidecar: Whether to try the :pep:`658` ``.metadata`` file.
+		:param block_size: The number of bytes to request at once when reading the wheel with ``Range`` requests.
+
+		:raises:
+
+			* :exc:`pypi_json.download.DigestMismatchError` if the ``.metadata`` file
+			  does not match the digest given by the index.
+			* :exc:`ValueError` if the distribution is not a wheel and has no ``.metadata`` file.
+			* :exc:`requests.HTTPError` if an error occurs when communicating with PyPI.
+
+		.. seealso:: :func:`pypi_json.core_metadata.get_core_metadata`
+		"""
+
+		return get_core_metadata(
+				self.endpoint.session,
+				file,
+				sidecar=sidecar,
+				block_size=block_size,
+				timeout=self.timeout,
+				)
 
 	# @staticmethod
 	# def get_signature_url(download_url: Union[str, URL]) -> str:
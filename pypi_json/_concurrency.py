@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+#
+#  _concurrency.py
+"""
+Internal helpers for running requests concurrently.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Generator, Hashable, Iterable, Tuple, TypeVar, Union
+
+__all__ = ["SingleFlight", "imap_ordered", "imap_unordered"]
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def imap_unordered(
+		func: Callable[[_T], _R],
+		items: Iterable[_T],
+		max_workers: int,
+		) -> Generator[Tuple[_T, Union[_R, Exception]], None, None]:
+	"""
+	Call ``func`` for each of ``items`` on a pool of threads, yielding ``(item, result)`` tuples as they complete.
+
+	If ``func`` raises an :exc:`Exception` it is yielded in place of the result.
+
+	``items`` is consumed lazily, with at most ``2 * max_workers`` calls queued at once.
+	Closing the iterator early cancels any calls which have not yet started.
+
+	:param func:
+	:param items:
+	:param max_workers: The maximum number of calls to run at once.
+	"""
+
+	if max_workers < 1:
+		raise ValueError("'max_workers' must be at least 1")
+
+	items_iter = iter(items)
+	pending: Dict["Future[_R]", _T] = {}
+
+	with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pypi-json") as executor:
+
+		def submit_next() -> bool:
+			for item in items_iter:
+				pending[executor.submit(func, item)] = item
+				return True
+			return False
+
+		try:
+			while len(pending) < 2 * max_workers and submit_next():
+				pass
+
+			while pending:
+				done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+				for future in done:
+					item = pending.pop(future)
+					exception = future.exception()
+					if isinstance(exception, Exception):
+						yield item, exception
+					elif exception is not None:
+						raise exception
+					else:
+						yield item, future.result()
+
+					submit_next()
+
+		finally:
+			for future in pending:
+				future.cancel()
+
+
+def imap_ordered(
+		func: Callable[[_T], _R],
+		items: Iterable[_T],
+		max_workers: int,
+		) -> Generator[Tuple[_T, Union[_R, Exception]], None, None]:
+	"""
+	Like :func:`~.imap_unordered`, but yields the results in the order of ``items``.
+
+	Results which complete early are held until the results before them are available.
+
+	:param func:
+	:param items:
+	:param max_workers: The maximum number of calls to run at once.
+	"""
+
+	completed: Dict[int, Tuple[_T, Union[_R, Exception]]] = {}
+	next_index = 0
+
+	def call(indexed: Tuple[int, _T]) -> _R:
+		return func(indexed[1])
+
+	results = imap_unordered(call, enumerate(items), max_workers)
+
+	try:
+		for (index, item), result in results:
+			completed[index] = (item, result)
+
+			while next_index in completed:
+				yield completed.pop(next_index)
+				next_index += 1
+	finally:
+		results.close()
+
+
+class SingleFlight:
+	"""
+	Deduplicates concurrent calls with the same key.
+
+	While a call for a key is in progress, other threads calling :meth:`~.SingleFlight.do` with the same key
+	wait for it to finish and receive its result (or exception), rather than making the call again.
+	"""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._calls: Dict[Hashable, "Future[Any]"] = {}
+
+	def __len__(self) -> int:
+		return len(self._calls)
+
+	def do(self, key: Hashable, func: Callable[[], _R]) -> _R:
+		"""
+		Call ``func``, unless a call with the same key is already in progress, in which case wait for its result.
+
+		:param key:
+		:param func:
+		"""
+
+		with self._lock:
+			future = self._calls.get(key)
+			leader = future is None
+			if future is None:
+				future = self._calls[key] = Future()
+
+		if not leader:
+			return future.result()
+
+		try:
+			result = func()
+		except BaseException as e:
+			future.set_exception(e)
+			raise
+		else:
+			future.set_result(result)
+			return result
+		finally:
+			with self._lock:
+				del self._calls[key]
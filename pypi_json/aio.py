@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+#
+#  aio.py
+"""
+:mod:`asyncio` client for the PyPI JSON API.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar, Union
+
+# 3rd party
+import requests
+from apeye import URL
+from apeye.requests_url import RequestsURL
+from packaging.version import Version
+from urllib3.util.retry import Retry
+
+# this package
+from pypi_json import ProjectMetadata, PyPIJSON
+from pypi_json.cache import DiskCache, MemoryCache
+from pypi_json.decoders import JSONDecoder
+from pypi_json.metrics import MetricsCallback
+from pypi_json.ratelimit import RateLimiter
+from pypi_json.store import MetadataStore
+from pypi_json.typehints import Self
+
+__all__ = ["AsyncPyPIJSON"]
+
+_T = TypeVar("_T")
+
+
+class AsyncPyPIJSON:
+	"""
+	An :mod:`asyncio` counterpart to :class:`~pypi_json.PyPIJSON`.
+
+	Requests are made through a wrapped :class:`~pypi_json.PyPIJSON` client
+	(available as the :attr:`~.AsyncPyPIJSON.client` attribute) on a pool of worker threads,
+	so the endpoint, authentication, error handling and return types are identical to the synchronous client.
+	Up to ``max_concurrency`` requests may be in flight at once; further requests wait for a free worker.
+
+	An :class:`~.AsyncPyPIJSON` instance can be used as an asynchronous context manager that will automatically
+	close its session and worker threads on exit.
+
+	:param endpoint: The base URL of the JSON API to query;
+		defaults to the base URL for PyPI's simple API.
+	:param auth: Optional login/authentication details for the repository;
+		either a ``(username, password)`` pair or another authentication object accepted by requests.
+	:param session: Optional :class:`requests.Session` object to use instead of creating a fresh one.
+		If a session is not provided one is created with a connection pool large enough for ``max_concurrency``.
+	:param max_concurrency: The maximum number of requests which may be in flight at once.
+	:param disk_cache: Optional :class:`~pypi_json.cache.DiskCache` in which to store responses.
+	:param memory_cache: Optional :class:`~pypi_json.cache.MemoryCache` in which to keep metadata.
+	:param json_decoder: Function to decode JSON responses with.
+		Defaults to the fastest installed decoder; see :mod:`pypi_json.decoders`.
+	:param store: Optional :class:`~pypi_json.store.MetadataStore` to read metadata from and write metadata into.
+	:param retries: The retry policy, either a :class:`urllib3.util.retry.Retry` object or a number of retries.
+		See :class:`~pypi_json.PyPIJSON`.
+	:param rate_limiter: Optional :class:`~pypi_json.ratelimit.RateLimiter` to send every request through.
+	:param metrics_callback: Optional function to call with a :class:`~pypi_json.metrics.RequestMetrics`
+		after each request. It is called from the worker threads, so must be thread safe.
+	"""
+
+	#: The synchronous client used to make the requests.
+	client: PyPIJSON
+
+	#: The maximum number of requests which may be in flight at once.
+	max_concurrency: int
+
+	def __init__(
+			self,
+			endpoint: Union[str, URL] = "https://pypi.org/pypi",
+			auth: Any = None,
+			session: Optional[requests.Session] = None,
+			max_concurrency: int = 100,
+			disk_cache: Optional[DiskCache] = None,
+			memory_cache: Optional[MemoryCache] = None,
+			json_decoder: Optional[JSONDecoder] = None,
+			store: Optional[MetadataStore] = None,
+			retries: Union[int, Retry, None] = None,
+			rate_limiter: Optional[RateLimiter] = None,
+			metrics_callback: Optional[MetricsCallback] = None,
+			) -> None:
+
+		if max_concurrency < 1:
+			raise ValueError("'max_concurrency' must be at least 1")
+
+		pool_maxsize = None
+		if session is None and not isinstance(endpoint, RequestsURL):
+			pool_maxsize = max_concurrency
+
+		self.client = PyPIJSON(
+				endpoint,
+				auth=auth,
+				session=session,
+				disk_cache=disk_cache,
+				memory_cache=memory_cache,
+				json_decoder=json_decoder,
+				store=store,
+				pool_maxsize=pool_maxsize,
+				retries=retries,
+				rate_limiter=rate_limiter,
+				metrics_callback=metrics_callback,
+				)
+		self.max_concurrency = max_concurrency
+		self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="pypi-json")
+
+	@property
+	def endpoint_url(self) -> str:
+		"""
+		The URL of the JSON API endpoint.
+		"""
+
+		return self.client.endpoint_url
+
+	async def __aenter__(self: Self) -> Self:
+		return self
+
+	async def __aexit__(self, exc_type: Any, exc_value: Any, exc_tb: Any) -> None:
+		await self.aclose()
+
+	async def aclose(self) -> None:
+		"""
+		Close the underlying session and shut down the worker threads.
+		"""
+
+		self._executor.shutdown(wait=False)
+		self.client.endpoint.session.close()
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.AsyncPyPIJSON` object.
+		"""
+
+		return f"<{self.__class__.__name__}({self.endpoint_url!r})>"
+
+	async def _run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+		loop = asyncio.get_running_loop()
+		return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+	async def get_metadata(
+			self,
+			project: str,
+			version: Union[str, Version, None] = None,
+			*,
+			lazy: bool = False,
+			) -> ProjectMetadata:
+		"""
+		Returns metadata for the given project on PyPI.
+
+		:param project:
+		:param version: The desired version.
+			If :py:obj:`None` the metadata for the latest release if returned.
+		:param lazy: If :py:obj:`True` return a :class:`~pypi_json.LazyProjectMetadata`,
+			which only decodes each field of the response when it is accessed.
+
+		:raises:
+
+			* :exc:`packaging.requirements.InvalidRequirement` if the project cannot be found on PyPI.
+			* :exc:`requests.HTTPError` if an error occurs when communicating with PyPI.
+		"""
+
+		return await self._run(self.client.get_metadata, project, version, lazy=lazy)
+
+	async def download_file(self, url: Union[str, URL]) -> requests.Response:
+		"""
+		Download the file with the given URL from PyPI.
+
+		:param url:
+		"""
+
+		return await self._run(self.client.download_file, url)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+#
+#  audit.py
+"""
+Auditing pinned requirements for known vulnerabilities.
+
+:func:`~.audit_requirements` fetches the metadata for each distinct pinned version concurrently,
+and collects the :attr:`~pypi_json.ProjectMetadata.vulnerabilities` PyPI reports for it into an :class:`~.AuditReport`.
+
+For audits which are repeated regularly, give the :class:`~pypi_json.PyPIJSON` client a
+:class:`~pypi_json.cache.DiskCache`. PyPI's validators for a version's metadata change whenever the project's
+``last_serial`` does, so versions whose metadata is unchanged since the last audit are answered with
+``304 Not Modified`` and read from the cache.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# 3rd party
+from packaging.requirements import Requirement
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json._concurrency import imap_unordered
+from pypi_json.typehints import VulnerabilityInfoDict
+
+__all__ = ["AuditReport", "AuditResult", "Pin", "audit_requirements", "parse_pin", "read_requirements"]
+
+#: A pinned requirement, as a :class:`packaging.requirements.Requirement`,
+#: a string such as ``'requests==2.26.0'``, or a ``(project, version)`` tuple.
+Pin = Union[str, Requirement, Tuple[str, Union[str, Version]]]
+
+# The extensions pip treats as archives when they are given without a path.
+_ARCHIVE_EXTENSIONS = (".whl", ".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz", ".tar.xz", ".txz")
+
+_direct_reference_re = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*\s*(\[[^\]]*\])?\s*@")
+
+
+def parse_pin(pin: Pin) -> Tuple[str, str]:
+	"""
+	Returns the normalized project name and version of a pinned requirement.
+
+	:param pin:
+
+	:raises ValueError: If the requirement does not pin a single version with ``==`` or ``===``.
+	"""
+
+	if isinstance(pin, tuple):
+		project, version = pin
+		return canonicalize_name(project), str(version)
+
+	requirement = Requirement(pin) if isinstance(pin, str) else pin
+	specifiers = list(requirement.specifier)
+
+	if len(specifiers) != 1 or specifiers[0].operator not in {"==", "==="} or specifiers[0].version.endswith('*'):
+		raise ValueError(f"Requirement {str(requirement)!r} is not pinned to a single version")
+
+	return canonicalize_name(requirement.name), specifiers[0].version
+
+
+def _is_local_or_url(line: str) -> bool:
+	# Whether the line names a local directory, an archive or a URL, rather than a project, as pip would decide.
+
+	location = line.split(';', 1)[0].strip()
+
+	if _direct_reference_re.match(location):
+		# A PEP 508 direct reference, e.g. 'name @ https://...', which Requirement parses itself.
+		return False
+
+	return (
+			location.startswith('.') or '/' in location or '\\' in location
+			or location.lower().endswith(_ARCHIVE_EXTENSIONS)
+			)
+
+
+def read_requirements(filename: Union[str, "os.PathLike[str]"]) -> List[Requirement]:
+	"""
+	Read the requirements from a pip requirements file, such as one produced by ``pip freeze`` or ``pip-compile``.
+
+	Comments, blank lines, options (e.g. ``--index-url`` or ``-r other.txt``), ``--hash`` options,
+	and requirements for local paths, archives or URLs are ignored.
+
+	:param filename:
+
+	:raises packaging.requirements.InvalidRequirement: If a requirement cannot be parsed.
+	"""
+
+	with open(filename, encoding="UTF-8") as fp:
+		content = fp.read()
+
+	requirements = []
+
+	for line in content.replace("\\\n", ' ').splitlines():
+		line = line.split(" #", 1)[0].strip()
+
+		if not line or line.startswith(('#', '-')):
+			continue
+
+		# Per-requirement options, such as --hash, follow the requirement itself
+		line = line.split(" -", 1)[0].strip()
+
+		if _is_local_or_url(line):
+			continue
+
+		requirement = Requirement(line)
+		if requirement.url is None:
+			requirements.append(requirement)
+
+	return requirements
+
+
+class AuditResult(NamedTuple):
+	"""
+	The vulnerabilities affecting one pinned version.
+	"""
+
+	#: The normalized project name.
+	project: str
+
+	#: The pinned version.
+	version: str
+
+	#: Known vulnerabilities affecting the version. Withdrawn vulnerabilities are omitted.
+	vulnerabilities: List[VulnerabilityInfoDict]
+
+	#: The project's ``last_serial`` at the time of the audit, if the metadata could be fetched.
+	last_serial: Optional[int] = None
+
+	#: The exception raised when fetching the version's metadata, if it failed.
+	error: Optional[Exception] = None
+
+	@property
+	def vulnerable(self) -> bool:
+		"""
+		Whether any vulnerabilities affect the version.
+		"""
+
+		return bool(self.vulnerabilities)
+
+
+class AuditReport:
+	"""
+	The result of :func:`~.audit_requirements`.
+
+	:param results:
+	"""
+
+	#: The results for each distinct pinned version, sorted by project name and version.
+	results: List[AuditResult]
+
+	def __init__(self, results: Iterable[AuditResult]) -> None:
+		self.results = sorted(results, key=lambda result: (result.project, result.version))
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.AuditReport`.
+		"""
+
+		return (
+				f"<{self.__class__.__name__}({len(self.results)} pins, "
+				f"{len(self.vulnerable)} vulnerable, {len(self.errors)} errors)>"
+				)
+
+	def __iter__(self) -> Iterator[AuditResult]:
+		return iter(self.results)
+
+	def __len__(self) -> int:
+		return len(self.results)
+
+	@property
+	def vulnerable(self) -> List[AuditResult]:
+		"""
+		The results for pins affected by at least one vulnerability.
+		"""
+
+		return [result for result in self.results if result.vulnerable]
+
+	@property
+	def errors(self) -> List[AuditResult]:
+		"""
+		The results for pins whose metadata could not be fetched.
+		"""
+
+		return [result for result in self.results if result.error is not None]
+
+	def vulnerabilities(self) -> Dict[str, VulnerabilityInfoDict]:
+		"""
+		Returns every vulnerability found, keyed by its ID, without duplicates.
+		"""
+
+		vulnerabilities: Dict[str, VulnerabilityInfoDict] = {}
+
+		for result in self.results:
+			for vulnerability in result.vulnerabilities:
+				vulnerabilities.setdefault(vulnerability["id"], vulnerability)
+
+		return vulnerabilities
+
+	def affected(self) -> Dict[str, List[Tuple[str, str]]]:
+		"""
+		Returns a mapping of vulnerability IDs to the ``(project, version)`` pins they affect.
+		"""
+
+		affected: Dict[str, List[Tuple[str, str]]] = {}
+
+		for result in self.results:
+			for vulnerability in result.vulnerabilities:
+				affected.setdefault(vulnerability["id"], []).append((result.project, result.version))
+
+		return affected
+
+	def to_dict(self) -> Dict[str, List[VulnerabilityInfoDict]]:
+		"""
+		Returns a mapping of ``'project==version'`` strings to the vulnerabilities affecting that version,
+		for the vulnerable pins only.
+		"""  # noqa: D400
+
+		return {f"{result.project}=={result.version}": result.vulnerabilities for result in self.vulnerable}
+
+
+def audit_requirements(
+		client: PyPIJSON,
+		requirements: Iterable[Pin],
+		*,
+		max_workers: int = 10,
+		) -> AuditReport:
+	"""
+	Check pinned requirements for known vulnerabilities.
+
+	Repeated pins (including those differing only in the spelling of the project name or version)
+	are fetched once, and the metadata for the distinct pins is fetched concurrently.
+	Pins whose metadata cannot be fetched are reported in :attr:`AuditReport.errors <.AuditReport.errors>`.
+
+	:param client:
+	:param requirements: The pinned requirements, e.g. from :func:`~.read_requirements`.
+	:param max_workers: The maximum number of requests to make at once.
+
+	:raises ValueError: If one of the requirements is not pinned to a single version.
+	"""
+
+	# Map each distinct pin to the spelling first seen, which is used for the request.
+	pins: Dict[Tuple[str, Union[str, Version]], Tuple[str, str]] = {}
+
+	for requirement in requirements:
+		project, version = parse_pin(requirement)
+		try:
+			pins.setdefault((project, Version(version)), (project, version))
+		except InvalidVersion:
+			# Not a PEP 440 version; only exact duplicates can be merged.
+			pins.setdefault((project, version), (project, version))
+
+	def audit_one(pin: Tuple[str, str]) -> AuditResult:
+		metadata = client.get_metadata(*pin)
+		vulnerabilities = [vuln for vuln in metadata.vulnerabilities or [] if not vuln.get("withdrawn")]
+		return AuditResult(*pin, vulnerabilities, metadata.last_serial)
+
+	results = []
+
+	for pin, result in imap_unordered(audit_one, pins.values(), max_workers):
+		if isinstance(result, Exception):
+			result = AuditResult(*pin, [], error=result)
+		results.append(result)
+
+	return AuditReport(results)
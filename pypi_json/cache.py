@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+#
+#  cache.py
+"""
+Caches for responses from, and metadata obtained from, the PyPI JSON API.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple, Union
+
+# 3rd party
+from packaging.utils import canonicalize_name
+from packaging.version import Version
+
+if TYPE_CHECKING:
+	# this package
+	from pypi_json import ProjectMetadata
+
+__all__ = ["CacheEntry", "CacheInfo", "DiskCache", "MemoryCache"]
+
+
+class CacheEntry(NamedTuple):
+	"""
+	Information about a response stored in a :class:`~.DiskCache`.
+	"""
+
+	#: The URL the response was obtained from.
+	url: str
+
+	#: The value of the response's ``ETag`` header, if any.
+	etag: Optional[str]
+
+	#: The value of the response's ``Last-Modified`` header, if any.
+	last_modified: Optional[str]
+
+	#: The project's ``last_serial`` at the time the response was stored.
+	last_serial: Optional[int]
+
+	#: The size of the stored response body, in bytes.
+	size: int
+
+	def conditional_headers(self) -> Dict[str, str]:
+		"""
+		Returns the headers for a conditional request to revalidate this entry.
+		"""
+
+		headers = {}
+
+		if self.etag is not None:
+			headers["If-None-Match"] = self.etag
+		if self.last_modified is not None:
+			headers["If-Modified-Since"] = self.last_modified
+
+		return headers
+
+
+class DiskCache:
+	"""
+	An on-disk cache of JSON API responses, revalidated with conditional HTTP requests.
+
+	Each response is stored alongside its ``ETag`` and ``Last-Modified`` headers and the project's ``last_serial``.
+	When the same URL is requested again those headers are sent back to the server as
+	``If-None-Match`` and ``If-Modified-Since``, and if the server responds with ``304 Not Modified``
+	the stored document is used rather than downloading it again.
+
+	When the total size of the stored documents exceeds ``max_size``
+	the least recently used entries are evicted.
+
+	The cache is safe to share between threads and between :class:`~pypi_json.PyPIJSON` instances.
+
+	:param directory: The directory to store the cache in. It will be created if it does not exist.
+	:param max_size: The maximum total size of the stored documents, in bytes.
+	"""
+
+	#: The directory the cache is stored in.
+	directory: str
+
+	#: The maximum total size of the stored documents, in bytes.
+	max_size: int
+
+	def __init__(self, directory: Union[str, "os.PathLike[str]"], max_size: int = 256 * 1024 * 1024) -> None:
+		if max_size < 0:
+			raise ValueError("'max_size' cannot be negative")
+
+		self.directory = os.fspath(directory)
+		self.max_size = max_size
+		self._lock = threading.Lock()
+		self._size: Optional[int] = None
+
+		os.makedirs(self.directory, exist_ok=True)
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.DiskCache` object.
+		"""
+
+		return f"<{self.__class__.__name__}({self.directory!r}, max_size={self.max_size})>"
+
+	def _paths(self, url: str) -> List[str]:
+		key = hashlib.sha256(url.encode("UTF-8")).hexdigest()
+		return [os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.meta")]
+
+	def _write_atomic(self, path: str, content: bytes) -> None:
+		fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as fp:
+				fp.write(content)
+			os.replace(tmp_path, path)
+		except BaseException:
+			os.unlink(tmp_path)
+			raise
+
+	def _scan(self) -> List[os.DirEntry]:
+		return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+
+	@property
+	def size(self) -> int:
+		"""
+		The total size of the stored documents, in bytes.
+		"""
+
+		with self._lock:
+			return self._calculate_size()
+
+	def _calculate_size(self) -> int:
+		# Must be called with the lock held.
+		if self._size is None:
+			self._size = sum(entry.stat().st_size for entry in self._scan())
+		return self._size
+
+	def get(self, url: str) -> Optional[CacheEntry]:
+		"""
+		Returns information about the stored response for ``url``, or :py:obj:`None` if it is not cached.
+
+		:param url:
+		"""
+
+		body_path, meta_path = self._paths(url)
+
+		try:
+			with open(meta_path, encoding="UTF-8") as fp:
+				meta = json.load(fp)
+		except (OSError, ValueError):
+			return None
+
+		if not os.path.isfile(body_path) or meta.get("url") != url:
+			return None
+
+		return CacheEntry(
+				url=url,
+				etag=meta.get("etag"),
+				last_modified=meta.get("last_modified"),
+				last_serial=meta.get("last_serial"),
+				size=meta.get("size", 0),
+				)
+
+	def read(self, url: str) -> Optional[bytes]:
+		"""
+		Returns the stored response body for ``url``, or :py:obj:`None` if it is not cached.
+
+		Reading an entry marks it as recently used.
+
+		:param url:
+		"""
+
+		body_path = self._paths(url)[0]
+
+		try:
+			with open(body_path, "rb") as fp:
+				content = fp.read()
+			os.utime(body_path)
+		except OSError:
+			return None
+
+		return content
+
+	def set(  # noqa: A003  # pylint: disable=redefined-builtin
+			self,
+			url: str,
+			content: bytes,
+			etag: Optional[str] = None,
+			last_modified: Optional[str] = None,
+			last_serial: Optional[int] = None,
+			) -> None:
+		"""
+		Store a response in the cache, evicting old entries if the cache is too large.
+
+		Responses larger than :attr:`~.DiskCache.max_size` are not stored.
+
+		:param url: The URL the response was obtained from.
+		:param content: The response body.
+		:param etag: The value of the response's ``ETag`` header.
+		:param last_modified: The value of the response's ``Last-Modified`` header.
+		:param last_serial: The project's ``last_serial``.
+		"""
+
+		if len(content) > self.max_size:
+			return
+
+		body_path, meta_path = self._paths(url)
+		meta = {
+				"url": url,
+				"etag": etag,
+				"last_modified": last_modified,
+				"last_serial": last_serial,
+				"size": len(content),
+				}
+
+		with self._lock:
+			# Ensure the size has been calculated before changing the directory contents.
+			self._size = self._calculate_size()
+
+			try:
+				old_size = os.path.getsize(body_path)
+			except OSError:
+				old_size = 0
+
+			self._write_atomic(body_path, content)
+			self._write_atomic(meta_path, json.dumps(meta).encode("UTF-8"))
+			self._size += len(content) - old_size
+
+			if self._size > self.max_size:
+				self._evict()
+
+	def _evict(self) -> None:
+		# Must be called with the lock held.
+		entries = sorted(self._scan(), key=lambda entry: entry.stat().st_mtime)
+
+		for entry in entries:
+			if self._calculate_size() <= self.max_size:
+				break
+
+			try:
+				size = entry.stat().st_size
+				os.unlink(entry.path)
+			except OSError:
+				continue
+
+			try:
+				os.unlink(entry.path[:-len(".json")] + ".meta")
+			except OSError:
+				pass
+
+			self._size = self._calculate_size() - size
+
+	def delete(self, url: str) -> None:
+		"""
+		Remove the stored response for ``url``, if any.
+
+		:param url:
+		"""
+
+		body_path, meta_path = self._paths(url)
+
+		with self._lock:
+			try:
+				size = os.path.getsize(body_path)
+				os.unlink(body_path)
+			except OSError:
+				size = 0
+
+			try:
+				os.unlink(meta_path)
+			except OSError:
+				pass
+
+			if self._size is not None:
+				self._size -= size
+
+	def clear(self) -> None:
+		"""
+		Remove all entries from the cache.
+		"""
+
+		with self._lock:
+			for entry in os.scandir(self.directory):
+				if entry.name.endswith((".json", ".meta")):
+					try:
+						os.unlink(entry.path)
+					except OSError:
+						pass
+
+			self._size = 0
+
+
+class CacheInfo(NamedTuple):
+	"""
+	Statistics about a :class:`~.MemoryCache`, in the style of :func:`functools.lru_cache`.
+	"""
+
+	#: The number of lookups which found a current entry.
+	hits: int
+
+	#: The number of lookups which did not find a current entry.
+	misses: int
+
+	#: The maximum number of entries.
+	maxsize: int
+
+	#: The current number of entries.
+	currsize: int
+
+
+class MemoryCache:
+	"""
+	An in-process, least-recently-used cache of :class:`~pypi_json.ProjectMetadata` objects.
+
+	Entries are keyed by the normalized project name and the requested version,
+	so ``get_metadata("Foo_Bar")`` and ``get_metadata("foo-bar")`` share an entry.
+	:class:`~pypi_json.LazyProjectMetadata` objects (from ``get_metadata(..., lazy=True)``) are kept separately
+	from fully decoded metadata, so a regular call never returns an object which holds the raw response.
+
+	The cache is safe to share between threads and between :class:`~pypi_json.PyPIJSON` instances.
+
+	:param maxsize: The maximum number of entries. When full the least recently used entry is discarded.
+	:param ttl: The time in seconds after which an entry is considered stale and is discarded.
+		If :py:obj:`None` entries never expire.
+	"""
+
+	#: The maximum number of entries.
+	maxsize: int
+
+	#: The time in seconds after which an entry is considered stale.
+	ttl: Optional[float]
+
+	#: The number of lookups which found a current entry.
+	hits: int
+
+	#: The number of lookups which did not find a current entry.
+	misses: int
+
+	def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 600) -> None:
+		if maxsize < 1:
+			raise ValueError("'maxsize' must be at least 1")
+
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+		self._entries: "OrderedDict[Tuple[str, Optional[str], bool], Tuple[float, ProjectMetadata]]" = OrderedDict()
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.MemoryCache` object.
+		"""
+
+		return f"<{self.__class__.__name__}(maxsize={self.maxsize}, ttl={self.ttl})>"
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	@staticmethod
+	def _make_key(
+			project: str,
+			version: Union[str, Version, None],
+			lazy: bool = False,
+			) -> Tuple[str, Optional[str], bool]:
+		return canonicalize_name(project), None if version is None else str(version), lazy
+
+	def get(
+			self,
+			project: str,
+			version: Union[str, Version, None] = None,
+			*,
+			lazy: bool = False,
+			) -> Optional["ProjectMetadata"]:
+		"""
+		Returns the cached metadata for the given project and version, or :py:obj:`None` if it is not cached.
+
+		:param project:
+		:param version:
+		:param lazy: Whether to look up the cached :class:`~pypi_json.LazyProjectMetadata`
+			rather than the fully decoded metadata.
+		"""
+
+		key = self._make_key(project, version, lazy)
+
+		with self._lock:
+			entry = self._entries.get(key)
+
+			if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+				del self._entries[key]
+				entry = None
+
+			if entry is None:
+				self.misses += 1
+				return None
+
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return entry[1]
+
+	def set(  # noqa: A003  # pylint: disable=redefined-builtin
+			self,
+			project: str,
+			version: Union[str, Version, None],
+			metadata: "ProjectMetadata",
+			*,
+			lazy: bool = False,
+			) -> None:
+		"""
+		Store metadata for the given project and version.
+
+		:param project:
+		:param version:
+		:param metadata:
+		:param lazy: Whether ``metadata`` is a :class:`~pypi_json.LazyProjectMetadata`.
+		"""
+
+		key = self._make_key(project, version, lazy)
+
+		with self._lock:
+			self._entries[key] = (time.monotonic(), metadata)
+			self._entries.move_to_end(key)
+
+			while len(self._entries) > self.maxsize:
+				self._entries.popitem(last=False)
+
+	def invalidate(self, project: Optional[str] = None, version: Union[str, Version, None] = None) -> None:
+		"""
+		Discard cached metadata.
+
+		:param project: The project to discard metadata for.
+			If :py:obj:`None` the whole cache is cleared.
+		:param version: The version to discard metadata for.
+			If :py:obj:`None` metadata for all versions of ``project`` is discarded.
+		"""
+
+		with self._lock:
+			if project is None:
+				self._entries.clear()
+			elif version is None:
+				name = canonicalize_name(project)
+				for key in [key for key in self._entries if key[0] == name]:
+					del self._entries[key]
+			else:
+				self._entries.pop(self._make_key(project, version, False), None)
+				self._entries.pop(self._make_key(project, version, True), None)
+
+	def clear(self) -> None:
+		"""
+		Remove all entries from the cache and reset the statistics.
+		"""
+
+		with self._lock:
+			self._entries.clear()
+			self.hits = 0
+			self.misses = 0
+
+	def cache_info(self) -> CacheInfo:
+		"""
+		Returns statistics about the cache.
+		"""
+
+		with self._lock:
+			return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+#
+#  compact.py
+"""
+A compact, memory-efficient representation of project metadata.
+
+:class:`~pypi_json.ProjectMetadata` keeps each distribution file as a dictionary of about 15 keys,
+several of which are deprecated. When holding metadata for thousands of projects in memory
+:class:`~.CompactProjectMetadata` can be used instead. It stores each file as a :class:`~.CompactFile`,
+which uses ``__slots__``, interns frequently repeated strings, stores the sha256 digest as raw bytes,
+and omits the deprecated ``comment_text``, ``downloads``, ``has_sig`` and ``md5_digest`` fields.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# 3rd party
+from packaging.utils import canonicalize_name
+from packaging.version import Version
+
+# this package
+from pypi_json import ProjectMetadata
+from pypi_json.typehints import DistributionPackageDict, OwnershipInfoDict, ProjectInfoDict, VulnerabilityInfoDict
+from pypi_json.versions import VersionIndex
+
+__all__ = ["CompactFile", "CompactProjectMetadata"]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+	if value is None:
+		return None
+	return sys.intern(value)
+
+
+class CompactFile:
+	"""
+	A memory-efficient representation of a :class:`~pypi_json.typehints.DistributionPackageDict`.
+
+	Deprecated fields are omitted, the sha256 digest is stored as raw bytes,
+	and the ``packagetype``, ``python_version`` and ``requires_python`` strings are interned
+	so that one copy is shared between every file with the same value.
+	"""
+
+	__slots__ = (
+			"filename",
+			"url",
+			"digest",
+			"size",
+			"packagetype",
+			"python_version",
+			"requires_python",
+			"upload_time",
+			"yanked",
+			"yanked_reason",
+			)
+
+	#: The basename of the package file (including extension).
+	filename: str
+
+	#: The URL from which the package file can be downloaded.
+	url: str
+
+	#: The sha256 digest of the file, as raw bytes.
+	digest: bytes
+
+	#: The file size in bytes
+	size: int
+
+	#: The distribution package type, e.g. ``'bdist_wheel'`` or ``'sdist'``.
+	packagetype: str
+
+	#: Either ``'source'`` or a :pep:`425` Python tag.
+	python_version: str
+
+	#: Python runtime version required for project.
+	requires_python: Optional[str]
+
+	#: The time the file was uploaded, in ISO 8601 format.
+	upload_time: str
+
+	#: Whether this version has been yanked. As defined in :pep:`592`.
+	yanked: bool
+
+	#: The reason for applying a :pep:`592` version yank.
+	yanked_reason: Optional[str]
+
+	def __init__(
+			self,
+			filename: str,
+			url: str,
+			digest: bytes,
+			size: int,
+			packagetype: str,
+			python_version: str,
+			requires_python: Optional[str] = None,
+			upload_time: str = '',
+			yanked: bool = False,
+			yanked_reason: Optional[str] = None,
+			) -> None:
+		self.filename = filename
+		self.url = url
+		self.digest = digest
+		self.size = size
+		self.packagetype = sys.intern(packagetype)
+		self.python_version = sys.intern(python_version)
+		self.requires_python = _intern(requires_python)
+		self.upload_time = upload_time
+		self.yanked = yanked
+		self.yanked_reason = _intern(yanked_reason)
+
+	@classmethod
+	def from_dict(cls, file: DistributionPackageDict) -> "CompactFile":
+		"""
+		Construct a :class:`~.CompactFile` from an entry in
+		:attr:`ProjectMetadata.urls <pypi_json.ProjectMetadata.urls>` or
+		:attr:`ProjectMetadata.releases <pypi_json.ProjectMetadata.releases>`.
+
+		:param file:
+		"""  # noqa: D400
+
+		return cls(
+				filename=file["filename"],
+				url=file["url"],
+				digest=bytes.fromhex(file["digests"]["sha256"]),
+				size=file["size"],
+				packagetype=file["packagetype"],
+				python_version=file["python_version"],
+				requires_python=file.get("requires_python"),
+				upload_time=file.get("upload_time_iso_8601") or file.get("upload_time", ''),
+				yanked=file.get("yanked", False),
+				yanked_reason=file.get("yanked_reason"),
+				)
+
+	@property
+	def sha256(self) -> str:
+		"""
+		The sha256 digest of the file, as a hexadecimal string.
+		"""
+
+		return self.digest.hex()
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Returns the file's information as a dictionary,
+		in the format of :class:`~pypi_json.typehints.DistributionPackageDict` but without the deprecated fields.
+		"""  # noqa: D400
+
+		return {
+				"digests": {"sha256": self.sha256},
+				"filename": self.filename,
+				"packagetype": self.packagetype,
+				"python_version": self.python_version,
+				"requires_python": self.requires_python,
+				"size": self.size,
+				"upload_time_iso_8601": self.upload_time,
+				"url": self.url,
+				"yanked": self.yanked,
+				"yanked_reason": self.yanked_reason,
+				}
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, CompactFile):
+			return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+		return NotImplemented
+
+	__hash__ = None  # type: ignore[assignment]
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.CompactFile`.
+		"""
+
+		return f"<{self.__class__.__name__}({self.filename!r})>"
+
+
+class CompactProjectMetadata:
+	"""
+	A memory-efficient counterpart to :class:`~pypi_json.ProjectMetadata`.
+
+	Construct one with :meth:`~.CompactProjectMetadata.from_metadata`.
+	"""
+
+	__slots__ = ("info", "last_serial", "releases", "urls", "vulnerabilities", "ownership", "_version_index")
+
+	#: Generic information about a specific version of a project.
+	info: ProjectInfoDict
+
+	#: Monotonically increasing integer sequence that changes every time the project is updated.
+	last_serial: int
+
+	#: A mapping of version numbers to the files associated with that version,
+	#: or :py:obj:`None` if the metadata was for a specific version.
+	releases: Optional[Dict[str, Tuple[CompactFile, ...]]]
+
+	#: The files associated with this version.
+	urls: Tuple[CompactFile, ...]
+
+	#: Details of vulnerabilities affecting this version.
+	vulnerabilities: List[VulnerabilityInfoDict]
+
+	#: Information about the project's roles and organization membership.
+	ownership: Optional[OwnershipInfoDict]
+
+	_version_index: VersionIndex
+
+	def __init__(
+			self,
+			info: ProjectInfoDict,
+			last_serial: int,
+			releases: Optional[Dict[str, Tuple[CompactFile, ...]]] = None,
+			urls: Tuple[CompactFile, ...] = (),
+			vulnerabilities: Optional[List[VulnerabilityInfoDict]] = None,
+			ownership: Optional[OwnershipInfoDict] = None,
+			) -> None:
+		self.info = info
+		self.last_serial = last_serial
+		self.releases = releases
+		self.urls = urls
+		self.vulnerabilities = vulnerabilities or []
+		self.ownership = ownership
+
+	@classmethod
+	def from_metadata(cls, metadata: ProjectMetadata) -> "CompactProjectMetadata":
+		"""
+		Construct a :class:`~.CompactProjectMetadata` from a :class:`~pypi_json.ProjectMetadata`.
+
+		:param metadata:
+		"""
+
+		releases: Optional[Dict[str, Tuple[CompactFile, ...]]]
+
+		if metadata.releases is None:
+			releases = None
+		else:
+			releases = {
+					sys.intern(version): tuple(map(CompactFile.from_dict, files))
+					for version, files in metadata.releases.items()
+					}
+
+		return cls(
+				info=metadata.info,
+				last_serial=metadata.last_serial,
+				releases=releases,
+				urls=tuple(map(CompactFile.from_dict, metadata.urls)),
+				vulnerabilities=metadata.vulnerabilities,
+				ownership=metadata.ownership,
+				)
+
+	@property
+	def name(self) -> str:
+		"""
+		Return the normalized project name.
+		"""
+
+		return canonicalize_name(self.info["name"])
+
+	@property
+	def version(self) -> Version:
+		"""
+		Return the release version.
+		"""
+
+		return Version(self.info["version"])
+
+	@property
+	def version_index(self) -> VersionIndex:
+		"""
+		A sorted index of the versions in :attr:`~.CompactProjectMetadata.releases`.
+
+		The index is built on first access and reused afterwards.
+		"""
+
+		try:
+			return self._version_index
+		except AttributeError:
+			pass
+
+		if self.releases is None:
+			raise ValueError("The metadata does not include any releases.")
+
+		index = self._version_index = VersionIndex(self.releases)
+		return index
+
+	def get_latest_version(self) -> Version:
+		"""
+		Returns the version number of the latest release on PyPI for this project.
+		"""
+
+		latest = self.version_index.latest()
+		if latest is None:
+			raise ValueError("No matching versions found.")
+		return latest
+
+	def get_releases(self) -> Dict[str, List[str]]:
+		"""
+		Returns a dictionary mapping PyPI release versions to download URLs.
+		"""
+
+		if self.releases is None:
+			raise ValueError("The metadata does not include any releases.")
+
+		return {version: [file.url for file in files] for version, files in self.releases.items()}
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.CompactProjectMetadata`.
+		"""
+
+		return f"<{self.__class__.__name__}({self.info['name']!r}, last_serial={self.last_serial})>"
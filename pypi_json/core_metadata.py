@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+#
+#  core_metadata.py
+"""
+Fetching the core metadata (the ``METADATA`` file) of a distribution without downloading the whole file.
+
+The metadata is taken from the ``.metadata`` file served alongside the distribution, as described in :pep:`658`,
+where the index provides one. Otherwise, for wheels, the zip file's central directory and the
+``*.dist-info/METADATA`` member are read with HTTP ``Range`` requests through an :class:`~.HTTPRangeFile`.
+Either way only a few kilobytes are usually transferred, however large the distribution.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import hashlib
+import io
+import re
+import zipfile
+from email.message import Message
+from email.parser import BytesParser
+from typing import Any, Dict, Optional, Tuple
+
+# 3rd party
+import requests
+from packaging.utils import canonicalize_name
+
+# this package
+from pypi_json.download import DigestMismatchError, FileLike, FileSpec
+
+__all__ = ["DEFAULT_BLOCK_SIZE", "HTTPRangeFile", "get_core_metadata", "read_wheel_metadata"]
+
+#: The default number of bytes to request at once when reading a file with HTTP ``Range`` requests.
+DEFAULT_BLOCK_SIZE: int = 64 * 1024
+
+# The keys used to advertise PEP 658 metadata files, newest first (PEP 714 renamed the original key).
+_SIDECAR_KEYS = ("core-metadata", "data-dist-info-metadata", "dist-info-metadata")
+
+_content_range_re = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+
+class HTTPRangeFile(io.RawIOBase):
+	"""
+	A read-only, seekable file object for a remote file, which fetches the parts which are read
+	with HTTP ``Range`` requests.
+
+	Data is fetched in blocks of ``block_size`` bytes, and each block is only fetched once.
+	Adjacent missing blocks are fetched with a single request.
+	If the size of the file is not known the first request fetches its final block,
+	which for zip files usually contains the central directory.
+
+	If the server does not support ``Range`` requests the whole file is downloaded by the first request.
+
+	:param session: The session to make the requests with.
+	:param url: The URL of the file.
+	:param size: The size of the file in bytes, if known.
+	:param block_size: The number of bytes to request at once.
+	:param timeout: The timeout for the requests, as accepted by :meth:`requests.Session.get`.
+	"""  # noqa: D400
+
+	#: The URL of the file.
+	url: str
+
+	#: The number of requests made so far.
+	requests_made: int
+
+	#: The number of bytes received so far.
+	bytes_received: int
+
+	def __init__(
+			self,
+			session: requests.Session,
+			url: str,
+			size: Optional[int] = None,
+			*,
+			block_size: int = DEFAULT_BLOCK_SIZE,
+			timeout: Any = None,
+			) -> None:
+		super().__init__()
+
+		if block_size < 1:
+			raise ValueError("'block_size' must be at least 1")
+
+		self.url = url
+		self.requests_made = 0
+		self.bytes_received = 0
+		self._session = session
+		self._size = size
+		self._block_size = block_size
+		self._timeout = timeout
+		self._blocks: Dict[int, bytes] = {}
+		self._position = 0
+
+	@property
+	def size(self) -> int:
+		"""
+		The size of the file in bytes.
+		"""
+
+		if self._size is None:
+			self._fetch_tail()
+			assert self._size is not None
+
+		return self._size
+
+	def readable(self) -> bool:  # noqa: D102
+		return True
+
+	def seekable(self) -> bool:  # noqa: D102
+		return True
+
+	def tell(self) -> int:  # noqa: D102
+		return self._position
+
+	def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:  # noqa: D102
+		if whence == io.SEEK_SET:
+			position = offset
+		elif whence == io.SEEK_CUR:
+			position = self._position + offset
+		elif whence == io.SEEK_END:
+			position = self.size + offset
+		else:
+			raise ValueError(f"Invalid whence ({whence})")
+
+		if position < 0:
+			raise ValueError(f"Negative seek position {position}")
+
+		self._position = position
+		return position
+
+	def readinto(self, buffer: Any) -> int:  # noqa: D102
+		end = min(self._position + len(buffer), self.size)
+		if end <= self._position:
+			return 0
+
+		data = self._read_range(self._position, end)
+		buffer[:len(data)] = data
+		self._position += len(data)
+		return len(data)
+
+	def _get(self, range_header: str) -> requests.Response:
+		response = self._session.get(self.url, headers={"Range": range_header}, timeout=self._timeout)
+		response.raise_for_status()
+		self.requests_made += 1
+		self.bytes_received += len(response.content)
+		return response
+
+	def _store(self, response: requests.Response) -> Tuple[int, int]:
+		"""
+		Store the blocks from a response, returning the first and last byte positions it contained.
+		"""
+
+		content = response.content
+
+		if response.status_code == 206:
+			match = _content_range_re.fullmatch(response.headers.get("Content-Range", '').strip())
+			if match is None:
+				raise ValueError(f"Invalid Content-Range header in response from {self.url}")
+			start, total = int(match.group(1)), int(match.group(3))
+		else:
+			# The server ignored the Range header and sent the whole file.
+			start, total = 0, len(content)
+
+		self._size = total
+		end = start + len(content)
+		block_size = self._block_size
+
+		# Only keep whole blocks, and the final block of the file.
+		first_block = -(-start // block_size)
+		for block in range(first_block, -(-end // block_size)):
+			block_start = block * block_size
+			block_end = min(block_start + block_size, total)
+			if block_end <= end:
+				self._blocks[block] = content[block_start - start:block_end - start]
+
+		return start, end
+
+	def _fetch_tail(self) -> None:
+		self._store(self._get(f"bytes=-{self._block_size}"))
+
+	def _read_range(self, start: int, end: int) -> bytes:
+		block_size = self._block_size
+		first_block, last_block = start // block_size, (end - 1) // block_size
+
+		block = first_block
+		while block <= last_block:
+			if block in self._blocks:
+				block += 1
+				continue
+
+			run_end = block
+			while run_end + 1 <= last_block and run_end + 1 not in self._blocks:
+				run_end += 1
+
+			range_end = min((run_end + 1) * block_size, self.size) - 1
+			self._store(self._get(f"bytes={block * block_size}-{range_end}"))
+			block = run_end + 1
+
+		data = b''.join(self._blocks[block] for block in range(first_block, last_block + 1))
+		offset = first_block * block_size
+		return data[start - offset:end - offset]
+
+
+def read_wheel_metadata(wheel: Any, filename: Optional[str] = None) -> bytes:
+	"""
+	Returns the contents of the ``METADATA`` file in a wheel.
+
+	:param wheel: The path to the wheel, or a seekable binary file object such as an :class:`~.HTTPRangeFile`.
+	:param filename: The wheel's filename, used to pick the right ``.dist-info`` directory if there are several.
+
+	:raises ValueError: If the wheel does not contain a ``METADATA`` file.
+	"""
+
+	with zipfile.ZipFile(wheel) as zf:
+		candidates = [
+				name for name in zf.namelist()
+				if name.count('/') == 1 and name.endswith(".dist-info/METADATA")
+				]
+
+		if len(candidates) > 1 and filename is not None:
+			project = canonicalize_name(filename.split('-', 1)[0])
+			candidates = [
+					name for name in candidates if canonicalize_name(name.split('-', 1)[0]) == project
+					] or candidates
+
+		if not candidates:
+			raise ValueError(f"No .dist-info/METADATA file found in {filename or 'the wheel'}")
+
+		return zf.read(candidates[0])
+
+
+def _advertised_sidecar(file: FileLike) -> Tuple[Optional[bool], Optional[str]]:
+	"""
+	Returns whether the index advertises a :pep:`658` metadata file for ``file``
+	(or :py:obj:`None` if it does not say), and the file's sha256 digest if given.
+	"""  # noqa: D400
+
+	if not isinstance(file, dict):
+		return None, None
+
+	for key in _SIDECAR_KEYS:
+		if key in file:
+			value = file[key]  # type: ignore[literal-required]
+			if isinstance(value, dict):
+				return True, value.get("sha256")
+			return bool(value), None
+
+	return None, None
+
+
+def get_core_metadata(
+		session: requests.Session,
+		file: FileLike,
+		*,
+		sidecar: bool = True,
+		block_size: int = DEFAULT_BLOCK_SIZE,
+		timeout: Any = None,
+		) -> Message:
+	"""
+	Returns the core metadata of a distribution, without downloading the distribution itself.
+
+	Unless the index says otherwise, the :pep:`658` ``.metadata`` file alongside the distribution is tried first.
+	As PyPI's JSON API does not say which files have one, this costs a request which fails
+	for files uploaded before PyPI started providing them.
+	If there is no ``.metadata`` file, and the distribution is a wheel, the ``METADATA`` file is read
+	from the wheel with HTTP ``Range`` requests.
+
+	:param session: The session to make the requests with.
+	:param file: The URL of the distribution, or an entry from
+		:attr:`ProjectMetadata.urls <pypi_json.ProjectMetadata.urls>` or
+		:attr:`ProjectMetadata.releases <pypi_json.ProjectMetadata.releases>`.
+	:param sidecar: Whether to try the :pep:`658` ``.metadata`` file.
+	:param block_size: The number of bytes to request at once when reading the wheel with ``Range`` requests.
+	:param timeout: The timeout for the requests, as accepted by :meth:`requests.Session.get`.
+
+	:raises:
+
+		* :exc:`pypi_json.download.DigestMismatchError` if the ``.metadata`` file
+		  does not match the digest given by the index.
+		* :exc:`ValueError` if the distribution is not a wheel and has no ``.metadata`` file,
+		  or if the wheel does not contain a ``METADATA`` file.
+		* :exc:`requests.HTTPError` if an error occurs when communicating with the server.
+
+	:returns: The metadata, parsed as an email message as described in the
+		`core metadata specification <https://packaging.python.org/en/latest/specifications/core-metadata/>`_.
+	"""
+
+	advertised, sha256 = _advertised_sidecar(file)
+	spec = FileSpec.from_file(file)
+
+	if sidecar and advertised is not False:
+		metadata_url = spec.url + ".metadata"
+		response = session.get(metadata_url, timeout=timeout)
+
+		if response.status_code == 200:
+			if sha256 is not None:
+				digest = hashlib.sha256(response.content).hexdigest()
+				if digest != sha256:
+					raise DigestMismatchError(metadata_url, sha256, digest)
+
+			return BytesParser().parsebytes(response.content)
+
+		if advertised or response.status_code != 404:
+			response.raise_for_status()
+
+	if not spec.filename.endswith(".whl"):
+		raise ValueError(f"Cannot read the metadata of {spec.filename!r} as it is not a wheel")
+
+	with HTTPRangeFile(session, spec.url, spec.size, block_size=block_size, timeout=timeout) as fp:
+		return BytesParser().parsebytes(read_wheel_metadata(fp, spec.filename))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+#
+#  decoders.py
+"""
+JSON decoders for responses from the PyPI JSON API.
+
+By default the fastest installed decoder is used,
+trying `orjson <https://github.com/ijl/orjson>`_ and then `msgspec <https://jcristharif.com/msgspec/>`_
+before falling back to the standard library's :mod:`json` module.
+
+.. versionadded:: 0.6.0
+
+.. extras-require:: orjson
+	:pyproject:
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+from typing import Any, Callable, Dict, Optional
+
+__all__ = ["JSONDecoder", "available_decoders", "get_decoder", "stdlib_decoder"]
+
+#: A function which decodes a JSON document from :class:`bytes`.
+JSONDecoder = Callable[[bytes], Any]
+
+
+def stdlib_decoder(content: bytes) -> Any:
+	"""
+	Decode a JSON document with the standard library's :func:`json.loads`.
+
+	:param content:
+	"""
+
+	return json.loads(content)
+
+
+def available_decoders() -> Dict[str, JSONDecoder]:
+	"""
+	Returns a mapping of the names of the installed JSON decoders to the decoding functions, fastest first.
+	"""
+
+	decoders: Dict[str, JSONDecoder] = {}
+
+	try:
+		# 3rd party
+		import orjson
+		decoders["orjson"] = orjson.loads
+	except ImportError:  # pragma: no cover
+		pass
+
+	try:
+		# 3rd party
+		import msgspec
+		decoders["msgspec"] = msgspec.json.decode
+	except ImportError:  # pragma: no cover
+		pass
+
+	decoders["json"] = stdlib_decoder
+
+	return decoders
+
+
+def get_decoder(name: Optional[str] = None) -> JSONDecoder:
+	"""
+	Returns the JSON decoder with the given name, or the fastest installed decoder if ``name`` is :py:obj:`None`.
+
+	:param name: One of ``'orjson'``, ``'msgspec'`` or ``'json'``.
+
+	:raises ValueError: If the requested decoder is not installed.
+	"""
+
+	decoders = available_decoders()
+
+	if name is None:
+		return next(iter(decoders.values()))
+
+	try:
+		return decoders[name]
+	except KeyError:
+		raise ValueError(f"Unknown or unavailable JSON decoder {name!r}") from None
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+#
+#  dependencies.py
+"""
+Concurrent crawling of the dependency graph described by projects' ``requires_dist`` metadata.
+
+:func:`~.crawl_dependencies` walks the graph breadth-first, fetching every project in each level
+of the graph at once, so the closure of a set of requirements takes one round trip per level
+rather than one per project.
+
+This is not a dependency resolver: each project is visited once, at the newest version which satisfies
+every requirement on it found in the level where it first appears. Requirements found in later levels are
+recorded in the graph but do not change the version chosen.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+# 3rd party
+from packaging.markers import UndefinedEnvironmentName
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import Version
+
+# this package
+from pypi_json import ProjectMetadata, PyPIJSON
+from pypi_json._concurrency import imap_unordered
+
+__all__ = ["DependencyGraph", "DependencyNode", "crawl_dependencies", "evaluate_requirements"]
+
+
+def evaluate_requirements(
+		requires_dist: Iterable[Union[str, Requirement]],
+		extras: Iterable[str] = (),
+		environment: Optional[Mapping[str, str]] = None,
+		) -> List[Requirement]:
+	"""
+	Returns the requirements from ``requires_dist`` which apply in the given environment.
+
+	:param requires_dist: e.g. :attr:`ProjectMetadata.info["requires_dist"] <pypi_json.ProjectMetadata.info>`.
+	:param extras: The extras of the project which are requested.
+	:param environment: The values of the :pep:`508` environment markers to evaluate markers against.
+		Defaults to the running interpreter. Values which are not given are also taken from the running interpreter.
+	"""
+
+	# Marker.evaluate() takes any values not given here from the running interpreter.
+	env: Dict[str, str] = dict(environment or {})
+	all_extras = ['', *sorted({canonicalize_name(extra) for extra in extras})]
+	requirements = []
+
+	for requirement in requires_dist:
+		if isinstance(requirement, str):
+			requirement = Requirement(requirement)
+
+		if requirement.marker is None or any(
+				requirement.marker.evaluate({**env, "extra": extra}) for extra in all_extras
+				):
+			requirements.append(requirement)
+
+	return requirements
+
+
+class DependencyNode:
+	"""
+	A project in a :class:`~.DependencyGraph`.
+
+	:param name: The normalized name of the project.
+	:param metadata: The metadata of the chosen version of the project.
+	:param depth: The number of requirements between the project and the initial requirements.
+	"""
+
+	#: The normalized name of the project.
+	name: str
+
+	#: The chosen version of the project.
+	version: Version
+
+	#: The metadata of the chosen version of the project.
+	metadata: ProjectMetadata
+
+	#: The number of requirements between the project and the initial requirements.
+	#: Projects which are initial requirements have a depth of ``0``.
+	depth: int
+
+	#: The extras of the project which were requested.
+	extras: Set[str]
+
+	#: The requirements of the project which apply in the target environment with the requested extras.
+	#: These are recorded even for projects at ``max_depth``, whose dependencies are not fetched.
+	requirements: List[Requirement]
+
+	#: Mapping of entries in the project's ``requires_dist`` which could not be parsed or evaluated
+	#: to the exception raised. These are skipped when crawling.
+	invalid_requirements: Dict[str, Exception]
+
+	def __init__(self, name: str, metadata: ProjectMetadata, depth: int) -> None:
+		self.name = name
+		self.version = metadata.version
+		self.metadata = metadata
+		self.depth = depth
+		self.extras = set()
+		self.requirements = []
+		self.invalid_requirements = {}
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.DependencyNode`.
+		"""
+
+		return f"<{self.__class__.__name__}({self.name!r}, version={str(self.version)!r}, depth={self.depth})>"
+
+	@property
+	def dependencies(self) -> List[str]:
+		"""
+		The normalized names of the project's dependencies, without duplicates.
+		"""
+
+		return list(dict.fromkeys(canonicalize_name(requirement.name) for requirement in self.requirements))
+
+	def add_extras(
+			self,
+			extras: Iterable[str],
+			environment: Optional[Mapping[str, str]] = None,
+			) -> List[Requirement]:
+		"""
+		Add requirements for the given extras, and the project's unconditional requirements if not already added.
+
+		Entries of ``requires_dist`` which cannot be parsed or evaluated are recorded in
+		:attr:`~.DependencyNode.invalid_requirements` and skipped.
+
+		:param extras:
+		:param environment: The values of the :pep:`508` environment markers to evaluate markers against.
+
+		:returns: The requirements which were added.
+		"""
+
+		new_extras = {canonicalize_name(extra) for extra in extras} - self.extras
+		first = not self.extras and not self.requirements
+
+		if not new_extras and not first:
+			return []
+
+		known = {str(requirement) for requirement in self.requirements}
+		self.extras.update(new_extras)
+
+		added = []
+		for entry in self.metadata.info.get("requires_dist") or []:
+			try:
+				# Evaluated one at a time, so one malformed entry (as found in some older releases)
+				# does not prevent the others from being used.
+				requirements = evaluate_requirements([entry], self.extras, environment)
+			except (InvalidRequirement, UndefinedEnvironmentName) as e:
+				self.invalid_requirements[entry] = e
+				continue
+
+			for requirement in requirements:
+				if str(requirement) not in known:
+					known.add(str(requirement))
+					added.append(requirement)
+
+		self.requirements.extend(added)
+		return added
+
+
+class DependencyGraph:
+	"""
+	The result of :func:`~.crawl_dependencies`.
+
+	Nodes are keyed by normalized project name.
+	"""
+
+	#: The normalized names of the projects named in the initial requirements.
+	roots: List[str]
+
+	#: Mapping of normalized project names to nodes.
+	nodes: Dict[str, DependencyNode]
+
+	#: Mapping of the normalized names of projects which could not be fetched to the exception raised.
+	errors: Dict[str, Exception]
+
+	def __init__(self) -> None:
+		self.roots = []
+		self.nodes = {}
+		self.errors = {}
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.DependencyGraph`.
+		"""
+
+		return f"<{self.__class__.__name__}({len(self.nodes)} nodes, {len(self.errors)} errors)>"
+
+	def __len__(self) -> int:
+		return len(self.nodes)
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.nodes)
+
+	def __contains__(self, name: object) -> bool:
+		return isinstance(name, str) and canonicalize_name(name) in self.nodes
+
+	def __getitem__(self, name: str) -> DependencyNode:
+		return self.nodes[canonicalize_name(name)]
+
+	def edges(self) -> Iterator[Tuple[str, str]]:
+		"""
+		Iterate over ``(project, dependency)`` pairs of normalized names.
+		"""
+
+		for name, node in self.nodes.items():
+			for dependency in node.dependencies:
+				yield name, dependency
+
+	def pins(self) -> Dict[str, Version]:
+		"""
+		Returns a mapping of normalized project names to the chosen versions.
+		"""
+
+		return {name: node.version for name, node in self.nodes.items()}
+
+	def to_dict(self) -> Dict[str, List[str]]:
+		"""
+		Returns the graph as a mapping of normalized project names to the names of their dependencies.
+		"""
+
+		return {name: node.dependencies for name, node in self.nodes.items()}
+
+
+def _fetch_best(client: PyPIJSON, project: str, specifier: SpecifierSet) -> ProjectMetadata:
+	"""
+	Returns the metadata for the newest version of the project which satisfies ``specifier``,
+	preferring versions which have not been yanked.
+
+	Only one request is made if the latest release satisfies the specifier.
+	"""  # noqa: D400
+
+	metadata = client.get_metadata(project)
+
+	if specifier.contains(metadata.version, prereleases=True):
+		return metadata
+
+	index = metadata.version_index
+	candidates = index.filter(specifier)
+
+	if not candidates:
+		raise ValueError(f"No versions of {project!r} match {str(specifier)!r}")
+
+	for version in reversed(candidates):
+		if not index.is_yanked(version):
+			break
+	else:
+		version = candidates[-1]
+
+	return client.get_metadata(project, index.key_for(version))
+
+
+def crawl_dependencies(
+		client: PyPIJSON,
+		requirements: Iterable[Union[str, Requirement]],
+		*,
+		environment: Optional[Mapping[str, str]] = None,
+		max_depth: Optional[int] = None,
+		max_workers: int = 10,
+		) -> DependencyGraph:
+	"""
+	Fetch the metadata for ``requirements`` and all of their dependencies, and return the dependency graph.
+
+	The graph is crawled a level at a time, with all of the new projects in each level fetched concurrently
+	(using up to ``max_workers`` threads) and each project fetched only once.
+	Requirements whose markers do not apply in ``environment`` are skipped, including the initial requirements.
+
+	Projects which cannot be fetched, or which have no version satisfying the requirements on them,
+	are recorded in :attr:`DependencyGraph.errors <.DependencyGraph.errors>` and the crawl continues without them.
+	Malformed entries in a project's ``requires_dist`` are recorded in
+	:attr:`DependencyNode.invalid_requirements <.DependencyNode.invalid_requirements>` and skipped.
+
+	:param client:
+	:param requirements: The initial requirements, e.g. ``['requests>=2.26', 'apeye[limiter]']``.
+	:param environment: The values of the :pep:`508` environment markers to evaluate markers against,
+		e.g. ``{"python_version": "3.8", "sys_platform": "win32"}``.
+		Values which are not given are taken from the running interpreter.
+	:param max_depth: The maximum depth to crawl to. If ``0`` only the initial requirements are fetched.
+		If :py:obj:`None` the whole graph is crawled.
+	:param max_workers: The maximum number of requests to make at once.
+	"""
+
+	graph = DependencyGraph()
+	frontier: Dict[str, List[Requirement]] = {}
+
+	for requirement in requirements:
+		if isinstance(requirement, str):
+			requirement = Requirement(requirement)
+
+		if not evaluate_requirements([requirement], environment=environment):
+			continue
+
+		root = canonicalize_name(requirement.name)
+		if root not in frontier:
+			graph.roots.append(root)
+		frontier.setdefault(root, []).append(requirement)
+
+	depth = 0
+
+	while frontier:
+		next_frontier: Dict[str, List[Requirement]] = {}
+		to_fetch: Dict[str, SpecifierSet] = {}
+
+		for project, found in frontier.items():
+			if project in graph.nodes:
+				# Already visited; only newly requested extras can add dependencies.
+				_add_requirements(graph.nodes[project], found, environment, max_depth, next_frontier)
+			elif project not in graph.errors:
+				specifier = SpecifierSet()
+				for requirement in found:
+					specifier &= requirement.specifier
+				to_fetch[project] = specifier
+
+		results = imap_unordered(
+				lambda project: _fetch_best(client, project, to_fetch[project]),
+				to_fetch,
+				max_workers,
+				)
+
+		for project, metadata in results:
+			if isinstance(metadata, Exception):
+				graph.errors[project] = metadata
+			else:
+				node = graph.nodes[project] = DependencyNode(project, metadata, depth)
+				_add_requirements(node, frontier[project], environment, max_depth, next_frontier)
+
+		frontier = next_frontier
+		depth += 1
+
+	return graph
+
+
+def _add_requirements(
+		node: DependencyNode,
+		found: List[Requirement],
+		environment: Optional[Mapping[str, str]],
+		max_depth: Optional[int],
+		frontier: Dict[str, List[Requirement]],
+		) -> None:
+	extras = {extra for requirement in found for extra in requirement.extras}
+	added = node.add_extras(extras, environment)
+
+	if max_depth is None or node.depth < max_depth:
+		for requirement in added:
+			frontier.setdefault(canonicalize_name(requirement.name), []).append(requirement)
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+#
+#  download.py
+"""
+Helpers for downloading distribution files.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import json
+import os
+import posixpath
+import threading
+import time
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Set, Tuple, Union, cast
+from urllib.parse import unquote, urlparse
+
+# 3rd party
+import requests
+from apeye import URL
+
+# this package
+from pypi_json._concurrency import imap_unordered
+from pypi_json.typehints import DistributionPackageDict, FileURL
+
+__all__ = [
+		"DEFAULT_CHUNK_SIZE",
+		"DigestMismatchError",
+		"DownloadResult",
+		"FileLike",
+		"FileSpec",
+		"ProgressCallback",
+		"download_files",
+		"file_matches",
+		"stream_download",
+		]
+
+#: The default size of the chunks in which files are downloaded, in bytes.
+DEFAULT_CHUNK_SIZE: int = 1024 * 1024
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+#: A file which can be downloaded: a URL,
+#: an entry from :attr:`ProjectMetadata.urls <pypi_json.ProjectMetadata.urls>`,
+#: an entry from :meth:`ProjectMetadata.get_releases_with_digests
+#: <pypi_json.ProjectMetadata.get_releases_with_digests>`, or a :class:`~.FileSpec`.
+FileLike = Union[str, URL, DistributionPackageDict, FileURL, "FileSpec"]
+
+
+class DigestMismatchError(ValueError):
+	"""
+	Raised when a downloaded file does not have the expected size or sha256 digest.
+
+	:param url: The URL of the file.
+	:param expected: The expected digest or size.
+	:param actual: The actual digest or size.
+	"""
+
+	#: The URL of the file.
+	url: str
+
+	#: The expected digest or size.
+	expected: Union[str, int]
+
+	#: The actual digest or size.
+	actual: Union[str, int]
+
+	def __init__(self, url: str, expected: Union[str, int], actual: Union[str, int]) -> None:
+		if isinstance(expected, int):
+			message = f"Expected {expected} bytes from {url}, got {actual}"
+		else:
+			message = f"sha256 digest mismatch for {url}: expected {expected}, got {actual}"
+
+		super().__init__(message)
+		self.url = url
+		self.expected = expected
+		self.actual = actual
+
+
+def _check_filename(filename: str) -> str:
+	"""
+	Returns ``filename`` if it is safe to create in a directory, raising :exc:`ValueError` otherwise.
+	"""
+
+	separators = {'/', os.sep, os.altsep or os.sep}
+	if filename in {'', '.', ".."} or any(sep in filename for sep in separators):
+		raise ValueError(f"Unsafe filename {filename!r}")
+
+	return filename
+
+
+def _filename_from_url(url: str) -> str:
+	# The path is decoded before taking the basename, so an encoded '/' cannot smuggle in a directory.
+	filename = posixpath.basename(unquote(urlparse(url).path))
+	if filename:
+		_check_filename(filename)
+	return filename
+
+
+def _unchecked_spec(file: FileLike) -> "FileSpec":
+	# A FileSpec to report a failed download with, which is built even if the filename is unsafe.
+
+	if isinstance(file, FileSpec):
+		return file
+
+	if isinstance(file, (str, URL)):
+		url = str(file)
+		return FileSpec(url, posixpath.basename(unquote(urlparse(url).path)))
+
+	url = file["url"]
+	filename = cast(Dict[str, Any], file).get("filename") or posixpath.basename(unquote(urlparse(url).path))
+	return FileSpec(url, filename)
+
+
+class FileSpec(NamedTuple):
+	"""
+	The information needed to download and verify a file.
+	"""
+
+	#: The URL of the file.
+	url: str
+
+	#: The name of the file.
+	filename: str
+
+	#: The expected sha256 digest of the file, if known.
+	sha256: Optional[str] = None
+
+	#: The expected size of the file in bytes, if known.
+	size: Optional[int] = None
+
+	@classmethod
+	def from_file(cls, file: FileLike) -> "FileSpec":
+		"""
+		Construct a :class:`~.FileSpec` from a URL, an entry from
+		:attr:`ProjectMetadata.urls <pypi_json.ProjectMetadata.urls>` or
+		:attr:`ProjectMetadata.releases <pypi_json.ProjectMetadata.releases>`,
+		or an entry from :meth:`ProjectMetadata.get_releases_with_digests
+		<pypi_json.ProjectMetadata.get_releases_with_digests>`.
+
+		:param file:
+
+		:raises ValueError: If the filename contains a path separator or is ``..``.
+		"""  # noqa: D400
+
+		if isinstance(file, FileSpec):
+			return file
+
+		if isinstance(file, (str, URL)):
+			url = str(file)
+			return cls(url, _filename_from_url(url))
+
+		if "digest" in file:
+			url = file["url"]
+			sha256 = file["digest"]  # type: ignore[typeddict-item]
+			return cls(url, _filename_from_url(url), sha256=sha256)
+
+		return cls(
+				url=file["url"],
+				filename=_check_filename(file["filename"]),
+				sha256=file.get("digests", {}).get("sha256"),
+				size=file.get("size"),
+				)
+
+
+#: A function called with the file being downloaded,
+#: the number of bytes received so far and the expected size of the file (if known).
+ProgressCallback = Callable[[FileSpec, int, Optional[int]], None]
+
+
+class DownloadResult(NamedTuple):
+	"""
+	The outcome of downloading a file with :func:`~.download_files`.
+	"""
+
+	#: The file which was downloaded.
+	file: FileSpec
+
+	#: The path the file was downloaded to.
+	#: Empty if the download failed because the filename was unsafe to create in the directory.
+	path: str
+
+	#: The number of bytes downloaded.
+	size: int = 0
+
+	#: The time taken to download the file, in seconds.
+	elapsed: float = 0.0
+
+	#: Whether the download was skipped because a file with the expected digest already exists.
+	skipped: bool = False
+
+	#: The exception raised when downloading the file, if the download failed.
+	error: Optional[Exception] = None
+
+	@property
+	def throughput(self) -> float:
+		"""
+		The download rate, in bytes per second.
+		"""
+
+		if not self.elapsed:
+			return 0.0
+
+		return self.size / self.elapsed
+
+
+def stream_download(
+		session: requests.Session,
+		file: FileLike,
+		destination: Union[PathLike, IO[bytes]],
+		*,
+		sha256: Optional[str] = None,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		timeout: Any = None,
+		progress: Optional[ProgressCallback] = None,
+		resume: bool = False,
+		segments: int = 1,
+		) -> str:
+	"""
+	Download a file in fixed-size chunks, verifying its size and sha256 digest as it arrives.
+
+	Only one chunk is held in memory at a time, whatever the size of the file.
+
+	When downloading to a path the data is written to a temporary ``.part`` file alongside it,
+	which is only moved into place once the file has been verified.
+
+	If ``resume`` is :py:obj:`True` the ``.part`` file is kept if the download fails,
+	and a later call continues from the end of it with an HTTP ``Range`` request.
+	If the server does not support ranges the download starts again from the beginning.
+
+	If ``segments`` is greater than one, and the expected size of the file is known,
+	the file is split into that many byte ranges which are downloaded in parallel.
+	This can improve throughput on high-latency links.
+	As the segments arrive out of order the digest is calculated once the download has finished.
+	Segmented downloads can also be resumed, in which case only the unfinished segments are downloaded again.
+
+	:param session: The session to make the request with.
+	:param file: The URL of the file, or an entry from
+		:attr:`ProjectMetadata.urls <pypi_json.ProjectMetadata.urls>` or
+		:attr:`ProjectMetadata.releases <pypi_json.ProjectMetadata.releases>`,
+		from which the expected size and sha256 digest are taken.
+	:param destination: The path or binary file object to write the file to.
+		If a path to an existing directory the file is created inside it with its original filename.
+	:param sha256: The expected sha256 digest of the file, overriding the one from ``file``.
+	:param chunk_size: The number of bytes to read into memory at once.
+	:param timeout: The timeout for the request, as accepted by :meth:`requests.Session.get`.
+	:param progress: A function to call after each chunk is received.
+	:param resume: Whether to resume a previous, interrupted download. Requires ``destination`` to be a path.
+	:param segments: The number of parallel ranged requests to split the file into.
+		Requires ``destination`` to be a path.
+
+	:raises:
+
+		* :exc:`~.DigestMismatchError` if the file is larger than expected,
+		  or if the size or digest of the complete file do not match.
+		  The download is aborted as soon as more data than expected is received.
+		* :exc:`requests.HTTPError` if an error occurs when downloading the file.
+
+	:returns: The sha256 digest of the file, as a hexadecimal string.
+	"""
+
+	file = FileSpec.from_file(file)
+	if sha256 is not None:
+		file = file._replace(sha256=sha256)
+
+	if segments < 1:
+		raise ValueError("'segments' must be at least 1")
+
+	if not isinstance(destination, (str, os.PathLike)):
+		if resume or segments > 1:
+			raise ValueError("Resuming and segmented downloads require 'destination' to be a path.")
+
+		with session.get(file.url, stream=True, timeout=timeout) as response:
+			response.raise_for_status()
+			received, digest = _write_response(response, destination, hashlib.sha256(), 0, file, chunk_size, progress)
+
+		_verify(file, received, digest)
+		return digest
+
+	path = os.fspath(destination)
+	if os.path.isdir(path):
+		path = os.path.join(path, _check_filename(file.filename))
+
+	part_path = path + ".part"
+
+	try:
+		if segments > 1 and file.size is not None and file.size >= segments * chunk_size:
+			digest = _segmented_download(session, file, part_path, segments, resume, chunk_size, timeout, progress)
+		else:
+			digest = _resumable_download(session, file, part_path, resume, chunk_size, timeout, progress)
+	except BaseException as e:
+		if not resume or isinstance(e, DigestMismatchError):
+			_remove(part_path, part_path + ".segments")
+		raise
+
+	_remove(part_path + ".segments")
+	os.replace(part_path, path)
+	return digest
+
+
+def _remove(*paths: str) -> None:
+	for path in paths:
+		try:
+			os.unlink(path)
+		except OSError:
+			pass
+
+
+def _write_response(
+		response: requests.Response,
+		fp: IO[bytes],
+		hasher: Any,
+		received: int,
+		file: FileSpec,
+		chunk_size: int,
+		progress: Optional[ProgressCallback],
+		) -> Tuple[int, str]:
+	# Stream the response body to ``fp``, returning the total number of bytes received and the digest.
+
+	for chunk in response.iter_content(chunk_size=chunk_size):
+		received += len(chunk)
+		if file.size is not None and received > file.size:
+			raise DigestMismatchError(file.url, file.size, received)
+
+		hasher.update(chunk)
+		fp.write(chunk)
+
+		if progress is not None:
+			progress(file, received, file.size)
+
+	return received, hasher.hexdigest()
+
+
+def _verify(file: FileSpec, received: int, digest: str) -> None:
+	if file.size is not None and received != file.size:
+		raise DigestMismatchError(file.url, file.size, received)
+
+	if file.sha256 is not None and digest != file.sha256.lower():
+		raise DigestMismatchError(file.url, file.sha256, digest)
+
+
+def _hash_file(path: PathLike, chunk_size: int, hasher: Any = None) -> Any:
+	if hasher is None:
+		hasher = hashlib.sha256()
+
+	with open(path, "rb") as fp:
+		for chunk in iter(lambda: fp.read(chunk_size), b''):
+			hasher.update(chunk)
+
+	return hasher
+
+
+def _resumable_download(
+		session: requests.Session,
+		file: FileSpec,
+		part_path: str,
+		resume: bool,
+		chunk_size: int,
+		timeout: Any,
+		progress: Optional[ProgressCallback],
+		) -> str:
+
+	offset = 0
+	hasher = hashlib.sha256()
+
+	if resume and os.path.isfile(part_path):
+		offset = os.path.getsize(part_path)
+
+		if file.size is not None and offset > file.size:
+			offset = 0
+		elif offset:
+			hasher = _hash_file(part_path, chunk_size, hasher)
+
+	if file.size is not None and offset and offset == file.size:
+		# Already complete; just needs verifying
+		digest = hasher.hexdigest()
+		_verify(file, offset, digest)
+		return digest
+
+	headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+	with session.get(file.url, stream=True, timeout=timeout, headers=headers) as response:
+		if offset and response.status_code == 416:
+			# The partial file is not a prefix of the file on the server.
+			_remove(part_path)
+			return _resumable_download(session, file, part_path, False, chunk_size, timeout, progress)
+
+		response.raise_for_status()
+
+		if offset and response.status_code == 206:
+			content_range = response.headers.get("Content-Range", '')
+			if not content_range.startswith(f"bytes {offset}-"):
+				raise requests.HTTPError(
+						f"Unexpected Content-Range {content_range!r} when resuming download of {file.url}",
+						response=response,
+						)
+			mode = "ab"
+		else:
+			# The server ignored the Range header, so start again
+			offset = 0
+			hasher = hashlib.sha256()
+			mode = "wb"
+
+		with open(part_path, mode) as fp:
+			received, digest = _write_response(response, fp, hasher, offset, file, chunk_size, progress)
+
+	_verify(file, received, digest)
+	return digest
+
+
+class _RangeNotSupported(Exception):
+	pass
+
+
+def _segmented_download(
+		session: requests.Session,
+		file: FileSpec,
+		part_path: str,
+		segments: int,
+		resume: bool,
+		chunk_size: int,
+		timeout: Any,
+		progress: Optional[ProgressCallback],
+		) -> str:
+
+	size = cast(int, file.size)
+	bounds = [(i * size // segments, (i + 1) * size // segments) for i in range(segments)]
+	state_path = part_path + ".segments"
+	completed: Set[int] = set()
+
+	if resume and os.path.isfile(part_path) and os.path.getsize(part_path) == size:
+		try:
+			with open(state_path, encoding="UTF-8") as state_fp:
+				state = json.load(state_fp)
+			if state["segments"] == segments:
+				completed = set(state["completed"])
+		except (OSError, ValueError, KeyError):
+			pass
+
+	if not completed:
+		with open(part_path, "wb") as fp:
+			fp.truncate(size)
+
+	lock = threading.Lock()
+	received = sum(bounds[i][1] - bounds[i][0] for i in completed)
+
+	def fetch(index: int) -> None:
+		nonlocal received
+
+		start, stop = bounds[index]
+		headers = {"Range": f"bytes={start}-{stop - 1}"}
+
+		with session.get(file.url, stream=True, timeout=timeout, headers=headers) as response:
+			response.raise_for_status()
+			if response.status_code != 206:
+				raise _RangeNotSupported
+
+			written = 0
+			with open(part_path, "r+b") as fp:
+				fp.seek(start)
+
+				for chunk in response.iter_content(chunk_size=chunk_size):
+					written += len(chunk)
+					if written > stop - start:
+						raise DigestMismatchError(file.url, size, start + written)
+
+					fp.write(chunk)
+
+					with lock:
+						received += len(chunk)
+						if progress is not None:
+							progress(file, received, size)
+
+		if written != stop - start:
+			raise DigestMismatchError(file.url, size, start + written)
+
+		with lock:
+			completed.add(index)
+			with open(state_path, 'w', encoding="UTF-8") as state_fp:
+				json.dump({"segments": segments, "completed": sorted(completed)}, state_fp)
+
+	remaining = [index for index in range(segments) if index not in completed]
+	results = imap_unordered(fetch, remaining, max_workers=segments)
+
+	try:
+		for _, result in results:
+			if isinstance(result, _RangeNotSupported):
+				break
+			elif isinstance(result, Exception):
+				raise result
+		else:
+			digest = _hash_file(part_path, chunk_size).hexdigest()
+			_verify(file, size, digest)
+			return digest
+	finally:
+		results.close()
+
+	# The server does not support ranges, so fall back to downloading the file in one go.
+	_remove(part_path, state_path)
+	return _resumable_download(session, file, part_path, False, chunk_size, timeout, progress)
+
+
+def file_matches(path: PathLike, sha256: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> bool:
+	"""
+	Returns whether the file at ``path`` exists and has the given sha256 digest.
+
+	:param path:
+	:param sha256:
+	:param chunk_size: The number of bytes to read into memory at once.
+	"""
+
+	try:
+		return _hash_file(path, chunk_size).hexdigest() == sha256.lower()
+	except OSError:
+		return False
+
+
+def download_files(
+		session: requests.Session,
+		files: Iterable[FileLike],
+		directory: PathLike,
+		*,
+		max_workers: int = 10,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		timeout: Any = None,
+		progress: Optional[ProgressCallback] = None,
+		resume: bool = False,
+		) -> Iterator[DownloadResult]:
+	"""
+	Download many files concurrently into ``directory``, verifying each one with :func:`~.stream_download`.
+
+	Files which already exist in ``directory`` with the expected sha256 digest are not downloaded again.
+	Files without a known digest are always downloaded.
+
+	Results are yielded in the order the downloads complete.
+	If a download fails the exception is recorded in :attr:`DownloadResult.error <.DownloadResult.error>`
+	rather than being raised, so one failure does not abort the others.
+	This includes files whose filename contains a path separator, which are not downloaded.
+
+	:param session: The session to make the requests with.
+	:param files:
+	:param directory: The directory to download the files into. It will be created if it does not exist.
+	:param max_workers: The maximum number of files to download at once.
+	:param chunk_size: The number of bytes to read into memory at once.
+	:param timeout: The timeout for each request, as accepted by :meth:`requests.Session.get`.
+	:param progress: A function to call after each chunk is received.
+		It is called from the worker threads, so must be thread safe.
+	:param resume: Whether to resume previous, interrupted downloads. See :func:`~.stream_download`.
+	"""
+
+	directory = os.fspath(directory)
+	os.makedirs(directory, exist_ok=True)
+
+	def download(item: FileLike) -> DownloadResult:
+		file = FileSpec.from_file(item)
+		path = os.path.join(directory, _check_filename(file.filename))
+
+		if file.sha256 is not None and file_matches(path, file.sha256, chunk_size):
+			return DownloadResult(file, path, os.path.getsize(path), skipped=True)
+
+		start = time.perf_counter()
+		stream_download(
+				session,
+				file,
+				path,
+				chunk_size=chunk_size,
+				timeout=timeout,
+				progress=progress,
+				resume=resume,
+				)
+		return DownloadResult(file, path, os.path.getsize(path), time.perf_counter() - start)
+
+	for item, result in imap_unordered(download, files, max_workers):
+		if isinstance(result, Exception):
+			file = _unchecked_spec(item)
+			try:
+				path = os.path.join(directory, _check_filename(file.filename))
+			except ValueError:
+				path = ''
+			yield DownloadResult(file, path, error=result)
+		else:
+			yield result
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+#
+#  hashes.py
+"""
+Generating hash-pinned requirements files for pip's ``--require-hashes`` mode.
+
+:func:`~.get_hashes` fetches the metadata for each pinned version concurrently, using the per-version endpoint
+so only the files of the requested version are downloaded and examined,
+and returns the sha256 digests of the files which can be installed on the target platforms.
+:func:`~.write_hashes` streams the results to a requirements file as they arrive.
+
+Hashes can also be generated from the command line:
+
+.. code-block:: bash
+
+	$ python -m pypi_json.hashes -r requirements.txt --tag cp310-cp310-manylinux_2_17_x86_64 -o requirements.lock
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import argparse
+import contextlib
+import re
+import sys
+from typing import IO, ContextManager, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+# 3rd party
+from packaging.requirements import Requirement
+from packaging.tags import Tag, compatible_tags, cpython_tags, generic_tags, mac_platforms, parse_tag
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json._concurrency import imap_ordered
+from pypi_json.audit import Pin, parse_pin, read_requirements
+from pypi_json.typehints import DistributionPackageDict
+from pypi_json.wheels import parse_wheel_tags
+
+__all__ = [
+		"expand_tag",
+		"format_requirement",
+		"get_hashes",
+		"main",
+		"parse_tags",
+		"select_files",
+		"write_hashes",
+		]
+
+_interpreter_re = re.compile(r"([a-z]+)(\d)(\d*)")
+_linux_re = re.compile(r"(manylinux|musllinux)_(\d+)_(\d+)_(.+)")
+_macos_re = re.compile(r"macosx_(\d+)_(\d+)_(.+)")
+
+# The legacy manylinux tags, and the glibc versions they correspond to.
+_legacy_manylinux = {"manylinux1": 5, "manylinux2010": 12, "manylinux2014": 17}
+
+
+def parse_tags(tags: Iterable[Union[str, Tag]]) -> FrozenSet[Tag]:
+	"""
+	Parse compatibility tags such as ``'cp310-cp310-manylinux_2_17_x86_64'``.
+
+	Compressed tag sets such as ``'py2.py3-none-any'`` are expanded.
+
+	:param tags:
+	"""
+
+	parsed: Set[Tag] = set()
+
+	for tag in tags:
+		if isinstance(tag, Tag):
+			parsed.add(tag)
+		else:
+			parsed.update(parse_tag(tag))
+
+	return frozenset(parsed)
+
+
+def _expand_platform(platform: str) -> List[str]:
+	"""
+	Returns the platform tags supported by a platform, including older manylinux, musllinux and macOS versions.
+	"""
+
+	for legacy, minor in _legacy_manylinux.items():
+		if platform.startswith(legacy + '_'):
+			platform = f"manylinux_2_{minor}_{platform[len(legacy) + 1:]}"
+			break
+
+	match = _linux_re.fullmatch(platform)
+	if match is not None:
+		name, major, minor, arch = match.group(1), int(match.group(2)), int(match.group(3)), match.group(4)
+		platforms = []
+		for version in range(minor, -1, -1):
+			platforms.append(f"{name}_{major}_{version}_{arch}")
+			if name == "manylinux" and major == 2:
+				platforms.extend(f"{legacy}_{arch}" for legacy, m in _legacy_manylinux.items() if m == version)
+		return platforms
+
+	match = _macos_re.fullmatch(platform)
+	if match is not None:
+		return list(mac_platforms((int(match.group(1)), int(match.group(2))), match.group(3)))
+
+	return [platform]
+
+
+def expand_tag(tag: Union[str, Tag]) -> List[Tag]:
+	"""
+	Returns the compatibility tags supported by a target platform, most preferred first.
+
+	``tag`` is the platform's most specific tag, such as ``'cp310-cp310-manylinux_2_17_x86_64'``.
+	The result also includes the tags for the stable ABI, pure Python wheels, older Python versions,
+	and older manylinux, musllinux and macOS versions, as :func:`packaging.tags.sys_tags` would on that platform.
+
+	:param tag: A tag, or a compressed tag set such as ``'py2.py3-none-any'``.
+	"""
+
+	expanded: List[Tag] = []
+
+	for target in ([tag] if isinstance(tag, Tag) else sorted(parse_tag(tag), key=str)):
+		platforms = _expand_platform(target.platform)
+		match = _interpreter_re.fullmatch(target.interpreter)
+
+		if match is None or match.group(1) == "py":
+			expanded.extend(Tag(target.interpreter, target.abi, platform) for platform in platforms)
+			continue
+
+		python_version = (int(match.group(2)), *([int(match.group(3))] if match.group(3) else []))
+
+		if match.group(1) == "cp":
+			expanded.extend(cpython_tags(python_version, [target.abi], platforms))
+		else:
+			expanded.extend(generic_tags(target.interpreter, [target.abi], platforms))
+
+		expanded.extend(compatible_tags(python_version, target.interpreter, platforms))
+
+	return list(dict.fromkeys(expanded))
+
+
+def _select(
+		files: Iterable[DistributionPackageDict],
+		target_tags: Optional[FrozenSet[Tag]],
+		sdists: bool,
+		) -> List[DistributionPackageDict]:
+	selected = []
+
+	for file in files:
+		if not file["filename"].endswith(".whl"):
+			if sdists:
+				selected.append(file)
+		elif target_tags is None or not target_tags.isdisjoint(parse_wheel_tags(file["filename"])):
+			selected.append(file)
+
+	return selected
+
+
+def _target_tags(tags: Optional[Iterable[Union[str, Tag]]]) -> Optional[FrozenSet[Tag]]:
+	if tags is None:
+		return None
+
+	return frozenset(expanded for tag in parse_tags(tags) for expanded in expand_tag(tag))
+
+
+def select_files(
+		files: Iterable[DistributionPackageDict],
+		tags: Optional[Iterable[Union[str, Tag]]] = None,
+		*,
+		sdists: bool = True,
+		) -> List[DistributionPackageDict]:
+	"""
+	Returns the files which can be installed on any of the given target platforms.
+
+	:param files: The files of a release, e.g. :attr:`ProjectMetadata.urls <pypi_json.ProjectMetadata.urls>`.
+	:param tags: The most specific compatibility tag of each target platform,
+		e.g. ``'cp310-cp310-manylinux_2_17_x86_64'``. Each is expanded with :func:`~.expand_tag`,
+		so pure Python and stable ABI wheels are included too. If :py:obj:`None` all wheels are included.
+	:param sdists: Whether to include files which are not wheels, such as sdists.
+	"""
+
+	return _select(files, _target_tags(tags), sdists)
+
+
+def get_hashes(
+		client: PyPIJSON,
+		requirements: Iterable[Pin],
+		tags: Optional[Iterable[Union[str, Tag]]] = None,
+		*,
+		sdists: bool = True,
+		max_workers: int = 10,
+		) -> Iterator[Tuple[Pin, Union[List[str], Exception]]]:
+	"""
+	Returns the sha256 digests of the files for each of the pinned requirements.
+
+	The metadata for each pin is fetched concurrently from the per-version endpoint.
+	Results are yielded as ``(requirement, digests)`` tuples in the order of ``requirements``,
+	with the digests sorted. As with :meth:`PyPIJSON.get_many_metadata <pypi_json.PyPIJSON.get_many_metadata>`,
+	if fetching the metadata for a pin fails the exception is yielded in place of the digests.
+
+	:param client:
+	:param requirements: The pinned requirements, e.g. from :func:`pypi_json.audit.read_requirements`.
+	:param tags: The most specific compatibility tag of each target platform,
+		e.g. ``'cp310-cp310-manylinux_2_17_x86_64'``. See :func:`~.select_files`.
+		If :py:obj:`None` the digests of all wheels are included.
+	:param sdists: Whether to include the digests of files which are not wheels, such as sdists.
+	:param max_workers: The maximum number of requests to make at once.
+
+	:raises ValueError: If one of the requirements is not pinned to a single version.
+	"""
+
+	target_tags = _target_tags(tags)
+
+	requirements = list(requirements)
+	for requirement in requirements:
+		parse_pin(requirement)
+
+	def fetch(requirement: Pin) -> List[str]:
+		metadata = client.get_metadata(*parse_pin(requirement))
+		files = _select(metadata.urls, target_tags, sdists)
+		return sorted({file["digests"]["sha256"] for file in files})
+
+	return imap_ordered(fetch, requirements, max_workers)
+
+
+def format_requirement(requirement: Pin, digests: Iterable[str]) -> str:
+	"""
+	Format a requirement with its hashes, in the format used by pip's ``--require-hashes`` mode.
+
+	:param requirement:
+	:param digests: The sha256 digests of the requirement's files.
+
+	:returns: The requirement, with each hash on a separate continuation line.
+	"""
+
+	if isinstance(requirement, tuple):
+		line = f"{requirement[0]}=={requirement[1]}"
+	else:
+		line = str(requirement)
+
+	return " \\\n".join([line, *(f"    --hash=sha256:{digest}" for digest in digests)])
+
+
+def write_hashes(
+		client: PyPIJSON,
+		requirements: Iterable[Pin],
+		file: IO[str],
+		tags: Optional[Iterable[Union[str, Tag]]] = None,
+		*,
+		sdists: bool = True,
+		max_workers: int = 10,
+		) -> List[Tuple[Pin, Union[str, Exception]]]:
+	"""
+	Write a hash-pinned requirements file, writing each requirement as soon as it and those before it are available.
+
+	Requirements whose metadata could not be fetched, or which have no files for the target platforms,
+	are written as comments.
+
+	:param client:
+	:param requirements: The pinned requirements, e.g. from :func:`pypi_json.audit.read_requirements`.
+	:param file: The text file to write to.
+	:param tags: The most specific compatibility tag of each target platform. See :func:`~.select_files`.
+	:param sdists: Whether to include the digests of files which are not wheels, such as sdists.
+	:param max_workers: The maximum number of requests to make at once.
+
+	:returns: The requirements which could not be written, with the exception or the reason.
+	"""
+
+	failures: List[Tuple[Pin, Union[str, Exception]]] = []
+
+	for requirement, digests in get_hashes(
+			client,
+			requirements,
+			tags,
+			sdists=sdists,
+			max_workers=max_workers,
+			):
+		if isinstance(digests, Exception):
+			failures.append((requirement, digests))
+			file.write(f"# {format_requirement(requirement, [])}: {digests}\n")
+		elif not digests:
+			failures.append((requirement, "No files match the target platforms"))
+			file.write(f"# {format_requirement(requirement, [])}: No files match the target platforms\n")
+		else:
+			file.write(format_requirement(requirement, digests))
+			file.write('\n')
+
+		file.flush()
+
+	return failures
+
+
+def _open_output(filename: Optional[str]) -> ContextManager[IO[str]]:
+	if filename is None:
+		return contextlib.nullcontext(sys.stdout)
+	return open(filename, 'w', encoding="UTF-8")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""
+	Write a hash-pinned requirements file from the command line.
+
+	:param argv: The command line arguments. Defaults to :py:obj:`sys.argv`.
+
+	:returns: The exit code; ``1`` if the hashes for any requirement could not be found.
+	"""
+
+	parser = argparse.ArgumentParser(
+			prog="python -m pypi_json.hashes",
+			description="Write a requirements file with the sha256 hashes of each pinned requirement's files.",
+			)
+	parser.add_argument("requirements", nargs='*', metavar="REQUIREMENT", help="Pinned requirements, e.g. foo==1.0")
+	parser.add_argument(
+			"-r",
+			"--requirement",
+			action="append",
+			default=[],
+			metavar="FILE",
+			help="Read pinned requirements from the given requirements file.",
+			)
+	parser.add_argument(
+			"-t",
+			"--tag",
+			action="append",
+			default=None,
+			help=(
+					"Only include wheels which can be installed on the platform with this most specific tag, "
+					"e.g. cp310-cp310-manylinux_2_17_x86_64. May be given more than once."
+					),
+			)
+	parser.add_argument("--no-sdist", action="store_true", help="Exclude sdists and other non-wheel files.")
+	parser.add_argument("-o", "--output", default=None, help="The file to write to. (default: standard output)")
+	parser.add_argument(
+			"--endpoint",
+			default="https://pypi.org/pypi",
+			help="The URL of the JSON API. (default: %(default)s)",
+			)
+	parser.add_argument("--max-workers", type=int, default=10, help="The number of requests to make at once.")
+
+	args = parser.parse_args(argv)
+
+	requirements: List[Pin] = [Requirement(requirement) for requirement in args.requirements]
+	for filename in args.requirement:
+		requirements.extend(read_requirements(filename))
+
+	with PyPIJSON(args.endpoint) as client, _open_output(args.output) as fp:
+		failures = write_hashes(
+				client,
+				requirements,
+				fp,
+				args.tag,
+				sdists=not args.no_sdist,
+				max_workers=args.max_workers,
+				)
+
+	for requirement, reason in failures:
+		print(f"Failed to find hashes for {format_requirement(requirement, [])}: {reason}", file=sys.stderr)
+
+	return 1 if failures else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+#
+#  metrics.py
+"""
+Per-request instrumentation for :class:`~pypi_json.PyPIJSON`.
+
+Pass a function as the ``metrics_callback`` argument of :class:`~pypi_json.PyPIJSON`
+to have it called with a :class:`~.RequestMetrics` after every call to
+:meth:`~pypi_json.PyPIJSON.get_metadata` and :meth:`~pypi_json.PyPIJSON.download_file`,
+including those made by :meth:`~pypi_json.PyPIJSON.get_many_metadata`.
+The callback is called from whichever thread made the call, so must be thread safe.
+
+For example, to export the timings to Prometheus:
+
+.. code-block:: python
+
+	from prometheus_client import Counter, Histogram
+
+	latency = Histogram("pypi_json_seconds", "Time spent in pypi_json", ["operation", "phase"])
+	lookups = Counter("pypi_json_lookups", "Metadata lookups", ["source"])
+
+	def record(metrics: RequestMetrics) -> None:
+		for phase in ("request_time", "download_time", "decode_time", "parse_time", "total_time"):
+			latency.labels(metrics.operation, phase).observe(getattr(metrics, phase))
+		lookups.labels(metrics.source).inc()
+
+	client = PyPIJSON(metrics_callback=record)
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+from typing import Callable, NamedTuple, Optional
+
+# 3rd party
+import requests
+
+__all__ = ["SOURCES", "MetricsCallback", "RequestMetrics", "get_retry_count"]
+
+#: The places a result can come from. See :attr:`RequestMetrics.source <.RequestMetrics.source>`.
+SOURCES = ("network", "disk_cache", "store", "memory", "shared")
+
+
+class RequestMetrics(NamedTuple):
+	"""
+	Timings and other details of a call to :meth:`~pypi_json.PyPIJSON.get_metadata`
+	or :meth:`~pypi_json.PyPIJSON.download_file`.
+
+	All times are in seconds. The time taken to resolve the hostname and connect to the server
+	is not reported separately by :mod:`requests`, and is included in :attr:`~.RequestMetrics.request_time`.
+	"""  # noqa: D400
+
+	#: The name of the method, ``'get_metadata'`` or ``'download_file'``.
+	operation: str
+
+	#: The project name for :meth:`~pypi_json.PyPIJSON.get_metadata`,
+	#: or the URL for :meth:`~pypi_json.PyPIJSON.download_file`.
+	target: str
+
+	#: The requested version, if any.
+	version: Optional[str] = None
+
+	#: Where the result came from:
+	#:
+	#: * ``'network'`` -- downloaded from the server.
+	#: * ``'disk_cache'`` -- read from the :class:`~pypi_json.cache.DiskCache`
+	#:   after the server confirmed it has not changed.
+	#: * ``'store'`` -- read from the :class:`~pypi_json.store.MetadataStore` without making a request.
+	#: * ``'memory'`` -- found in the :class:`~pypi_json.cache.MemoryCache`.
+	#: * ``'shared'`` -- shared with an identical call already in progress in another thread.
+	source: str = "network"
+
+	#: The HTTP status code of the last response, if a request was made.
+	status_code: Optional[int] = None
+
+	#: The size of the response body or cached document, in bytes.
+	size: int = 0
+
+	#: The number of times a request was retried, by urllib3 or by a :class:`~pypi_json.ratelimit.RateLimiter`.
+	retries: int = 0
+
+	#: The time from sending the request until the response headers were received,
+	#: including connecting to the server and any retries.
+	request_time: float = 0.0
+
+	#: The time spent reading the response body.
+	download_time: float = 0.0
+
+	#: The time spent decoding the JSON document.
+	decode_time: float = 0.0
+
+	#: The time spent constructing the :class:`~pypi_json.ProjectMetadata`.
+	parse_time: float = 0.0
+
+	#: The total time taken by the call.
+	total_time: float = 0.0
+
+	#: The exception raised by the call, if it failed.
+	error: Optional[BaseException] = None
+
+	@property
+	def cache_hit(self) -> bool:
+		"""
+		Whether the result came from a cache rather than being downloaded.
+		"""
+
+		return self.source != "network"
+
+
+#: A function called with the :class:`~.RequestMetrics` for each call.
+MetricsCallback = Callable[[RequestMetrics], None]
+
+
+def get_retry_count(response: requests.Response) -> int:
+	"""
+	Returns the number of times the request for ``response`` was retried.
+
+	Both retries made by urllib3 (see :func:`pypi_json.transport.make_retry`)
+	and throttled requests retried by a :class:`~pypi_json.transport.RateLimitedAdapter` are counted.
+
+	:param response:
+	"""
+
+	retries = getattr(response, "throttle_retries", 0)
+
+	raw_retries = getattr(response.raw, "retries", None)
+	if raw_retries is not None:
+		retries += len(raw_retries.history)
+
+	return retries
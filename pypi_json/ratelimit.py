@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+#
+#  ratelimit.py
+"""
+Client-side rate limiting and adaptive concurrency for requests to the JSON API.
+
+A :class:`~.RateLimiter` combines a :class:`~.TokenBucket`, which limits the rate at which requests are started,
+with an :class:`~.AdaptiveConcurrency` controller, which limits how many requests are in flight at once.
+The controller follows an additive-increase/multiplicative-decrease scheme: the limit is halved when
+the server responds with ``429 Too Many Requests`` or ``503 Service Unavailable``,
+and grows back by one for each successful window of requests.
+
+Pass a :class:`~.RateLimiter` to :class:`~pypi_json.PyPIJSON` as the ``rate_limiter`` argument
+to apply it to every request the client makes, including those from
+:meth:`~pypi_json.PyPIJSON.get_many_metadata`, :meth:`~pypi_json.PyPIJSON.sync`
+and :meth:`~pypi_json.PyPIJSON.download_files`.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Collection, FrozenSet, Optional
+
+# 3rd party
+import requests
+
+__all__ = ["THROTTLE_STATUSES", "AdaptiveConcurrency", "RateLimiter", "TokenBucket", "parse_retry_after"]
+
+#: The HTTP status codes which indicate the server is throttling requests.
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+	"""
+	Parse the value of a ``Retry-After`` header into a number of seconds to wait.
+
+	:param value: Either a number of seconds or an HTTP date.
+
+	:returns: The number of seconds, or :py:obj:`None` if the value is missing or invalid.
+	"""
+
+	if not value:
+		return None
+
+	value = value.strip()
+
+	if value.isdigit():
+		return float(value)
+
+	try:
+		retry_at = parsedate_to_datetime(value)
+	except (TypeError, ValueError, IndexError):
+		return None
+
+	if retry_at.tzinfo is None:
+		retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+	return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+	"""
+	A thread-safe token bucket, which allows ``rate`` operations per second on average
+	with bursts of up to ``capacity`` operations.
+
+	:param rate: The number of tokens added to the bucket per second.
+	:param capacity: The maximum number of tokens the bucket can hold. Defaults to ``rate``, or 1 if that is smaller.
+	:param clock: Function returning the current time in seconds.
+	:param sleep: Function to wait for the given number of seconds.
+	"""  # noqa: D400
+
+	#: The number of tokens added to the bucket per second.
+	rate: float
+
+	#: The maximum number of tokens the bucket can hold.
+	capacity: float
+
+	def __init__(
+			self,
+			rate: float,
+			capacity: Optional[float] = None,
+			*,
+			clock: Callable[[], float] = time.monotonic,
+			sleep: Callable[[float], None] = time.sleep,
+			) -> None:
+
+		if rate <= 0:
+			raise ValueError("'rate' must be greater than zero")
+
+		if capacity is None:
+			capacity = max(rate, 1.0)
+		elif capacity < 1:
+			raise ValueError("'capacity' must be at least 1")
+
+		self.rate = rate
+		self.capacity = capacity
+		self._clock = clock
+		self._sleep = sleep
+		self._lock = threading.Lock()
+		self._tokens = capacity
+		self._updated = clock()
+
+	def _refill(self) -> None:
+		now = self._clock()
+		self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+		self._updated = now
+
+	def try_acquire(self, tokens: float = 1) -> float:
+		"""
+		Take ``tokens`` from the bucket if enough are available.
+
+		:param tokens:
+
+		:returns: ``0`` if the tokens were taken,
+			otherwise the number of seconds until enough tokens will be available.
+		"""
+
+		if tokens > self.capacity:
+			raise ValueError(f"Cannot acquire more than {self.capacity} tokens at once")
+
+		with self._lock:
+			self._refill()
+
+			if self._tokens >= tokens:
+				self._tokens -= tokens
+				return 0.0
+
+			return (tokens - self._tokens) / self.rate
+
+	def acquire(self, tokens: float = 1) -> float:
+		"""
+		Take ``tokens`` from the bucket, waiting until enough are available.
+
+		:param tokens:
+
+		:returns: The number of seconds spent waiting.
+		"""
+
+		waited = 0.0
+
+		while True:
+			delay = self.try_acquire(tokens)
+			if not delay:
+				return waited
+			self._sleep(delay)
+			waited += delay
+
+
+class AdaptiveConcurrency:
+	"""
+	Limits the number of operations in progress at once, adjusting the limit with
+	additive-increase/multiplicative-decrease (AIMD).
+
+	Each successful operation increases the limit by ``increase / limit``,
+	so the limit grows by about ``increase`` for each window of ``limit`` operations.
+	Each throttled operation multiplies the limit by ``decrease``.
+	Operations which started before the last decrease do not decrease the limit again,
+	so a burst of throttled responses to requests made at the same time only counts once.
+
+	:param maximum: The maximum (and initial) number of operations in progress at once.
+	:param minimum: The minimum number of operations in progress at once.
+	:param increase: The amount the limit grows by for each window of successful operations.
+	:param decrease: The factor the limit is multiplied by when an operation is throttled.
+	"""  # noqa: D400
+
+	#: The maximum number of operations in progress at once.
+	maximum: int
+
+	#: The minimum number of operations in progress at once.
+	minimum: int
+
+	def __init__(self, maximum: int = 10, minimum: int = 1, increase: float = 1.0, decrease: float = 0.5) -> None:
+		if minimum < 1:
+			raise ValueError("'minimum' must be at least 1")
+		if maximum < minimum:
+			raise ValueError("'maximum' must be at least 'minimum'")
+		if not 0 < decrease < 1:
+			raise ValueError("'decrease' must be between 0 and 1")
+
+		self.maximum = maximum
+		self.minimum = minimum
+		self.increase = increase
+		self.decrease = decrease
+		self._limit = float(maximum)
+		self._in_flight = 0
+		self._generation = 0
+		self._condition = threading.Condition()
+
+	@property
+	def limit(self) -> int:
+		"""
+		The current number of operations allowed to be in progress at once.
+		"""
+
+		return int(self._limit)
+
+	@property
+	def in_flight(self) -> int:
+		"""
+		The number of operations currently in progress.
+		"""
+
+		return self._in_flight
+
+	def acquire(self) -> int:
+		"""
+		Wait until fewer than :attr:`~.AdaptiveConcurrency.limit` operations are in progress,
+		and start a new one.
+
+		:returns: A token to pass to :meth:`~.AdaptiveConcurrency.release` when the operation finishes.
+		"""  # noqa: D400
+
+		with self._condition:
+			while self._in_flight >= int(self._limit):
+				self._condition.wait()
+
+			self._in_flight += 1
+			return self._generation
+
+	def release(self, token: int, throttled: bool = False, adjust: bool = True) -> None:
+		"""
+		Mark an operation as finished.
+
+		:param token: The value returned by :meth:`~.AdaptiveConcurrency.acquire`.
+		:param throttled: Whether the operation was throttled by the server.
+		:param adjust: If :py:obj:`False` the limit is left unchanged, e.g. when the operation failed for another reason.
+		"""
+
+		with self._condition:
+			self._in_flight -= 1
+
+			if not adjust:
+				pass
+			elif throttled:
+				if token == self._generation:
+					self._limit = max(float(self.minimum), self._limit * self.decrease)
+					self._generation += 1
+			else:
+				self._limit = min(float(self.maximum), self._limit + self.increase / self._limit)
+
+			self._condition.notify_all()
+
+
+class RateLimiter:
+	"""
+	Limits the rate and concurrency of requests, backing off when the server throttles them.
+
+	Throttled requests (those receiving one of ``throttle_statuses``) reduce the :attr:`~.RateLimiter.concurrency`
+	limit, and are retried up to ``max_retries`` times. Before retrying the request waits for the time given in
+	the ``Retry-After`` header, or for an exponentially increasing delay if there is no such header.
+	If ``pause_on_throttle`` is :py:obj:`True` every request sharing the limiter waits as well.
+
+	:param rate: The maximum number of requests to start per second. If :py:obj:`None` the rate is unlimited.
+	:param burst: The number of requests which may be started at once before ``rate`` applies.
+		Defaults to ``rate``.
+	:param max_concurrency: The maximum number of requests in flight at once.
+	:param min_concurrency: The number of requests in flight at once the limit can be reduced to.
+	:param max_retries: The maximum number of times to retry a throttled request.
+	:param backoff_factor: The delay before the first retry when there is no ``Retry-After`` header,
+		doubling for each subsequent retry.
+	:param max_delay: The maximum number of seconds to wait before retrying.
+	:param throttle_statuses: The HTTP status codes which indicate the server is throttling requests.
+	:param pause_on_throttle: Whether a throttled request stops all requests sharing the limiter
+		from starting until it can be retried. This suits servers which limit the overall request rate,
+		but reduces throughput when the server only limits the number of concurrent requests.
+	"""
+
+	#: The token bucket limiting the request rate, if any.
+	bucket: Optional[TokenBucket]
+
+	#: The controller limiting the number of requests in flight.
+	concurrency: AdaptiveConcurrency
+
+	#: The maximum number of times to retry a throttled request.
+	max_retries: int
+
+	#: The HTTP status codes which indicate the server is throttling requests.
+	throttle_statuses: FrozenSet[int]
+
+	#: Whether a throttled request stops all requests sharing the limiter from starting until it can be retried.
+	pause_on_throttle: bool
+
+	def __init__(
+			self,
+			rate: Optional[float] = None,
+			burst: Optional[float] = None,
+			*,
+			max_concurrency: int = 10,
+			min_concurrency: int = 1,
+			max_retries: int = 5,
+			backoff_factor: float = 0.5,
+			max_delay: float = 60.0,
+			throttle_statuses: Collection[int] = THROTTLE_STATUSES,
+			pause_on_throttle: bool = False,
+			) -> None:
+
+		self.bucket = None if rate is None else TokenBucket(rate, burst)
+		self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency)
+		self.max_retries = max_retries
+		self.backoff_factor = backoff_factor
+		self.max_delay = max_delay
+		self.throttle_statuses = frozenset(throttle_statuses)
+		self.pause_on_throttle = pause_on_throttle
+		self._lock = threading.Lock()
+		self._resume_at = 0.0
+
+		#: The number of throttled responses received.
+		self.throttled = 0
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.RateLimiter`.
+		"""
+
+		rate = None if self.bucket is None else self.bucket.rate
+		return f"<{self.__class__.__name__}(rate={rate}, concurrency={self.concurrency.limit})>"
+
+	def pause(self, seconds: float) -> None:
+		"""
+		Prevent any requests from starting for the next ``seconds`` seconds.
+
+		:param seconds:
+		"""
+
+		with self._lock:
+			self._resume_at = max(self._resume_at, time.monotonic() + min(seconds, self.max_delay))
+
+	def _wait_for_resume(self) -> None:
+		while True:
+			delay = self._resume_at - time.monotonic()
+			if delay <= 0:
+				return
+			time.sleep(delay)
+
+	def acquire(self) -> int:
+		"""
+		Wait until a request may be started.
+
+		:returns: A token to pass to :meth:`~.RateLimiter.release` when the request finishes.
+		"""
+
+		token = self.concurrency.acquire()
+
+		try:
+			self._wait_for_resume()
+			if self.bucket is not None:
+				self.bucket.acquire()
+		except BaseException:
+			self.concurrency.release(token, adjust=False)
+			raise
+
+		return token
+
+	def release(self, token: int, response: Optional[requests.Response]) -> bool:
+		"""
+		Mark a request as finished.
+
+		:param token: The value returned by :meth:`~.RateLimiter.acquire`.
+		:param response: The response to the request, or :py:obj:`None` if it failed.
+
+		:returns: Whether the request was throttled.
+		"""
+
+		if response is None:
+			self.concurrency.release(token, adjust=False)
+			return False
+
+		throttled = response.status_code in self.throttle_statuses
+		self.concurrency.release(token, throttled=throttled)
+
+		if throttled:
+			with self._lock:
+				self.throttled += 1
+
+		return throttled
+
+	def get_retry_delay(self, response: requests.Response, attempt: int) -> float:
+		"""
+		Returns the number of seconds to wait before retrying a throttled request.
+
+		:param response:
+		:param attempt: The number of times the request has already been retried.
+		"""
+
+		delay = parse_retry_after(response.headers.get("Retry-After"))
+
+		if delay is None:
+			delay = self.backoff_factor * (2**attempt)
+
+		return min(delay, self.max_delay)
+
+	def backoff(self, response: requests.Response, attempt: int) -> float:
+		"""
+		Wait before retrying a throttled request.
+
+		If :attr:`~.RateLimiter.pause_on_throttle` is :py:obj:`True` this pauses every request sharing the limiter,
+		and the wait happens in the next call to :meth:`~.RateLimiter.acquire`.
+
+		:param response:
+		:param attempt: The number of times the request has already been retried.
+
+		:returns: The number of seconds to wait.
+		"""
+
+		delay = self.get_retry_delay(response, attempt)
+
+		if self.pause_on_throttle:
+			self.pause(delay)
+		else:
+			time.sleep(delay)
+
+		return delay
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+#
+#  snapshot.py
+"""
+Offline access to the JSON API from a snapshot directory.
+
+A snapshot is a directory laid out like the JSON API::
+
+	<directory>/
+	├── <project>/json
+	├── <project>/<version>/json
+	└── files/<filename>
+
+where ``<project>`` is the normalized project name.
+:func:`~.open_snapshot` returns a :class:`~pypi_json.PyPIJSON` client which reads from the snapshot
+rather than the network, with the same behaviour as the online client
+(e.g. :exc:`~packaging.requirements.InvalidRequirement` for projects not in the snapshot).
+The URLs of files in the metadata are served from the ``files`` directory,
+so :meth:`~pypi_json.PyPIJSON.download_file` and :meth:`~pypi_json.PyPIJSON.download_to` also work offline.
+
+A snapshot can be built with :func:`~.build_snapshot`, or from the command line:
+
+.. prompt:: bash
+
+	python -m pypi_json.snapshot DIRECTORY PROJECT [PROJECT ...] [--versions] [--files {latest,all}]
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import argparse
+import os
+import posixpath
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+# 3rd party
+import requests
+from apeye import URL
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# this package
+from pypi_json import ProjectMetadata, PyPIJSON
+from pypi_json._concurrency import imap_unordered
+from pypi_json.download import FileSpec, download_files
+from pypi_json.typehints import DistributionPackageDict
+
+__all__ = ["SnapshotAdapter", "build_snapshot", "main", "open_snapshot"]
+
+
+def _is_safe_name(name: str) -> bool:
+	# Whether a decoded URL path segment can be used as a single path component.
+
+	if name in {'', '.', ".."}:
+		return False
+
+	return not any(sep in name for sep in {'/', os.sep, os.altsep or os.sep})
+
+
+class _FileBody:
+	# A response body read from a file, which is closed as soon as it has been read to the end.
+
+	def __init__(self, path: str) -> None:
+		self._fp = open(path, "rb")  # noqa: SIM115
+
+	def read(self, size: int = -1) -> bytes:
+		if self._fp.closed:
+			return b''
+
+		data = self._fp.read(size)
+		if not data or size < 0:
+			self._fp.close()
+
+		return data
+
+	def close(self) -> None:
+		self._fp.close()
+
+
+class SnapshotAdapter(BaseAdapter):
+	"""
+	A :mod:`requests` transport adapter which serves the JSON API and package files from a snapshot directory.
+
+	Requests for paths which are not in the snapshot receive a ``404 Not Found`` response.
+
+	:param directory: The snapshot directory.
+	:param endpoint: The URL of the JSON API endpoint which the snapshot stands in for.
+	"""
+
+	#: The snapshot directory.
+	directory: str
+
+	#: The URL of the JSON API endpoint which the snapshot stands in for.
+	endpoint: str
+
+	def __init__(
+			self,
+			directory: Union[str, "os.PathLike[str]"],
+			endpoint: Union[str, URL] = "https://pypi.org/pypi",
+			) -> None:
+		super().__init__()
+		self.directory = os.fspath(directory)
+		self.endpoint = str(endpoint).rstrip('/') + '/'
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.SnapshotAdapter`.
+		"""
+
+		return f"<{self.__class__.__name__}({self.directory!r})>"
+
+	def _resolve(self, url: str) -> Optional[str]:
+		# Returns the path to the file for the given URL, if it exists in the snapshot.
+
+		if url.startswith(self.endpoint):
+			parts = [unquote(part) for part in urlparse(url).path[len(urlparse(self.endpoint).path):].split('/') if part]
+
+			if len(parts) not in {2, 3} or parts[-1] != "json" or not all(map(_is_safe_name, parts)):
+				return None
+
+			parts[0] = canonicalize_name(parts[0])
+			path = os.path.join(self.directory, *parts)
+
+			if len(parts) == 3 and not os.path.isfile(path):
+				version = self._find_version(parts[0], parts[1])
+				if version is None:
+					return None
+				path = os.path.join(self.directory, parts[0], version, "json")
+
+		else:
+			# Decode before taking the basename, so an encoded '/' cannot smuggle in a directory.
+			filename = posixpath.basename(unquote(urlparse(url).path))
+			if not _is_safe_name(filename):
+				return None
+			path = os.path.join(self.directory, "files", filename)
+
+		# Never serve anything from outside the snapshot, whatever the URL contained.
+		directory = os.path.abspath(self.directory)
+		path = os.path.abspath(path)
+		if os.path.commonpath([directory, path]) != directory:
+			return None
+
+		if os.path.isfile(path):
+			return path
+
+		return None
+
+	def _find_version(self, project: str, version: str) -> Optional[str]:
+		# Find the directory for an equivalent version, e.g. '1.0.0' for '1.0'
+
+		try:
+			target = Version(version)
+			entries = os.listdir(os.path.join(self.directory, project))
+		except (InvalidVersion, OSError):
+			return None
+
+		for entry in entries:
+			try:
+				if Version(entry) == target:
+					return entry
+			except InvalidVersion:
+				continue
+
+		return None
+
+	def send(  # noqa: D102
+			self,
+			request: requests.PreparedRequest,
+			stream: bool = False,
+			timeout: Any = None,
+			verify: Union[bool, str] = True,
+			cert: Any = None,
+			proxies: Optional[Mapping[str, str]] = None,
+			) -> requests.Response:
+		response = requests.Response()
+		response.request = request
+		response.url = request.url or ''
+
+		path = self._resolve(response.url)
+
+		if path is None:
+			response.status_code = 404
+			response.reason = "Not Found"
+			response._content = b''
+			response._content_consumed = True  # type: ignore[attr-defined]
+			return response
+
+		response.status_code = 200
+		response.reason = "OK"
+		response.headers = CaseInsensitiveDict({"Content-Length": str(os.path.getsize(path))})
+
+		if request.method == "HEAD":
+			response._content = b''
+			response._content_consumed = True  # type: ignore[attr-defined]
+		else:
+			response.raw = _FileBody(path)
+
+		return response
+
+	def close(self) -> None:  # noqa: D102
+		pass
+
+
+def open_snapshot(
+		directory: Union[str, "os.PathLike[str]"],
+		endpoint: Union[str, URL] = "https://pypi.org/pypi",
+		**kwargs: Any,
+		) -> PyPIJSON:
+	"""
+	Returns a :class:`~pypi_json.PyPIJSON` client which reads from the given snapshot directory
+	and never accesses the network.
+
+	:param directory: The snapshot directory.
+	:param endpoint: The URL of the JSON API endpoint which the snapshot stands in for.
+	:param kwargs: Additional keyword arguments for :class:`~pypi_json.PyPIJSON`.
+		The transport options (``pool_connections``, ``pool_maxsize``, ``retries``, ``keep_alive``
+		and ``rate_limiter``) are not supported, as they would replace the :class:`~.SnapshotAdapter`.
+
+	:raises ValueError: If any of the transport options are given.
+	"""  # noqa: D400
+
+	session = requests.Session()
+	adapter = SnapshotAdapter(directory, endpoint)
+	session.mount("https://", adapter)
+	session.mount("http://", adapter)
+
+	return PyPIJSON(endpoint, session=session, **kwargs)
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+	directory = os.path.dirname(path)
+	os.makedirs(directory, exist_ok=True)
+
+	fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as fp:
+			fp.write(content)
+		os.replace(tmp_path, path)
+	except BaseException:
+		os.unlink(tmp_path)
+		raise
+
+
+def _snapshot_path(directory: str, *parts: str) -> str:
+	"""
+	Returns the path for the given parts inside the snapshot directory,
+	raising :exc:`ValueError` if any part would lead outside it.
+	"""  # noqa: D400
+
+	for part in parts:
+		if not _is_safe_name(part):
+			raise ValueError(f"Unsafe path component {part!r} in response from the index")
+
+	path = os.path.abspath(os.path.join(directory, *parts))
+	if os.path.commonpath([os.path.abspath(directory), path]) != os.path.abspath(directory):
+		raise ValueError(f"The path for {'/'.join(parts)!r} is outside the snapshot directory")
+
+	return path
+
+
+def _unique_projects(projects: Iterable[str]) -> Iterator[str]:
+	# Yield each project once, however it is spelled.
+
+	seen: Set[str] = set()
+
+	for project in projects:
+		name = canonicalize_name(project)
+		if name not in seen:
+			seen.add(name)
+			yield project
+
+
+def build_snapshot(
+		client: PyPIJSON,
+		projects: Iterable[str],
+		directory: Union[str, "os.PathLike[str]"],
+		*,
+		versions: bool = False,
+		files: Optional[str] = None,
+		max_workers: int = 10,
+		) -> Iterator[Tuple[str, Union[ProjectMetadata, Exception]]]:
+	"""
+	Save the metadata, and optionally the files, for the given projects into a snapshot directory.
+
+	Results are yielded as ``(project, metadata)`` tuples in the order they complete.
+	If saving a project fails the exception is yielded in place of the metadata, rather than being raised.
+	This includes projects whose name or versions, as given by the index, are not safe to use as paths.
+	Projects given more than once (after normalization) are only saved once.
+
+	The metadata for every project is saved first, and then the files for all the projects are downloaded together,
+	so at most ``max_workers`` requests are made at once. Projects with files to download are yielded once
+	all of their files have been downloaded. Files which are already in the snapshot
+	with the expected digest are not downloaded again.
+
+	:param client: The client to fetch the metadata with.
+	:param projects: The names of the projects to save.
+	:param directory: The snapshot directory. It will be created if it does not exist.
+	:param versions: Whether to also save the metadata for each individual version of each project.
+	:param files: Which files to download. Either ``'latest'`` for the files of the latest version,
+		``'all'`` for the files of every version, or :py:obj:`None` to not download any files.
+	:param max_workers: The maximum number of requests to make at once.
+	"""
+
+	if files not in {None, "latest", "all"}:
+		raise ValueError(f"Unknown value for 'files': {files!r}")
+
+	directory = os.fspath(directory)
+
+	def save(project: str) -> Tuple[ProjectMetadata, List[FileSpec]]:
+		content = client.get_raw_metadata(project)
+		metadata = ProjectMetadata(**client.json_decoder(content))
+
+		# The name and versions come from the index, so check them before writing anything.
+		version_paths = {}
+		if versions and metadata.releases:
+			for version in metadata.releases:
+				version_paths[version] = _snapshot_path(directory, metadata.name, version, "json")
+
+		_write_atomic(_snapshot_path(directory, metadata.name, "json"), content)
+
+		for version, path in version_paths.items():
+			_write_atomic(path, client.get_raw_metadata(project, version))
+
+		to_download: List[DistributionPackageDict] = []
+		if files == "latest":
+			to_download.extend(metadata.urls)
+		elif files == "all" and metadata.releases:
+			for release_files in metadata.releases.values():
+				to_download.extend(release_files)
+
+		return metadata, [FileSpec.from_file(file) for file in to_download]
+
+	saved: Dict[str, ProjectMetadata] = {}
+	remaining: Dict[str, Set[str]] = {}
+	errors: Dict[str, Exception] = {}
+	projects_by_url: Dict[str, List[str]] = {}
+	to_download: Dict[str, FileSpec] = {}
+
+	for project, result in imap_unordered(save, _unique_projects(projects), max_workers):
+		if isinstance(result, Exception):
+			yield project, result
+			continue
+
+		metadata, project_files = result
+		if not project_files:
+			yield project, metadata
+			continue
+
+		saved[project] = metadata
+		remaining[project] = {file.url for file in project_files}
+		for file in project_files:
+			projects_by_url.setdefault(file.url, []).append(project)
+			to_download.setdefault(file.url, file)
+
+	for download in download_files(
+			client.endpoint.session,
+			to_download.values(),
+			os.path.join(directory, "files"),
+			max_workers=max_workers,
+			timeout=client.timeout,
+			):
+		for project in projects_by_url[download.file.url]:
+			if download.error is not None:
+				errors.setdefault(project, download.error)
+
+			remaining[project].discard(download.file.url)
+			if not remaining[project]:
+				yield project, errors.get(project, saved[project])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""
+	Build a snapshot from the command line.
+
+	:param argv: The command line arguments. Defaults to :py:obj:`sys.argv`.
+
+	:returns: The exit code; ``1`` if any project could not be saved.
+	"""
+
+	parser = argparse.ArgumentParser(
+			prog="python -m pypi_json.snapshot",
+			description="Save metadata and files from the PyPI JSON API into a snapshot directory for offline use.",
+			)
+	parser.add_argument("directory", help="The snapshot directory.")
+	parser.add_argument("projects", nargs='+', metavar="PROJECT", help="The projects to save.")
+	parser.add_argument(
+			"--endpoint",
+			default="https://pypi.org/pypi",
+			help="The URL of the JSON API. (default: %(default)s)",
+			)
+	parser.add_argument(
+			"--versions",
+			action="store_true",
+			help="Also save the metadata for each individual version.",
+			)
+	parser.add_argument(
+			"--files",
+			choices=["latest", "all"],
+			default=None,
+			help="Download the files for the latest version, or for every version.",
+			)
+	parser.add_argument("--max-workers", type=int, default=10, help="The number of requests to make at once.")
+
+	args = parser.parse_args(argv)
+	status = 0
+
+	with PyPIJSON(args.endpoint) as client:
+		for project, result in build_snapshot(
+				client,
+				args.projects,
+				args.directory,
+				versions=args.versions,
+				files=args.files,
+				max_workers=args.max_workers,
+				):
+			if isinstance(result, Exception):
+				print(f"Failed to save {project}: {result}", file=sys.stderr)
+				status = 1
+			else:
+				print(f"Saved {result.name} (last_serial {result.last_serial})")
+
+	return status
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+#
+#  store.py
+"""
+A persistent, single-file store of project metadata.
+
+A :class:`~.MetadataStore` keeps the JSON documents for projects in an SQLite database,
+keyed by normalized project name and version, along with each project's ``last_serial``.
+Passing one to :class:`~pypi_json.PyPIJSON` makes :meth:`~pypi_json.PyPIJSON.get_metadata` read from the store
+without making any requests, so warm runs of a tool don't have to wait on the network.
+The stored documents can be brought up to date with :meth:`PyPIJSON.sync() <pypi_json.PyPIJSON.sync>`,
+which revalidates them with conditional requests and only downloads the projects which have changed.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# 3rd party
+from packaging.utils import canonicalize_name
+from packaging.version import Version
+
+# this package
+from pypi_json.typehints import Self
+
+__all__ = ["MetadataStore", "StoreEntry"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+	project TEXT NOT NULL,
+	version TEXT NOT NULL,
+	last_serial INTEGER,
+	etag TEXT,
+	last_modified TEXT,
+	fetched REAL NOT NULL,
+	content BLOB NOT NULL,
+	PRIMARY KEY (project, version)
+)
+"""
+
+
+class StoreEntry(NamedTuple):
+	"""
+	Information about a document held in a :class:`~.MetadataStore`.
+	"""
+
+	#: The normalized project name.
+	project: str
+
+	#: The version, or :py:obj:`None` for the project's top-level metadata.
+	version: Optional[str]
+
+	#: The project's ``last_serial`` at the time the document was fetched.
+	last_serial: Optional[int]
+
+	#: The value of the response's ``ETag`` header, if any.
+	etag: Optional[str]
+
+	#: The value of the response's ``Last-Modified`` header, if any.
+	last_modified: Optional[str]
+
+	#: The time the document was last fetched or revalidated, as a Unix timestamp.
+	fetched: float
+
+	def conditional_headers(self) -> Dict[str, str]:
+		"""
+		Returns the headers for a conditional request to revalidate this entry.
+		"""
+
+		headers = {}
+
+		if self.etag is not None:
+			headers["If-None-Match"] = self.etag
+		if self.last_modified is not None:
+			headers["If-Modified-Since"] = self.last_modified
+
+		return headers
+
+
+class MetadataStore:
+	"""
+	A persistent store of project metadata in an SQLite database.
+
+	The store is safe to share between threads and between :class:`~pypi_json.PyPIJSON` instances.
+	A :class:`~.MetadataStore` can be used as a context manager that will automatically close the database on exit.
+
+	:param path: The path to the database file. It will be created if it does not exist.
+	"""
+
+	#: The path to the database file.
+	path: str
+
+	def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+		self.path = os.fspath(path)
+		self._lock = threading.Lock()
+		self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+
+		with self._lock:
+			self._connection.execute("PRAGMA journal_mode=WAL")
+			self._connection.execute(_SCHEMA)
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.MetadataStore` object.
+		"""
+
+		return f"<{self.__class__.__name__}({self.path!r})>"
+
+	def __enter__(self: Self) -> Self:
+		return self
+
+	def __exit__(self, exc_type: Any, exc_value: Any, exc_tb: Any) -> None:
+		self.close()
+
+	def __len__(self) -> int:
+		return self._execute("SELECT COUNT(*) FROM metadata")[0][0]
+
+	def close(self) -> None:
+		"""
+		Close the database connection.
+		"""
+
+		with self._lock:
+			self._connection.close()
+
+	def _execute(self, sql: str, *parameters: Any) -> List[Tuple[Any, ...]]:
+		with self._lock:
+			return self._connection.execute(sql, parameters).fetchall()
+
+	@staticmethod
+	def _make_key(project: str, version: Union[str, Version, None]) -> List[str]:
+		# The empty string stands for the project's top-level metadata, as NULLs are never equal in SQL.
+		return [canonicalize_name(project), '' if version is None else str(version)]
+
+	def get(self, project: str, version: Union[str, Version, None] = None) -> Optional[StoreEntry]:
+		"""
+		Returns information about the stored document for the given project and version,
+		or :py:obj:`None` if it is not stored.
+
+		:param project:
+		:param version:
+		"""  # noqa: D400
+
+		rows = self._execute(
+				"SELECT project, version, last_serial, etag, last_modified, fetched FROM metadata "
+				"WHERE project = ? AND version = ?",
+				*self._make_key(project, version),
+				)
+
+		if not rows:
+			return None
+
+		row = rows[0]
+		return StoreEntry(row[0], row[1] or None, *row[2:])
+
+	def read(self, project: str, version: Union[str, Version, None] = None) -> Optional[bytes]:
+		"""
+		Returns the stored JSON document for the given project and version, or :py:obj:`None` if it is not stored.
+
+		:param project:
+		:param version:
+		"""
+
+		rows = self._execute(
+				"SELECT content FROM metadata WHERE project = ? AND version = ?",
+				*self._make_key(project, version),
+				)
+
+		if not rows:
+			return None
+
+		return bytes(rows[0][0])
+
+	def set(  # noqa: A003  # pylint: disable=redefined-builtin
+			self,
+			project: str,
+			version: Union[str, Version, None],
+			content: bytes,
+			*,
+			last_serial: Optional[int] = None,
+			etag: Optional[str] = None,
+			last_modified: Optional[str] = None,
+			) -> None:
+		"""
+		Store the JSON document for the given project and version, replacing any existing document.
+
+		:param project:
+		:param version:
+		:param content: The JSON document.
+		:param last_serial: The project's ``last_serial``.
+		:param etag: The value of the response's ``ETag`` header.
+		:param last_modified: The value of the response's ``Last-Modified`` header.
+		"""
+
+		self._execute(
+				"INSERT OR REPLACE INTO metadata "
+				"(project, version, last_serial, etag, last_modified, fetched, content) VALUES (?, ?, ?, ?, ?, ?, ?)",
+				*self._make_key(project, version),
+				last_serial,
+				etag,
+				last_modified,
+				time.time(),
+				content,
+				)
+
+	def touch(self, project: str, version: Union[str, Version, None] = None) -> None:
+		"""
+		Record that the stored document for the given project and version was revalidated just now.
+
+		:param project:
+		:param version:
+		"""
+
+		self._execute(
+				"UPDATE metadata SET fetched = ? WHERE project = ? AND version = ?",
+				time.time(),
+				*self._make_key(project, version),
+				)
+
+	def delete(self, project: str, version: Union[str, Version, None] = None) -> None:
+		"""
+		Remove the stored document for the given project and version, if any.
+
+		:param project:
+		:param version:
+		"""
+
+		self._execute("DELETE FROM metadata WHERE project = ? AND version = ?", *self._make_key(project, version))
+
+	def clear(self) -> None:
+		"""
+		Remove all documents from the store.
+		"""
+
+		self._execute("DELETE FROM metadata")
+
+	def projects(self) -> Iterator[str]:
+		"""
+		Iterate over the normalized names of the projects with top-level metadata in the store.
+		"""
+
+		for row in self._execute("SELECT project FROM metadata WHERE version = '' ORDER BY project"):
+			yield row[0]
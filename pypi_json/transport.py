@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+#
+#  transport.py
+"""
+Connection pool and retry configuration for :class:`~pypi_json.PyPIJSON`.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+from typing import Any, Collection, Dict, Optional, Union
+
+# 3rd party
+import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.retry import Retry
+
+# this package
+from pypi_json.ratelimit import RateLimiter
+
+__all__ = ["RETRY_STATUSES", "RateLimitedAdapter", "configure_session", "make_retry"]
+
+#: The HTTP status codes which are retried by default.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def make_retry(
+		total: int = 3,
+		backoff_factor: float = 0.5,
+		status_forcelist: Collection[int] = RETRY_STATUSES,
+		) -> Retry:
+	"""
+	Returns a :class:`urllib3.util.retry.Retry` policy for requests to the JSON API.
+
+	Failed connections, and ``GET`` and ``HEAD`` requests which receive one of the statuses in ``status_forcelist``,
+	are retried up to ``total`` times with exponential backoff.
+	If the response includes a ``Retry-After`` header (as with ``429 Too Many Requests``)
+	the client waits for the time given there instead.
+	Once the retries are exhausted the last response is returned,
+	so the usual errors are raised by :class:`~pypi_json.PyPIJSON`.
+
+	:param total: The maximum number of retries.
+	:param backoff_factor: The delay before the second retry is ``backoff_factor * 2`` seconds,
+		doubling for each subsequent retry. The first retry is made immediately.
+	:param status_forcelist: The HTTP status codes to retry.
+	"""
+
+	return Retry(
+			total=total,
+			backoff_factor=backoff_factor,
+			status_forcelist=frozenset(status_forcelist),
+			allowed_methods=frozenset({"GET", "HEAD"}),
+			respect_retry_after_header=True,
+			raise_on_status=False,
+			)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+	"""
+	An :class:`~requests.adapters.HTTPAdapter` which sends requests through a :class:`~pypi_json.ratelimit.RateLimiter`.
+
+	Throttled requests are retried, after waiting for the delay given by the rate limiter,
+	up to :attr:`RateLimiter.max_retries <pypi_json.ratelimit.RateLimiter.max_retries>` times.
+	Once the retries are exhausted the last response is returned.
+	The number of retries made is recorded in the response's ``throttle_retries`` attribute.
+
+	For streamed responses the request counts towards the concurrency limit until the headers are received,
+	not until the body has been read.
+
+	:param rate_limiter:
+	:param kwargs: Keyword arguments for :class:`~requests.adapters.HTTPAdapter`.
+	"""
+
+	#: The rate limiter requests are sent through.
+	rate_limiter: RateLimiter
+
+	def __init__(self, rate_limiter: RateLimiter, **kwargs: Any) -> None:
+		self.rate_limiter = rate_limiter
+		super().__init__(**kwargs)
+
+	def send(  # type: ignore[override]
+			self,
+			request: requests.PreparedRequest,
+			**kwargs: Any,
+			) -> requests.Response:
+		"""
+		Send the request, waiting for the rate limiter and retrying if it is throttled.
+
+		:param request:
+		:param kwargs: Keyword arguments for :meth:`requests.adapters.HTTPAdapter.send`.
+		"""
+
+		rate_limiter = self.rate_limiter
+		attempt = 0
+
+		while True:
+			token = rate_limiter.acquire()
+
+			try:
+				response = super().send(request, **kwargs)
+			except BaseException:
+				rate_limiter.release(token, None)
+				raise
+
+			if not rate_limiter.release(token, response) or attempt >= rate_limiter.max_retries:
+				response.throttle_retries = attempt  # type: ignore[attr-defined]
+				return response
+
+			response.close()
+			rate_limiter.backoff(response, attempt)
+			attempt += 1
+
+
+def configure_session(
+		session: requests.Session,
+		*,
+		pool_connections: Optional[int] = None,
+		pool_maxsize: Optional[int] = None,
+		pool_block: bool = DEFAULT_POOLBLOCK,
+		retries: Union[int, Retry, None] = None,
+		keep_alive: bool = True,
+		rate_limiter: Optional[RateLimiter] = None,
+		) -> HTTPAdapter:
+	"""
+	Mount an :class:`~requests.adapters.HTTPAdapter` with the given connection pool and retry options on ``session``.
+
+	:param session:
+	:param pool_connections: The number of hosts to keep connection pools for.
+	:param pool_maxsize: The maximum number of connections to keep open to each host.
+		This should be at least the number of threads making requests at once,
+		otherwise connections are discarded and reopened.
+	:param pool_block: Whether to wait for a connection to be returned to the pool when ``pool_maxsize``
+		connections are in use, rather than opening a connection which is discarded afterwards.
+	:param retries: The retry policy, either a :class:`urllib3.util.retry.Retry` object or a number of retries
+		for :func:`~.make_retry`. If :py:obj:`None` or ``0`` failed requests are not retried.
+	:param keep_alive: If :py:obj:`False` connections are closed after each request.
+	:param rate_limiter: Optional :class:`~pypi_json.ratelimit.RateLimiter` to send requests through.
+		When a number of ``retries`` is given the rate limiter's throttle statuses are left to the rate limiter,
+		rather than being retried immediately.
+
+	:raises ValueError: If a transport adapter other than a plain :class:`~requests.adapters.HTTPAdapter`
+		or :class:`~.RateLimitedAdapter` is mounted on ``session``, as it would be replaced.
+		This includes :class:`~pypi_json.snapshot.SnapshotAdapter` and other
+		:class:`~requests.adapters.HTTPAdapter` subclasses, such as caching adapters.
+
+	:returns: The mounted adapter.
+	"""
+
+	for prefix in ("https://", "http://"):
+		mounted = session.adapters.get(prefix)
+		# Subclasses of HTTPAdapter (such as caching adapters) may carry behaviour which would be lost,
+		# so only the adapters requests and this function mount are replaced.
+		if mounted is not None and type(mounted) not in {HTTPAdapter, RateLimitedAdapter}:
+			raise ValueError(
+					f"Cannot configure the connection pool, retries or rate limiting of a session "
+					f"with a custom transport adapter ({mounted!r}) mounted for {prefix!r}"
+					)
+
+	if isinstance(retries, int) and retries:
+		if rate_limiter is None:
+			retries = make_retry(retries)
+		else:
+			# urllib3 retries responses with a Retry-After header regardless of the status_forcelist
+			retries = make_retry(retries, status_forcelist=RETRY_STATUSES - rate_limiter.throttle_statuses)
+			retries = retries.new(respect_retry_after_header=False)
+
+	kwargs: Dict[str, Any] = {
+			"pool_connections": DEFAULT_POOLSIZE if pool_connections is None else pool_connections,
+			"pool_maxsize": DEFAULT_POOLSIZE if pool_maxsize is None else pool_maxsize,
+			"max_retries": retries or 0,
+			"pool_block": pool_block,
+			}
+
+	adapter: HTTPAdapter
+	if rate_limiter is None:
+		adapter = HTTPAdapter(**kwargs)
+	else:
+		adapter = RateLimitedAdapter(rate_limiter, **kwargs)
+
+	session.mount("https://", adapter)
+	session.mount("http://", adapter)
+
+	if not keep_alive:
+		session.headers["Connection"] = "close"
+
+	return adapter
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+#
+#  versions.py
+"""
+A sorted index of the versions of a project on PyPI.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+# 3rd party
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+
+# this package
+from pypi_json.typehints import DistributionPackageDict
+
+if TYPE_CHECKING:
+	# this package
+	from pypi_json.compact import CompactFile
+
+__all__ = ["VersionIndex"]
+
+
+def _is_yanked(file: Union[DistributionPackageDict, "CompactFile"]) -> bool:
+	if isinstance(file, dict):
+		return file.get("yanked", False)
+	return file.yanked
+
+
+class VersionIndex:
+	"""
+	A sorted index of the versions in :attr:`ProjectMetadata.releases <pypi_json.ProjectMetadata.releases>`.
+
+	Each version string is parsed once, when the index is constructed.
+	Lookups of the latest version and filtering by a :class:`~packaging.specifiers.SpecifierSet`
+	use binary search over the sorted versions rather than scanning every release.
+	Release keys which are not valid :pep:`440` versions are omitted from the index.
+
+	Instances are usually obtained from :attr:`ProjectMetadata.version_index <pypi_json.ProjectMetadata.version_index>`,
+	which builds the index on first access and reuses it afterwards.
+
+	:param releases: A mapping of version numbers to the files associated with that version,
+		either as dictionaries or as :class:`~pypi_json.compact.CompactFile` objects.
+	"""
+
+	__slots__ = ("_versions", "_keys", "_releases")
+
+	def __init__(
+			self,
+			releases: Mapping[str, Sequence[Union[DistributionPackageDict, "CompactFile"]]],
+			) -> None:
+		pairs: List[Tuple[Version, str]] = []
+
+		for key in releases:
+			try:
+				pairs.append((Version(key), key))
+			except InvalidVersion:
+				continue
+
+		pairs.sort(key=lambda pair: pair[0])
+
+		self._versions: List[Version] = [version for version, key in pairs]
+		self._keys: Dict[Version, str] = dict(pairs)
+		self._releases = releases
+
+	def __len__(self) -> int:
+		return len(self._versions)
+
+	def __iter__(self) -> Iterator[Version]:
+		"""
+		Iterate over the versions in ascending order.
+		"""
+
+		return iter(self._versions)
+
+	def __reversed__(self) -> Iterator[Version]:
+		"""
+		Iterate over the versions in descending order.
+		"""
+
+		return reversed(self._versions)
+
+	def __contains__(self, version: object) -> bool:
+		if isinstance(version, str):
+			try:
+				version = Version(version)
+			except InvalidVersion:
+				return False
+
+		return version in self._keys
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.VersionIndex`.
+		"""
+
+		return f"<{self.__class__.__name__}({len(self)} versions)>"
+
+	@property
+	def versions(self) -> List[Version]:
+		"""
+		The versions, in ascending order.
+		"""
+
+		return list(self._versions)
+
+	def key_for(self, version: Union[str, Version]) -> str:
+		"""
+		Returns the key in :attr:`ProjectMetadata.releases <pypi_json.ProjectMetadata.releases>`
+		for the given version.
+
+		This allows releases to be looked up with an equivalent version, e.g. ``1.0`` for a release named ``1.0.0``.
+
+		:param version:
+
+		:raises KeyError: If the version is not in the index.
+		"""
+
+		if isinstance(version, str):
+			try:
+				version = Version(version)
+			except InvalidVersion:
+				raise KeyError(version) from None
+
+		return self._keys[version]
+
+	def is_yanked(self, version: Union[str, Version]) -> bool:
+		"""
+		Returns whether the given version has been yanked, as defined in :pep:`592`.
+
+		A version is considered yanked if it has files and all of them have been yanked.
+
+		:param version:
+
+		:raises KeyError: If the version is not in the index.
+		"""
+
+		files = self._releases[self.key_for(version)]
+		return bool(files) and all(_is_yanked(file) for file in files)
+
+	def latest(self, *, prereleases: bool = True, yanked: bool = True) -> Optional[Version]:
+		"""
+		Returns the latest version in the index, or :py:obj:`None` if no versions match.
+
+		:param prereleases: Whether to consider pre-releases and development releases.
+		:param yanked: Whether to consider yanked versions.
+		"""
+
+		for version in reversed(self._versions):
+			if not prereleases and version.is_prerelease:
+				continue
+			if not yanked and self.is_yanked(version):
+				continue
+			return version
+
+		return None
+
+	def filter(  # noqa: A003  # pylint: disable=redefined-builtin
+			self,
+			specifier: Union[str, SpecifierSet],
+			prereleases: Optional[bool] = None,
+			) -> List[Version]:
+		"""
+		Returns the versions which satisfy the given specifier, in ascending order.
+
+		The candidate versions are narrowed with a binary search on the specifier's bounds
+		before being checked against the specifier itself.
+
+		:param specifier: e.g. ``'>=1.0,<2'``.
+		:param prereleases: Whether to include pre-releases.
+			If :py:obj:`None` the rules of :meth:`packaging.specifiers.SpecifierSet.filter` are used.
+		"""
+
+		if isinstance(specifier, str):
+			specifier = SpecifierSet(specifier)
+
+		lower, upper = self._bounds(specifier)
+		return list(specifier.filter(self._versions[lower:upper], prereleases=prereleases))
+
+	def _bounds(self, specifier_set: SpecifierSet) -> Tuple[int, int]:
+		versions = self._versions
+		lower, upper = 0, len(versions)
+
+		for specifier in specifier_set:
+			operator = specifier.operator
+
+			if operator in {"!=", "==="} or specifier.version.endswith(".*"):
+				continue
+
+			try:
+				bound = Version(specifier.version)
+			except (InvalidVersion, InvalidSpecifier):  # pragma: no cover
+				continue
+
+			if operator in {">=", "~=", "=="}:
+				lower = max(lower, bisect_left(versions, bound))
+			elif operator == '>':
+				lower = max(lower, bisect_right(versions, bound))
+
+			if operator in {"<=", "=="}:
+				# Local versions (e.g. 1.0+abc) sort after 1.0 but still match '<=1.0' and '==1.0'.
+				end = bisect_right(versions, bound)
+				while end < len(versions) and Version(versions[end].public) == bound:
+					end += 1
+				upper = min(upper, end)
+			elif operator == '<':
+				upper = min(upper, bisect_left(versions, bound))
+
+		return lower, max(lower, upper)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+#
+#  wheels.py
+"""
+Selection of wheels by their :pep:`425` compatibility tags.
+
+.. versionadded:: 0.6.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import functools
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Union
+
+# 3rd party
+from packaging.tags import Tag, sys_tags
+from packaging.utils import parse_wheel_filename
+
+# this package
+from pypi_json.typehints import DistributionPackageDict
+
+__all__ = ["TagPriorities", "WheelTagIndex", "parse_wheel_tags", "tag_priorities"]
+
+#: A mapping of compatibility tags to their priority, where lower numbers are preferred.
+TagPriorities = Mapping[Tag, int]
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_wheel_tags(filename: str) -> FrozenSet[Tag]:
+	"""
+	Returns the compatibility tags of the wheel with the given filename.
+
+	Results are cached, so each filename is only parsed once
+	when the same releases are examined repeatedly.
+
+	:param filename:
+	"""
+
+	return parse_wheel_filename(filename)[3]
+
+
+@functools.lru_cache(maxsize=None)
+def _sys_tag_priorities() -> Dict[Tag, int]:
+	return _build_priorities(sys_tags())
+
+
+def _build_priorities(tags: Iterable[Tag]) -> Dict[Tag, int]:
+	priorities: Dict[Tag, int] = {}
+
+	for priority, tag in enumerate(tags):
+		priorities.setdefault(tag, priority)
+
+	return priorities
+
+
+def tag_priorities(tags: Union[Iterable[Tag], TagPriorities, None] = None) -> TagPriorities:
+	"""
+	Returns a mapping of compatibility tags to their priority, where lower numbers are preferred.
+
+	The result can be passed to :meth:`WheelTagIndex.best` and
+	:meth:`ProjectMetadata.select_best_wheel <pypi_json.ProjectMetadata.select_best_wheel>`
+	in place of the list of tags, which avoids recomputing it when selecting wheels for many projects.
+
+	:param tags: The supported tags, most preferred first.
+		If :py:obj:`None` the tags supported by the running interpreter (from :func:`packaging.tags.sys_tags`) are used,
+		and the result is cached.
+		If already a mapping of tags to priorities it is returned unchanged.
+	"""
+
+	if tags is None:
+		return _sys_tag_priorities()
+	elif isinstance(tags, Mapping):
+		return tags
+	else:
+		return _build_priorities(tags)
+
+
+class WheelTagIndex:
+	"""
+	An index of the files in a release by the compatibility tags of its wheels.
+
+	:param files: The files in the release.
+	"""
+
+	__slots__ = ("wheels", "non_wheels")
+
+	#: A mapping of compatibility tags to the wheel with that tag.
+	wheels: Dict[Tag, DistributionPackageDict]
+
+	#: The files in the release which are not wheels (e.g. sdists).
+	non_wheels: List[DistributionPackageDict]
+
+	def __init__(self, files: Iterable[DistributionPackageDict]) -> None:
+		self.wheels = {}
+		self.non_wheels = []
+
+		for file in files:
+			if file["filename"].endswith(".whl"):
+				for tag in parse_wheel_tags(file["filename"]):
+					self.wheels[tag] = file
+			else:
+				self.non_wheels.append(file)
+
+	def __repr__(self) -> str:
+		"""
+		Returns a string representation of the :class:`~.WheelTagIndex`.
+		"""
+
+		return f"<{self.__class__.__name__}({len(self.wheels)} tags, {len(self.non_wheels)} non-wheel files)>"
+
+	def best(self, tags: Union[Iterable[Tag], TagPriorities, None] = None) -> Optional[DistributionPackageDict]:
+		"""
+		Returns the most preferred wheel which is compatible with the given tags,
+		or :py:obj:`None` if there are no compatible wheels.
+
+		:param tags: The supported tags, most preferred first, or a mapping from :func:`~.tag_priorities`.
+			If :py:obj:`None` the tags supported by the running interpreter are used.
+		"""  # noqa: D400
+
+		priorities = tag_priorities(tags)
+		best_file: Optional[DistributionPackageDict] = None
+		best_priority: Optional[int] = None
+
+		for tag, file in self.wheels.items():
+			priority = priorities.get(tag)
+			if priority is not None and (best_priority is None or priority < best_priority):
+				best_file, best_priority = file, priority
+
+		return best_file
@@ -0,0 +1,70 @@
+# stdlib
+import asyncio
+from typing import Iterator
+
+# 3rd party
+import pytest
+from betamax import Betamax  # type: ignore[import]
+from packaging.requirements import InvalidRequirement
+from packaging.version import Version
+
+# this package
+from pypi_json import ProjectMetadata
+from pypi_json.aio import AsyncPyPIJSON
+
+
+@pytest.fixture()
+def async_client() -> Iterator[AsyncPyPIJSON]:
+	client = AsyncPyPIJSON(max_concurrency=4)
+
+	with Betamax(client.client.endpoint.session) as vcr:
+		vcr.use_cassette("test_api", record="none", allow_playback_repeats=True)
+		yield client
+
+
+def test_get_metadata(async_client: AsyncPyPIJSON):
+
+	async def main() -> ProjectMetadata:
+		async with async_client:
+			return await async_client.get_metadata("OctoCheese")
+
+	metadata = asyncio.run(main())
+	assert isinstance(metadata, ProjectMetadata)
+	assert metadata.name == "octocheese"
+	assert metadata.version == Version("0.7.0")
+
+
+def test_get_metadata_concurrent(async_client: AsyncPyPIJSON):
+
+	async def main():  # noqa: MAN002
+		async with async_client:
+			return await asyncio.gather(*(async_client.get_metadata("OctoCheese") for _ in range(20)))
+
+	results = asyncio.run(main())
+	assert len(results) == 20
+	assert all(metadata.get_latest_version() == Version("0.7.0") for metadata in results)
+
+
+def test_metadata_nonexistant():
+	client = AsyncPyPIJSON()
+
+	async def main() -> ProjectMetadata:
+		async with client:
+			return await client.get_metadata("FizzBuzz")
+
+	with Betamax(client.client.endpoint.session) as vcr:
+		vcr.use_cassette("test_metadata_nonexistant", record="none")
+
+		with pytest.raises(InvalidRequirement, match="No such project 'FizzBuzz'"):
+			asyncio.run(main())
+
+
+def test_class_misc():
+	client = AsyncPyPIJSON(auth=("username", "password"), endpoint="https://my.custom.pypi/")
+	assert client.endpoint_url == "https://my.custom.pypi/"
+	assert client.client.endpoint.session.auth == ("username", "password")
+	assert client.client.endpoint.session.get_adapter("https://my.custom.pypi/")._pool_maxsize == 100
+	assert repr(client) == "<AsyncPyPIJSON('https://my.custom.pypi/')>"
+
+	with pytest.raises(ValueError, match="'max_concurrency' must be at least 1"):
+		AsyncPyPIJSON(max_concurrency=0)
@@ -1,13 +1,19 @@
 # stdlib
 import gzip
+import json
+import pickle
 import re
 import tarfile
+import threading
+import time
 import zipfile
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set, Union
 from urllib.parse import urlparse
 
 # 3rd party
 import pytest
+import requests
 from apeye import URL
 from apeye.requests_url import RequestsURL
 # from apeye.url import URL
@@ -18,7 +24,8 @@ from packaging.requirements import InvalidRequirement
 from packaging.version import Version
 
 # this package
-from pypi_json import PyPIJSON
+from pypi_json import LazyProjectMetadata, ProjectMetadata, PyPIJSON, ReleaseFile, ReleaseInfo
+from tests.utils import FakeAdapter, make_response
 
 
 def uri_validator(x) -> bool:  # noqa: MAN001
@@ -78,6 +85,7 @@ def test_get_pypi_releases(
 
 	releases = metadata.get_releases()
 	assert isinstance(releases, dict)
+	assert metadata.get_releases() is releases
 
 	release_url_list = releases["0.0.2"]
 	assert isinstance(release_url_list, list)
@@ -98,6 +106,7 @@ def test_get_releases_with_digests(
 
 	releases = metadata.get_releases_with_digests()
 	assert isinstance(releases, dict)
+	assert metadata.get_releases_with_digests() is releases
 
 	release_url_list = releases["0.0.2"]
 	assert isinstance(release_url_list, list)
@@ -109,6 +118,114 @@ def test_get_releases_with_digests(
 	advanced_data_regression.check(release_url_list)
 
 
+def test_iter_release_files(module_cassette: PyPIJSON):
+	metadata = module_cassette.get_metadata("OctoCheese")
+
+	files = list(metadata.iter_release_files())
+	assert all(isinstance(file, ReleaseFile) for file in files)
+
+	assert files == [
+			(release, file["url"], file["digest"])
+			for release, release_files in metadata.get_releases_with_digests().items()
+			for file in release_files
+			]
+
+	assert list(metadata.iter_release_files("0.0.2")) == [file for file in files if file.version == "0.0.2"]
+	assert list(metadata.iter_release_files(Version("0.0.2"))) == list(metadata.iter_release_files("0.0.2"))
+
+	with pytest.raises(InvalidRequirement, match="Cannot find version 0.0.0 on PyPI."):
+		next(metadata.iter_release_files("0.0.0"))
+
+
+def test_get_release_info(module_cassette: PyPIJSON):
+	metadata = module_cassette.get_metadata("OctoCheese")
+
+	release_info = metadata.get_release_info()
+	assert list(release_info) == list(metadata.releases)  # type: ignore[arg-type]
+	assert all(isinstance(info, ReleaseInfo) for info in release_info.values())
+
+	latest = release_info[metadata.info["version"]]
+	assert latest.requires_dist == metadata.info["requires_dist"]
+	assert latest.vulnerabilities == metadata.vulnerabilities
+
+	info = release_info["0.0.2"]
+	assert info.files is metadata.releases["0.0.2"]  # type: ignore[index]
+	assert not info.yanked
+	assert info.requires_python == metadata.releases["0.0.2"][0]["requires_python"]  # type: ignore[index]
+	assert info.upload_time == min(file["upload_time_iso_8601"] for file in info.files)
+	assert info.requires_dist is None
+	assert info.vulnerabilities is None
+
+	assert list(metadata.get_release_info([Version("0.0.2")])) == ["0.0.2"]
+
+	with pytest.raises(InvalidRequirement, match="Cannot find version 0.0.0 on PyPI."):
+		metadata.get_release_info(["0.0.0"])
+
+
+def test_release_info_yanked():
+	files = [
+			{"upload_time_iso_8601": "2021-02-01T00:00:00Z", "yanked": True, "yanked_reason": "Broken"},
+			{"upload_time_iso_8601": "2021-01-01T00:00:00Z", "yanked": True, "yanked_reason": None},
+			]
+
+	info = ReleaseInfo.from_files("1.0", files)  # type: ignore[arg-type]
+	assert info.yanked
+	assert info.yanked_reason == "Broken"
+	assert info.upload_time == "2021-01-01T00:00:00Z"
+
+	info = ReleaseInfo.from_files("1.0", files[:1] + [{}])  # type: ignore[arg-type]
+	assert not info.yanked
+	assert info.yanked_reason is None
+
+	assert ReleaseInfo.from_files("1.0", []) == ("1.0", [], False, None, None, None, None, None)
+
+
+def test_client_get_release_info():
+	releases = {f"1.{i}": [{"requires_python": ">=3.6", "yanked": i == 3}] for i in range(10)}
+	missing: Set[str] = set()
+
+	def handler(request: requests.PreparedRequest) -> requests.Response:
+		path = (request.url or '')[len("https://pypi.org/pypi/"):].rstrip('/').split('/')
+		version = path[1] if len(path) == 3 else "1.9"
+		if version not in releases or (len(path) == 3 and version in missing):
+			return make_response(404)
+
+		document = {
+				"info": {"name": "foo", "version": version, "requires_dist": [f"bar=={version}"]},
+				"last_serial": 1,
+				"vulnerabilities": [{"id": version}],
+				}
+		if len(path) == 2:
+			document["releases"] = releases
+		return make_response(200, json.dumps(document).encode("UTF-8"))
+
+	adapter = FakeAdapter(handler)
+
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", adapter)
+
+		release_info = client.get_release_info("foo")
+		assert len(adapter.requests) == 1
+		assert len(release_info) == 10
+		assert release_info["1.3"].yanked
+		assert release_info["1.5"].requires_python == ">=3.6"
+		assert release_info["1.5"].requires_dist is None
+		assert release_info["1.9"].requires_dist == ["bar==1.9"]
+
+		release_info = client.get_release_info("foo", ["1.0", "1.1", "1.9"], details=True)
+		assert len(adapter.requests) == 4
+		assert release_info["1.0"].requires_dist == ["bar==1.0"]
+		assert release_info["1.1"].vulnerabilities == [{"id": "1.1"}]
+		assert release_info["1.9"].vulnerabilities == [{"id": "1.9"}]
+
+		with pytest.raises(InvalidRequirement, match="Cannot find version 2.0 on PyPI."):
+			client.get_release_info("foo", ["2.0"], details=True)
+
+		missing.add("1.2")
+		with pytest.raises(InvalidRequirement, match="No such project/version 'foo' 1.2"):
+			client.get_release_info("foo", ["1.2"], details=True)
+
+
 @pytest.mark.parametrize(
 		"url",
 		[
@@ -235,6 +352,161 @@ def test_get_metadata_not_found(cassette: PyPIJSON):
 		cassette.get_metadata("pypi-json", "1.2.3")
 
 
+def test_get_metadata_lazy(module_cassette: PyPIJSON):
+	metadata = module_cassette.get_metadata("OctoCheese", lazy=True)
+
+	assert isinstance(metadata, LazyProjectMetadata)
+	assert metadata.name == "octocheese"
+	assert metadata.version == Version("0.7.0")
+	assert list(metadata._values) == ["info"]
+
+	assert metadata.get_latest_version() == Version("0.7.0")
+	assert "releases" in metadata._values
+	assert "urls" not in metadata._values
+
+
+def test_lazy_metadata():
+	document = {
+			"info": {"name": "OctoCheese", "version": "0.7.0", "summary": "Some text with \"quotes\" and {braces}"},
+			"last_serial": 1234,
+			"releases": {"0.7.0": [], "0.6.0": []},
+			"urls": [],
+			"vulnerabilities": [{"id": "PYSEC-001"}],
+			}
+	content = json.dumps(document, indent=2).encode("UTF-8")
+	expected = ProjectMetadata(**document)  # type: ignore[arg-type]
+
+	metadata = LazyProjectMetadata(content)
+	assert metadata.info == document["info"]
+	assert list(metadata._values) == ["info"]
+
+	# The document is decoded to text once, which is dropped when decoding finishes
+	assert metadata._raw is None
+	text = metadata._text
+	assert metadata.last_serial == 1234
+	assert metadata._text is text
+	assert metadata.ownership is None
+	assert metadata._pos == -1
+
+	# The values passed over are skipped without being decoded, so the text is kept until they are read
+	assert list(metadata._values) == ["info", "last_serial"]
+	assert metadata._text is text
+	assert metadata.urls == []
+	assert metadata._text is text
+	assert metadata.releases == document["releases"]
+	assert metadata.vulnerabilities == document["vulnerabilities"]
+	assert metadata._text is None
+
+	# Reading a later field doesn't decode the releases before it
+	metadata = LazyProjectMetadata(content)
+	assert metadata.urls == []
+	assert metadata.vulnerabilities == document["vulnerabilities"]
+	assert "releases" not in metadata._values
+	assert metadata.releases == document["releases"]
+	assert metadata.info == document["info"]
+
+	metadata = LazyProjectMetadata(content)
+	assert metadata == expected
+	assert not metadata != expected
+	assert metadata != ProjectMetadata(**{**document, "last_serial": 1})  # type: ignore[arg-type]
+	assert metadata.__eq__("a string") is NotImplemented
+	assert metadata.__ne__("a string") is NotImplemented
+	assert metadata[1] == 1234
+	assert metadata._asdict() == expected._asdict()
+	assert repr(metadata) == repr(expected).replace("ProjectMetadata", "LazyProjectMetadata", 1)
+
+	materialized = metadata.materialize()
+	assert type(materialized) is ProjectMetadata
+	assert materialized == expected
+
+	unpickled = pickle.loads(pickle.dumps(metadata))  # nosec: B301
+	assert type(unpickled) is ProjectMetadata
+	assert unpickled == expected
+
+	replaced = metadata._replace(last_serial=1)
+	assert type(replaced) is ProjectMetadata
+	assert replaced.last_serial == 1
+
+	with pytest.raises(TypeError, match="unhashable"):
+		hash(metadata)
+
+	with pytest.raises(ValueError, match="The JSON document has no 'last_serial' key."):
+		LazyProjectMetadata(b'{"info": {}}').last_serial  # pylint: disable=expression-not-assigned
+
+	with pytest.raises(ValueError, match="The JSON document is not an object."):
+		LazyProjectMetadata(b'[]').info  # pylint: disable=expression-not-assigned
+
+
+def test_get_raw_metadata():
+	document = b'{"info": {"name": "OctoCheese", "version": "0.7.0"},  "last_serial": 1}'
+
+	def handler(request: requests.PreparedRequest) -> requests.Response:
+		if "/FizzBuzz/" in (request.url or ''):
+			return make_response(404)
+		return make_response(200, document)
+
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(handler))
+
+		assert client.get_raw_metadata("OctoCheese") == document
+		assert client.get_raw_metadata("OctoCheese", "0.7.0") == document
+
+		with pytest.raises(InvalidRequirement, match="No such project 'FizzBuzz'"):
+			client.get_raw_metadata("FizzBuzz")
+
+
+def test_get_many_metadata(cassette: PyPIJSON):
+	results = dict(cassette.get_many_metadata(["OctoCheese", "FizzBuzz"], max_workers=2))
+
+	assert set(results) == {"OctoCheese", "FizzBuzz"}
+
+	metadata = results["OctoCheese"]
+	assert isinstance(metadata, ProjectMetadata)
+	assert metadata.get_latest_version() == Version("0.7.0")
+
+	error = results["FizzBuzz"]
+	assert isinstance(error, InvalidRequirement)
+	assert str(error) == "No such project 'FizzBuzz'"
+
+	with pytest.raises(ValueError, match="'max_workers' must be at least 1"):
+		list(cassette.get_many_metadata(["OctoCheese"], max_workers=0))
+
+
+def test_get_metadata_single_flight():
+	document = json.dumps({"info": {"name": "setuptools", "version": "1.0"}, "last_serial": 1}).encode("UTF-8")
+
+	def handler(request: requests.PreparedRequest) -> requests.Response:
+		# Give the other threads time to join the in-flight request
+		time.sleep(0.2)
+		if "/missing/" in (request.url or ''):
+			return make_response(404)
+		return make_response(200, document)
+
+	adapter = FakeAdapter(handler)
+
+	with PyPIJSON() as client, ThreadPoolExecutor(max_workers=8) as executor:
+		client.endpoint.session.mount("https://", adapter)
+
+		results = list(executor.map(client.get_metadata, ["setuptools", "Setuptools"] * 4))
+		assert len(adapter.requests) == 1
+		assert all(metadata is results[0] for metadata in results)
+		assert len(client._in_flight) == 0
+
+		# Different versions are separate requests
+		list(executor.map(client.get_metadata, ["setuptools"] * 4, [None, None, "1.0", "1.0"]))
+		assert len(adapter.requests) == 3
+
+		# Errors are shared too
+		futures = [executor.submit(client.get_metadata, "missing") for _ in range(4)]
+		for future in futures:
+			assert isinstance(future.exception(), InvalidRequirement)
+		assert len(adapter.requests) == 4
+
+		# Later calls make a new request
+		client.get_metadata("setuptools")
+		assert len(adapter.requests) == 5
+
+
 def test_class_misc():
 
 	with PyPIJSON(auth=("username", "password"), endpoint="https://my.custom.pypi/") as client:
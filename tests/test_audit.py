@@ -0,0 +1,125 @@
+# stdlib
+import json
+from typing import List
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+from packaging.requirements import InvalidRequirement, Requirement
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.audit import AuditReport, AuditResult, audit_requirements, parse_pin, read_requirements
+from tests.utils import FakeAdapter, make_response
+
+VULNERABILITIES = {
+		"requests/2.25.0": [
+				{"id": "PYSEC-1", "aliases": ["CVE-1"], "fixed_in": ["2.26.0"], "withdrawn": None},
+				{"id": "PYSEC-2", "aliases": [], "fixed_in": ["2.31.0"], "withdrawn": "2023-01-01T00:00:00Z"},
+				],
+		"urllib3/1.26.0": [{"id": "PYSEC-1", "aliases": ["CVE-1"], "fixed_in": ["1.26.5"]}],
+		"idna/3.0": [],
+		}
+
+
+class Index:
+
+	def __init__(self):
+		self.requested: List[str] = []
+
+	def __call__(self, request: requests.PreparedRequest) -> requests.Response:
+		assert request.url is not None
+		path = '/'.join(request.url[len("https://pypi.org/pypi/"):].rstrip('/').split('/')[:-1])
+		self.requested.append(path)
+
+		if path not in VULNERABILITIES:
+			return make_response(404)
+
+		document = {
+				"info": {"name": path.split('/')[0], "version": path.split('/')[1]},
+				"last_serial": 42,
+				"vulnerabilities": VULNERABILITIES[path],
+				}
+		return make_response(200, json.dumps(document).encode("UTF-8"))
+
+
+def test_parse_pin():
+	assert parse_pin("Requests==2.25.0") == ("requests", "2.25.0")
+	assert parse_pin(Requirement("foo===1.0-custom")) == ("foo", "1.0-custom")
+	assert parse_pin(("Foo_Bar", "1.0")) == ("foo-bar", "1.0")
+
+	for requirement in ["requests", "requests>=2.25", "requests==2.*", "requests==2.25,!=2.25.1"]:
+		with pytest.raises(ValueError, match="is not pinned to a single version"):
+			parse_pin(requirement)
+
+
+def test_read_requirements(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "requirements.txt").write_lines([
+			"# This file is autogenerated",
+			"--index-url https://pypi.org/simple",
+			"-r other.txt",
+			'',
+			"requests==2.25.0 \\",
+			"    --hash=sha256:aaaa \\",
+			"    --hash=sha256:bbbb",
+			"    # via -r requirements.in",
+			"urllib3==1.26.0  # via requests",
+			"idna==3.0; python_version >= '3.5'",
+			"mypkg @ https://example.com/mypkg-1.0.tar.gz",
+			"./local/pkg",
+			"../sibling",
+			"/abs/path",
+			"src\\pkg",
+			"foo-1.0-py3-none-any.whl",
+			"vendor.tar.gz; python_version >= '3.7'",
+			"git+https://github.com/user/repo@main#egg=repo",
+			"https://example.com/pkg.zip",
+			"-e ./editable",
+			])
+
+	assert [str(req) for req in read_requirements(tmp_pathplus / "requirements.txt")] == [
+			"requests==2.25.0",
+			"urllib3==1.26.0",
+			'idna==3.0; python_version >= "3.5"',
+			]
+
+	(tmp_pathplus / "invalid.txt").write_lines(["requests==2.25.0", "not a valid ;; req"])
+
+	with pytest.raises(InvalidRequirement):
+		read_requirements(tmp_pathplus / "invalid.txt")
+
+
+def test_audit_requirements():
+	index = Index()
+
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(index))
+		report = audit_requirements(
+				client,
+				["requests==2.25.0", "Requests==2.25", ("urllib3", "1.26.0"), "idna==3.0", "missing==1.0"],
+				)
+
+	assert isinstance(report, AuditReport)
+	assert sorted(index.requested) == ["idna/3.0", "missing/1.0", "requests/2.25.0", "urllib3/1.26.0"]
+	assert len(report) == 4
+	assert [result.project for result in report] == ["idna", "missing", "requests", "urllib3"]
+
+	requests_result = report.results[2]
+	assert isinstance(requests_result, AuditResult)
+	assert requests_result.version == "2.25.0"
+	assert requests_result.last_serial == 42
+	assert requests_result.vulnerable
+	assert [vuln["id"] for vuln in requests_result.vulnerabilities] == ["PYSEC-1"]
+
+	assert [result.project for result in report.vulnerable] == ["requests", "urllib3"]
+	assert [result.project for result in report.errors] == ["missing"]
+	assert isinstance(report.errors[0].error, InvalidRequirement)
+
+	assert list(report.vulnerabilities()) == ["PYSEC-1"]
+	assert report.affected() == {"PYSEC-1": [("requests", "2.25.0"), ("urllib3", "1.26.0")]}
+	assert list(report.to_dict()) == ["requests==2.25.0", "urllib3==1.26.0"]
+	assert repr(report) == "<AuditReport(4 pins, 2 vulnerable, 1 errors)>"
+
+	with pytest.raises(ValueError, match="is not pinned"):
+		audit_requirements(client, ["requests"])
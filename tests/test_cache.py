@@ -0,0 +1,218 @@
+# stdlib
+import json
+import os
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+from packaging.requirements import InvalidRequirement
+from packaging.version import Version
+
+# this package
+from pypi_json import LazyProjectMetadata, ProjectMetadata, PyPIJSON
+from pypi_json.cache import CacheEntry, CacheInfo, DiskCache, MemoryCache
+from tests.utils import FakeAdapter, make_response
+
+DOCUMENT = json.dumps({
+		"info": {"name": "OctoCheese", "version": "0.7.0"},
+		"last_serial": 1234,
+		"releases": {"0.7.0": []},
+		"urls": [],
+		}).encode("UTF-8")
+
+
+def etag_handler(request: requests.PreparedRequest) -> requests.Response:
+	if request.url == "https://pypi.org/pypi/FizzBuzz/json/":
+		return make_response(404)
+	if request.headers.get("If-None-Match") == '"abc"':
+		return make_response(304, headers={"ETag": '"abc"'})
+	return make_response(200, DOCUMENT, {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+def test_disk_cache(tmp_pathplus: PathPlus):
+	cache = DiskCache(tmp_pathplus / "cache", max_size=25)
+	assert repr(cache) == f"<DiskCache({os.fspath(tmp_pathplus / 'cache')!r}, max_size=25)>"
+	assert cache.get("https://example.com/a") is None
+	assert cache.read("https://example.com/a") is None
+	assert cache.size == 0
+
+	cache.set("https://example.com/a", b"0123456789", etag='"a"', last_serial=1)
+	entry = cache.get("https://example.com/a")
+	assert entry is not None
+	assert entry == CacheEntry("https://example.com/a", '"a"', None, 1, 10)
+	assert entry.conditional_headers() == {"If-None-Match": '"a"'}
+	assert cache.read("https://example.com/a") == b"0123456789"
+	assert cache.size == 10
+
+	# Mark 'a' as older than 'b'
+	os.utime(cache._paths("https://example.com/a")[0], (0, 0))
+
+	cache.set("https://example.com/b", b"0123456789", last_modified="yesterday")
+	entry = cache.get("https://example.com/b")
+	assert entry is not None
+	assert entry.conditional_headers() == {"If-Modified-Since": "yesterday"}
+	assert cache.size == 20
+
+	# Exceeds the maximum size, so 'a' is evicted
+	cache.set("https://example.com/c", b"0123456789")
+	assert cache.get("https://example.com/a") is None
+	assert cache.get("https://example.com/b") is not None
+	assert cache.get("https://example.com/c") is not None
+	assert cache.size == 20
+
+	# Too large to store
+	cache.set("https://example.com/d", b"0" * 26)
+	assert cache.get("https://example.com/d") is None
+
+	cache.delete("https://example.com/b")
+	assert cache.get("https://example.com/b") is None
+	assert cache.size == 10
+
+	cache.clear()
+	assert cache.get("https://example.com/c") is None
+	assert cache.size == 0
+
+	# Size is recalculated from the directory contents
+	DiskCache(tmp_pathplus / "cache").set("https://example.com/a", b"0123")
+	assert DiskCache(tmp_pathplus / "cache").size == 4
+
+	with pytest.raises(ValueError, match="'max_size' cannot be negative"):
+		DiskCache(tmp_pathplus / "cache", max_size=-1)
+
+
+def test_conditional_requests(tmp_pathplus: PathPlus):
+	cache = DiskCache(tmp_pathplus)
+	adapter = FakeAdapter(etag_handler)
+
+	with PyPIJSON(disk_cache=cache) as client:
+		client.endpoint.session.mount("https://", adapter)
+
+		metadata = client.get_metadata("OctoCheese")
+		assert metadata.version == Version("0.7.0")
+		assert "If-None-Match" not in adapter.requests[-1].headers
+
+		entry = cache.get("https://pypi.org/pypi/OctoCheese/json/")
+		assert entry == CacheEntry(
+				"https://pypi.org/pypi/OctoCheese/json/",
+				'"abc"',
+				"Mon, 01 Jan 2024 00:00:00 GMT",
+				1234,
+				len(DOCUMENT),
+				)
+
+		assert client.get_metadata("OctoCheese") == metadata
+		assert adapter.requests[-1].headers["If-None-Match"] == '"abc"'
+		assert adapter.requests[-1].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+		# The entry is missing, so the document is downloaded again
+		os.unlink(cache._paths("https://pypi.org/pypi/OctoCheese/json/")[0])
+		os.unlink(cache._paths("https://pypi.org/pypi/OctoCheese/json/")[1])
+		assert client.get_metadata("OctoCheese") == metadata
+		assert "If-None-Match" not in adapter.requests[-1].headers
+
+		with pytest.raises(InvalidRequirement, match="No such project 'FizzBuzz'"):
+			client.get_metadata("FizzBuzz")
+
+		assert cache.get("https://pypi.org/pypi/FizzBuzz/json/") is None
+
+
+def test_memory_cache(monkeypatch):
+	now = [1000.0]
+	monkeypatch.setattr("time.monotonic", lambda: now[0])
+
+	cache = MemoryCache(maxsize=2, ttl=60)
+	assert repr(cache) == "<MemoryCache(maxsize=2, ttl=60)>"
+	assert cache.get("Foo_Bar") is None
+	assert cache.cache_info() == CacheInfo(0, 1, 2, 0)
+
+	cache.set("Foo_Bar", None, "latest")  # type: ignore[arg-type]
+	cache.set("foo-bar", "1.0", "one")  # type: ignore[arg-type]
+	assert cache.get("foo.bar") == "latest"
+	assert cache.get("FOO-BAR", Version("1.0")) == "one"
+	assert cache.cache_info() == CacheInfo(2, 1, 2, 2)
+
+	# 'latest' is the least recently used, so is discarded
+	cache.get("foo-bar", "1.0")
+	cache.set("spam", None, "spam")  # type: ignore[arg-type]
+	assert len(cache) == 2
+	assert cache.get("foo-bar") is None
+	assert cache.get("foo-bar", "1.0") == "one"
+
+	# Expiry
+	now[0] += 61
+	assert cache.get("foo-bar", "1.0") is None
+	assert cache.get("spam") is None
+	assert len(cache) == 0
+
+	cache.set("foo-bar", None, "latest")  # type: ignore[arg-type]
+	cache.set("foo-bar", "1.0", "one")  # type: ignore[arg-type]
+	cache.invalidate("Foo-Bar", "1.0")
+	assert cache.get("foo-bar", "1.0") is None
+	assert cache.get("foo-bar") == "latest"
+
+	cache.set("foo-bar", "1.0", "one")  # type: ignore[arg-type]
+	cache.invalidate("Foo-Bar")
+	assert len(cache) == 0
+
+	cache.set("foo-bar", "1.0", "one")  # type: ignore[arg-type]
+	cache.invalidate()
+	assert len(cache) == 0
+
+	cache.clear()
+	assert cache.cache_info() == CacheInfo(0, 0, 2, 0)
+
+	with pytest.raises(ValueError, match="'maxsize' must be at least 1"):
+		MemoryCache(maxsize=0)
+
+
+def test_memory_cache_client():
+	cache = MemoryCache(ttl=None)
+	adapter = FakeAdapter(etag_handler)
+
+	with PyPIJSON(memory_cache=cache) as client:
+		client.endpoint.session.mount("https://", adapter)
+
+		metadata = client.get_metadata("OctoCheese")
+		assert client.get_metadata("octocheese") is metadata
+		assert len(adapter.requests) == 1
+		assert cache.cache_info() == CacheInfo(1, 1, 1024, 1)
+
+		cache.invalidate("octocheese")
+		assert client.get_metadata("OctoCheese") == metadata
+		assert len(adapter.requests) == 2
+
+		with pytest.raises(InvalidRequirement, match="No such project 'FizzBuzz'"):
+			client.get_metadata("FizzBuzz")
+
+		assert cache.get("FizzBuzz") is None
+
+
+def test_memory_cache_lazy():
+	cache = MemoryCache(ttl=None)
+	adapter = FakeAdapter(etag_handler)
+
+	with PyPIJSON(memory_cache=cache) as client:
+		client.endpoint.session.mount("https://", adapter)
+
+		lazy = client.get_metadata("OctoCheese", lazy=True)
+		assert isinstance(lazy, LazyProjectMetadata)
+		assert client.get_metadata("OctoCheese", lazy=True) is lazy
+
+		# A regular call never returns the lazy object, which holds the raw response
+		metadata = client.get_metadata("OctoCheese")
+		assert type(metadata) is ProjectMetadata
+		assert metadata == lazy
+		assert client.get_metadata("OctoCheese") is metadata
+		assert client.get_metadata("OctoCheese", lazy=True) is lazy
+		assert len(adapter.requests) == 2
+
+		cache.invalidate("OctoCheese", "0.7.0")
+		assert len(cache) == 2
+		cache.invalidate("OctoCheese")
+		assert len(cache) == 0
+
+		client.get_metadata("OctoCheese", "0.7.0")
+		client.get_metadata("OctoCheese", "0.7.0", lazy=True)
+		cache.invalidate("OctoCheese", "0.7.0")
+		assert len(cache) == 0
@@ -0,0 +1,90 @@
+# 3rd party
+import pytest
+from betamax import Betamax  # type: ignore[import]
+from packaging.version import Version
+
+# this package
+from pypi_json import ProjectMetadata, PyPIJSON
+from pypi_json.compact import CompactFile, CompactProjectMetadata
+
+FILE = {
+		"comment_text": '',
+		"digests": {
+				"md5": "c2b4c5d9e1e6dba8f2c1f3c4a1c0b7f0",
+				"sha256": "1f0d7a3a8e0a9d6d1f7a2e5a6ff2c1b3b9d0d8a5b1c6e4f7a2d3c4b5a6e7f8d9",
+				},
+		"downloads": -1,
+		"filename": "octocheese-0.7.0-py3-none-any.whl",
+		"has_sig": False,
+		"md5_digest": "c2b4c5d9e1e6dba8f2c1f3c4a1c0b7f0",
+		"packagetype": "bdist_wheel",
+		"python_version": "py3",
+		"requires_python": ">=3.6.1",
+		"size": 12345,
+		"upload_time": "2021-01-01T12:00:00",
+		"upload_time_iso_8601": "2021-01-01T12:00:00.000000Z",
+		"url": "https://files.pythonhosted.org/packages/octocheese-0.7.0-py3-none-any.whl",
+		"yanked": False,
+		"yanked_reason": None,
+		}
+
+
+def test_compact_file():
+	file = CompactFile.from_dict(FILE)  # type: ignore[arg-type]
+
+	assert file.filename == "octocheese-0.7.0-py3-none-any.whl"
+	assert file.url == FILE["url"]
+	assert file.sha256 == FILE["digests"]["sha256"]  # type: ignore[index]
+	assert len(file.digest) == 32
+	assert file.size == 12345
+	assert file.upload_time == "2021-01-01T12:00:00.000000Z"
+	assert not file.yanked
+	assert repr(file) == "<CompactFile('octocheese-0.7.0-py3-none-any.whl')>"
+
+	assert not hasattr(file, "__dict__")
+	assert not hasattr(file, "md5_digest")
+
+	as_dict = file.to_dict()
+	assert set(as_dict) == set(FILE) - {"comment_text", "downloads", "has_sig", "md5_digest", "upload_time"}
+	assert as_dict["digests"] == {"sha256": FILE["digests"]["sha256"]}  # type: ignore[index]
+	assert CompactFile.from_dict(as_dict) == file  # type: ignore[arg-type]
+
+
+def test_compact_file_interning():
+	first = CompactFile.from_dict(FILE)  # type: ignore[arg-type]
+	second = CompactFile.from_dict({**FILE, "packagetype": "".join(["bdist_", "wheel"])})  # type: ignore[arg-type]
+
+	assert first.packagetype is second.packagetype
+	assert first.python_version is second.python_version
+	assert first.requires_python is second.requires_python
+
+
+def test_from_metadata():
+	with PyPIJSON() as client, Betamax(client.endpoint.session) as vcr:
+		vcr.use_cassette("test_api", record="none")
+		metadata = client.get_metadata("OctoCheese")
+
+	compact = CompactProjectMetadata.from_metadata(metadata)
+
+	assert compact.name == "octocheese"
+	assert compact.version == Version("0.7.0")
+	assert compact.last_serial == metadata.last_serial
+	assert compact.info is metadata.info
+	assert compact.get_latest_version() == metadata.get_latest_version()
+	assert compact.version_index is compact.version_index
+	assert compact.version_index.versions == metadata.version_index.versions
+	assert compact.version_index.is_yanked(compact.get_latest_version()) is False
+	assert compact.get_releases() == metadata.get_releases()
+	assert [file.filename for file in compact.urls] == [file["filename"] for file in metadata.urls]
+	assert repr(compact) == f"<CompactProjectMetadata('octocheese', last_serial={metadata.last_serial})>"
+
+
+def test_from_metadata_version():
+	metadata = ProjectMetadata(info={"name": "OctoCheese", "version": "0.7.0"}, last_serial=1234)  # type: ignore[typeddict-item]
+	compact = CompactProjectMetadata.from_metadata(metadata)
+
+	assert compact.releases is None
+	assert compact.urls == ()
+
+	with pytest.raises(ValueError, match="The metadata does not include any releases."):
+		compact.get_latest_version()
@@ -0,0 +1,208 @@
+# stdlib
+import hashlib
+import io
+import os
+import re
+import zipfile
+from typing import Optional
+
+# 3rd party
+import pytest
+import requests
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.core_metadata import HTTPRangeFile, get_core_metadata, read_wheel_metadata
+from pypi_json.download import DigestMismatchError
+from pypi_json.typehints import DistributionPackageDict
+from tests.utils import FakeAdapter, make_response
+
+METADATA = b"""\
+Metadata-Version: 2.1
+Name: example
+Version: 1.0.0
+Requires-Dist: idna>=2.5
+Requires-Dist: pytest; extra == "testing"
+
+An example project.
+"""
+METADATA_SHA256 = hashlib.sha256(METADATA).hexdigest()
+URL = "https://files.pythonhosted.org/packages/ab/cd/example-1.0.0-py3-none-any.whl"
+SDIST_URL = "https://files.pythonhosted.org/packages/ab/cd/example-1.0.0.tar.gz"
+
+
+def make_wheel() -> bytes:
+	buf = io.BytesIO()
+	with zipfile.ZipFile(buf, 'w') as zf:
+		# A large, incompressible member, which should never be fetched.
+		zf.writestr("example/data.bin", os.urandom(2 * 1024 * 1024))
+		zf.writestr("example/__init__.py", b"__version__ = '1.0.0'\n")
+		zf.writestr("example-1.0.0.dist-info/METADATA", METADATA)
+		zf.writestr("example-1.0.0.dist-info/WHEEL", b"Wheel-Version: 1.0\n")
+	return buf.getvalue()
+
+
+WHEEL = make_wheel()
+
+
+def range_handler(sidecar: Optional[bytes] = None, ranges: bool = True):  # noqa: MAN002
+
+	def handler(request: requests.PreparedRequest) -> requests.Response:
+		if request.url == URL + ".metadata" and sidecar is not None:
+			return make_response(200, sidecar)
+		if request.url != URL:
+			return make_response(404)
+
+		range_header = request.headers.get("Range")
+		if range_header is None or not ranges:
+			return make_response(200, WHEEL)
+
+		match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header)
+		assert match is not None
+		if match.group(1):
+			start = int(match.group(1))
+			end = min(int(match.group(2)), len(WHEEL) - 1) if match.group(2) else len(WHEEL) - 1
+		else:
+			start, end = max(len(WHEEL) - int(match.group(2)), 0), len(WHEEL) - 1
+
+		return make_response(
+				206,
+				WHEEL[start:end + 1],
+				headers={"Content-Range": f"bytes {start}-{end}/{len(WHEEL)}"},
+				)
+
+	return handler
+
+
+def make_file(**kwargs) -> DistributionPackageDict:  # noqa: MAN003
+	file = {
+			"url": URL,
+			"filename": "example-1.0.0-py3-none-any.whl",
+			"digests": {"sha256": hashlib.sha256(WHEEL).hexdigest()},
+			"size": len(WHEEL),
+			}
+	file.update(kwargs)
+	return file  # type: ignore[return-value]
+
+
+@pytest.fixture()
+def client():  # noqa: MAN002
+	with PyPIJSON() as client:
+		yield client
+
+
+def test_http_range_file():
+	adapter = FakeAdapter(range_handler())
+	session = requests.Session()
+	session.mount("https://", adapter)
+
+	with HTTPRangeFile(session, URL, block_size=1000) as fp:
+		assert fp.size == len(WHEEL)
+		assert fp.requests_made == 1
+
+		assert fp.read(10) == WHEEL[:10]
+		fp.seek(-20, io.SEEK_END)
+		assert fp.read() == WHEEL[-20:]
+		assert fp.read() == b''
+		fp.seek(2500)
+		assert fp.read(3000) == WHEEL[2500:5500]
+		assert fp.tell() == 5500
+
+		# Only the block which was not already read is fetched
+		fp.seek(0)
+		assert fp.read(5000) == WHEEL[:5000]
+		assert fp.requests_made == 4
+		assert fp.bytes_received == 7000
+
+		with pytest.raises(ValueError, match="Negative seek position -1"):
+			fp.seek(-1)
+
+	assert [r.headers["Range"] for r in adapter.requests] == [
+			"bytes=-1000",
+			"bytes=0-999",
+			"bytes=2000-5999",
+			"bytes=1000-1999",
+			]
+
+	with pytest.raises(ValueError, match="'block_size' must be at least 1"):
+		HTTPRangeFile(session, URL, block_size=0)
+
+
+def test_http_range_file_no_ranges():
+	adapter = FakeAdapter(range_handler(ranges=False))
+	session = requests.Session()
+	session.mount("https://", adapter)
+
+	with HTTPRangeFile(session, URL, block_size=1000) as fp:
+		assert read_wheel_metadata(fp) == METADATA
+		assert fp.requests_made == 1
+		assert fp.bytes_received == len(WHEEL)
+
+
+def test_get_core_metadata_range(client: PyPIJSON):
+	adapter = FakeAdapter(range_handler())
+	client.endpoint.session.mount("https://", adapter)
+
+	metadata = client.get_core_metadata(make_file())
+	assert metadata["Name"] == "example"
+	assert metadata.get_all("Requires-Dist") == ["idna>=2.5", 'pytest; extra == "testing"']
+
+	# The sidecar was missing, then a few small ranges were read.
+	assert adapter.requests[0].url == URL + ".metadata"
+	assert all("Range" in r.headers for r in adapter.requests[1:])
+	assert len(adapter.requests) <= 4
+
+	# Without a known size the tail of the file is read first
+	adapter.requests.clear()
+	assert client.get_core_metadata(URL, sidecar=False)["Version"] == "1.0.0"
+	assert adapter.requests[0].headers["Range"] == "bytes=-65536"
+	assert len(adapter.requests) <= 3
+
+
+def test_get_core_metadata_sidecar(client: PyPIJSON):
+	adapter = FakeAdapter(range_handler(sidecar=METADATA))
+	client.endpoint.session.mount("https://", adapter)
+
+	file = make_file(**{"core-metadata": {"sha256": METADATA_SHA256}})
+	assert client.get_core_metadata(file)["Name"] == "example"
+	assert [r.url for r in adapter.requests] == [URL + ".metadata"]
+
+	# Advertised as absent, so not requested
+	adapter.requests.clear()
+	assert client.get_core_metadata(make_file(**{"data-dist-info-metadata": False}))["Name"] == "example"
+	assert URL + ".metadata" not in [r.url for r in adapter.requests]
+
+	with pytest.raises(DigestMismatchError, match=f"expected 0000, got {METADATA_SHA256}"):
+		client.get_core_metadata(make_file(**{"dist-info-metadata": {"sha256": "0000"}}))
+
+	# Advertised but missing
+	client.endpoint.session.mount("https://", FakeAdapter(range_handler()))
+	with pytest.raises(requests.HTTPError):
+		client.get_core_metadata(make_file(**{"core-metadata": True}))
+
+
+def test_get_core_metadata_sdist():
+	session = requests.Session()
+	session.mount("https://", FakeAdapter(range_handler(sidecar=METADATA)))
+
+	with pytest.raises(ValueError, match="Cannot read the metadata of 'example-1.0.0.tar.gz' as it is not a wheel"):
+		get_core_metadata(session, SDIST_URL)
+
+	session.mount("https://", FakeAdapter(lambda request: make_response(200, METADATA)))
+	assert get_core_metadata(session, SDIST_URL)["Name"] == "example"
+
+
+def test_read_wheel_metadata():
+	buf = io.BytesIO()
+	with zipfile.ZipFile(buf, 'w') as zf:
+		zf.writestr("vendored-2.0.dist-info/METADATA", b"Name: vendored\n")
+		zf.writestr("example-1.0.0.dist-info/METADATA", METADATA)
+
+	assert read_wheel_metadata(buf, "example-1.0.0-py3-none-any.whl") == METADATA
+
+	buf = io.BytesIO()
+	with zipfile.ZipFile(buf, 'w') as zf:
+		zf.writestr("example/__init__.py", b'')
+
+	with pytest.raises(ValueError, match="No .dist-info/METADATA file found in the wheel"):
+		read_wheel_metadata(buf)
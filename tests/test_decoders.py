@@ -0,0 +1,48 @@
+# stdlib
+import json
+from typing import Any, List
+
+# 3rd party
+import pytest
+from betamax import Betamax  # type: ignore[import]
+from packaging.version import Version
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.decoders import available_decoders, get_decoder, stdlib_decoder
+
+DOCUMENT = b'{"info": {"name": "OctoCheese", "version": "0.7.0"}, "last_serial": 1234, "releases": {"0.7.0": []}}'
+
+
+def test_available_decoders():
+	decoders = available_decoders()
+	assert list(decoders)[-1] == "json"
+	assert decoders["json"] is stdlib_decoder
+
+	for decoder in decoders.values():
+		assert decoder(DOCUMENT) == json.loads(DOCUMENT)
+
+
+def test_get_decoder():
+	assert get_decoder() is next(iter(available_decoders().values()))
+	assert get_decoder("json") is stdlib_decoder
+
+	with pytest.raises(ValueError, match="Unknown or unavailable JSON decoder 'simplejson'"):
+		get_decoder("simplejson")
+
+
+def test_custom_decoder():
+	calls: List[bytes] = []
+
+	def decoder(content: bytes) -> Any:
+		calls.append(content)
+		return json.loads(content)
+
+	with PyPIJSON(json_decoder=decoder) as client, Betamax(client.endpoint.session) as vcr:
+		assert client.json_decoder is decoder
+		vcr.use_cassette("test_api", record="none")
+
+		assert client.get_metadata("OctoCheese").version == Version("0.7.0")
+		assert len(calls) == 1
+
+	assert PyPIJSON().json_decoder is get_decoder()
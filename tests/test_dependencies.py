@@ -0,0 +1,155 @@
+# stdlib
+import json
+from typing import Dict, List, Optional
+
+# 3rd party
+import pytest
+import requests
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.version import Version
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.dependencies import DependencyNode, crawl_dependencies, evaluate_requirements
+from tests.utils import FakeAdapter, make_response
+
+# project -> version -> requires_dist
+PROJECTS: Dict[str, Dict[str, List[str]]] = {
+		"app": {"1.0": ["web>=2", "cli; extra == 'cli'", "winonly; sys_platform == 'win32'"]},
+		"web": {"1.0": [], "2.0": ["http", "json-lib>=1,<2"], "3.0": ["http", "json-lib>=1,<2"]},
+		"http": {"1.0": ["idna"]},
+		"json-lib": {"1.0": [], "1.5": ["idna"], "2.0": []},
+		"idna": {"3.0": []},
+		"cli": {"1.0": ["web", "colour[extra]"]},
+		"colour": {"1.0": ["fancy; extra == 'extra'"]},
+		"fancy": {"1.0": []},
+		"winonly": {"1.0": []},
+		"legacy": {"1.0": ["idna", "not a valid ;; req", "fancy; undefined_marker == '1'"]},
+		}
+
+
+class Index:
+
+	def __init__(self):
+		self.requested: List[str] = []
+
+	def __call__(self, request: requests.PreparedRequest) -> requests.Response:
+		assert request.url is not None
+		path = request.url[len("https://pypi.org/pypi/"):].rstrip('/').split('/')
+		self.requested.append('/'.join(path[:-1]))
+
+		releases = PROJECTS.get(path[0])
+		if releases is None:
+			return make_response(404)
+
+		version: Optional[str] = path[1] if len(path) == 3 else max(releases, key=Version)
+		if version not in releases:
+			return make_response(404)
+
+		document = {
+				"info": {"name": path[0], "version": version, "requires_dist": releases[version] or None},
+				"last_serial": 1,
+				"urls": [],
+				}
+
+		if len(path) == 2:
+			document["releases"] = {release: [] for release in releases}
+
+		return make_response(200, json.dumps(document).encode("UTF-8"))
+
+
+def test_evaluate_requirements():
+	requires_dist = ["a", "b; extra == 'test'", "c; python_version < '3'", "d; sys_platform == 'win32'"]
+
+	assert [r.name for r in evaluate_requirements(requires_dist)] == ['a']
+	assert [r.name for r in evaluate_requirements(requires_dist, ["Test"])] == ['a', 'b']
+	assert [r.name for r in evaluate_requirements(requires_dist, environment={"sys_platform": "win32"})] == ['a', 'd']
+	assert evaluate_requirements([Requirement('e')]) == [Requirement('e')]
+
+
+def test_crawl_dependencies():
+	index = Index()
+
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(index))
+		graph = crawl_dependencies(client, ["app[cli]", "missing"], environment={"sys_platform": "linux"})
+
+	assert graph.roots == ["app", "missing"]
+	assert isinstance(graph.errors["missing"], InvalidRequirement)
+	assert set(graph) == {"app", "web", "http", "json-lib", "idna", "cli", "colour", "fancy"}
+	assert "JSON_Lib" in graph
+	assert "winonly" not in graph
+
+	assert graph.to_dict()["app"] == ["web", "cli"]
+	assert ("colour", "fancy") in set(graph.edges())
+
+	pins = graph.pins()
+	assert pins["web"] == Version("3.0")
+	assert pins["json-lib"] == Version("1.5")
+
+	assert graph["app"].depth == 0
+	assert graph["web"].depth == 1
+	assert graph["idna"].depth == 3
+	assert graph["fancy"].depth == 3
+	assert graph["colour"].extras == {"extra"}
+
+	# Each project is fetched once, plus a per-version request for json-lib which doesn't want the latest release.
+	assert sorted(index.requested) == sorted([*PROJECTS.keys() - {"winonly", "legacy"}, "missing", "json-lib/1.5"])
+
+	assert repr(graph) == "<DependencyGraph(8 nodes, 1 errors)>"
+	assert repr(graph["web"]) == "<DependencyNode('web', version='3.0', depth=1)>"
+
+
+def test_crawl_dependencies_specifiers():
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(Index()))
+
+		graph = crawl_dependencies(client, ["web<3", "web!=2.0"])
+		assert graph.pins() == {"web": Version("1.0")}
+		assert graph["web"].requirements == []
+
+		graph = crawl_dependencies(client, ["web>5"])
+		assert not graph
+		assert str(graph.errors["web"]) == "No versions of 'web' match '>5'"
+
+
+@pytest.mark.parametrize("max_depth, expected", [(0, {"app"}), (1, {"app", "web"})])
+def test_crawl_dependencies_max_depth(max_depth: int, expected: set):
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(Index()))
+		graph = crawl_dependencies(client, ["app"], max_depth=max_depth)
+
+	assert set(graph) == expected
+
+	# Requirements are still recorded for projects at the maximum depth
+	assert isinstance(graph["app"], DependencyNode)
+	assert graph["app"].dependencies == ["web"]
+
+
+def test_crawl_dependencies_invalid_requires_dist():
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(Index()))
+		graph = crawl_dependencies(client, ["legacy"])
+
+	assert set(graph) == {"legacy", "idna"}
+	assert not graph.errors
+
+	invalid = graph["legacy"].invalid_requirements
+	assert list(invalid) == ["not a valid ;; req", "fancy; undefined_marker == '1'"]
+	assert isinstance(invalid["not a valid ;; req"], InvalidRequirement)
+
+
+def test_crawl_dependencies_root_markers():
+	index = Index()
+
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(index))
+
+		requirements = ["idna", "winonly; sys_platform == 'win32'"]
+		graph = crawl_dependencies(client, requirements, environment={"sys_platform": "linux"})
+		assert graph.roots == ["idna"]
+		assert set(graph) == {"idna"}
+		assert index.requested == ["idna"]
+
+		graph = crawl_dependencies(client, requirements, environment={"sys_platform": "win32"})
+		assert graph.roots == ["idna", "winonly"]
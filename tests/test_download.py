@@ -0,0 +1,311 @@
+# stdlib
+import hashlib
+import io
+import os
+import threading
+from typing import List, Optional, Tuple
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.download import DigestMismatchError, DownloadResult, FileSpec, file_matches
+from pypi_json.typehints import DistributionPackageDict
+from tests.utils import FakeAdapter, make_response
+
+CONTENT = b"0123456789" * 1000
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+URL = "https://files.pythonhosted.org/packages/ab/cd/example-1.0.0.tar.gz"
+
+
+def file_handler(request: requests.PreparedRequest) -> requests.Response:
+	if request.url == URL:
+		return make_response(200, CONTENT)
+	return make_response(404)
+
+
+def make_file(**kwargs) -> DistributionPackageDict:  # noqa: MAN003
+	file = {
+			"url": URL,
+			"filename": "example-1.0.0.tar.gz",
+			"digests": {"sha256": SHA256},
+			"size": len(CONTENT),
+			}
+	file.update(kwargs)
+	return file  # type: ignore[return-value]
+
+
+@pytest.fixture()
+def client():  # noqa: MAN002
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(file_handler))
+		yield client
+
+
+def test_file_spec():
+	spec = FileSpec(URL, "example-1.0.0.tar.gz", SHA256, len(CONTENT))
+	assert FileSpec.from_file(URL) == FileSpec(URL, "example-1.0.0.tar.gz")
+	assert FileSpec.from_file(make_file()) == spec
+	assert FileSpec.from_file({"url": URL, "digest": SHA256}) == FileSpec(URL, "example-1.0.0.tar.gz", SHA256)
+	assert FileSpec.from_file(spec) is spec
+
+	# Encoded separators cannot escape the destination directory
+	assert FileSpec.from_file("https://e.com/p/..%2F..%2Fevil.whl").filename == "evil.whl"
+	assert FileSpec.from_file("https://e.com/p/foo%201.0.tar.gz").filename == "foo 1.0.tar.gz"
+
+	with pytest.raises(ValueError, match=r"Unsafe filename '\.\.'"):
+		FileSpec.from_file("https://e.com/p/%2E%2E")
+
+	for filename in ["../../evil.whl", "dir/evil.whl", "..", ''] + [os.sep + "evil.whl"]:
+		with pytest.raises(ValueError, match="Unsafe filename"):
+			FileSpec.from_file(make_file(filename=filename))
+
+
+def test_download_unsafe_filename(client: PyPIJSON, tmp_pathplus: PathPlus):
+	spec = FileSpec(URL, "../evil.tar.gz", SHA256)
+
+	(tmp_pathplus / "dl").mkdir()
+	with pytest.raises(ValueError, match="Unsafe filename '../evil.tar.gz'"):
+		client.download_to(spec, tmp_pathplus / "dl")
+
+	result = next(client.download_files([spec], tmp_pathplus / "dl"))
+	assert isinstance(result.error, ValueError)
+	assert not (tmp_pathplus / "evil.tar.gz").exists()
+
+
+def test_download_files_unsafe_entry(client: PyPIJSON, tmp_pathplus: PathPlus):
+	# One bad entry is reported as a failed result, without aborting the rest of the batch
+	files = [make_file(), make_file(filename="../evil.tar.gz"), URL.replace("example-1.0.0", "example-1.0.1")]
+
+	def handler(request: requests.PreparedRequest) -> requests.Response:
+		return make_response(200, CONTENT)
+
+	client.endpoint.session.mount("https://", FakeAdapter(handler))
+
+	results = {result.file.filename: result for result in client.download_files(files, tmp_pathplus / "dl")}
+	assert set(results) == {"example-1.0.0.tar.gz", "../evil.tar.gz", "example-1.0.1.tar.gz"}
+
+	assert results["example-1.0.0.tar.gz"].error is None
+	assert results["example-1.0.1.tar.gz"].error is None
+
+	error = results["../evil.tar.gz"].error
+	assert isinstance(error, ValueError)
+	assert str(error) == "Unsafe filename '../evil.tar.gz'"
+	assert results["../evil.tar.gz"].path == ''
+	assert not (tmp_pathplus / "evil.tar.gz").exists()
+
+
+def test_download_to(client: PyPIJSON, tmp_pathplus: PathPlus):
+	assert client.download_to(make_file(), tmp_pathplus, chunk_size=1024) == SHA256
+	assert (tmp_pathplus / "example-1.0.0.tar.gz").read_bytes() == CONTENT
+	assert not (tmp_pathplus / "example-1.0.0.tar.gz.part").exists()
+
+	assert client.download_to(URL, tmp_pathplus / "renamed.tar.gz") == SHA256
+	assert (tmp_pathplus / "renamed.tar.gz").read_bytes() == CONTENT
+
+	buf = io.BytesIO()
+	assert client.download_to(URL, buf, sha256=SHA256.upper()) == SHA256
+	assert buf.getvalue() == CONTENT
+
+
+def test_download_to_mismatch(client: PyPIJSON, tmp_pathplus: PathPlus):
+	with pytest.raises(DigestMismatchError, match=f"sha256 digest mismatch for {URL}: expected 0000, got {SHA256}"):
+		client.download_to(make_file(digests={"sha256": "0000"}), tmp_pathplus)
+
+	assert not list(tmp_pathplus.iterdir())
+
+	# Aborted as soon as too much data is received
+	buf = io.BytesIO()
+	with pytest.raises(DigestMismatchError, match=f"Expected 1000 bytes from {URL}, got 1024"):
+		client.download_to(make_file(size=1000), buf, chunk_size=1024)
+
+	assert len(buf.getvalue()) == 0
+
+	with pytest.raises(DigestMismatchError, match=f"Expected 20000 bytes from {URL}, got 10000") as e:
+		client.download_to(make_file(size=20000), buf)
+
+	assert e.value.expected == 20000
+	assert e.value.actual == 10000
+
+	with pytest.raises(requests.HTTPError):
+		client.download_to(URL + ".missing", tmp_pathplus)
+
+	assert not list(tmp_pathplus.iterdir())
+
+
+def test_download_files(client: PyPIJSON, tmp_pathplus: PathPlus):
+	files = [
+			make_file(),
+			{"url": URL.replace("example-1.0.0", "example-1.0.1"), "digest": SHA256},
+			make_file(url=URL + ".missing", filename="missing.tar.gz"),
+			]
+
+	lock = threading.Lock()
+	progress: List[Tuple[str, int, Optional[int]]] = []
+
+	def callback(file: FileSpec, received: int, size: Optional[int]) -> None:
+		with lock:
+			progress.append((file.filename, received, size))
+
+	def handler(request: requests.PreparedRequest) -> requests.Response:
+		if request.url in {URL, URL.replace("example-1.0.0", "example-1.0.1")}:
+			return make_response(200, CONTENT)
+		return make_response(404)
+
+	client.endpoint.session.mount("https://", FakeAdapter(handler))
+
+	results = {
+			result.file.filename: result
+			for result in client.download_files(files, tmp_pathplus / "dl", chunk_size=4096, progress=callback)
+			}
+	assert set(results) == {"example-1.0.0.tar.gz", "example-1.0.1.tar.gz", "missing.tar.gz"}
+
+	for filename in ["example-1.0.0.tar.gz", "example-1.0.1.tar.gz"]:
+		result = results[filename]
+		assert result.error is None
+		assert not result.skipped
+		assert result.size == len(CONTENT)
+		assert result.path == str(tmp_pathplus / "dl" / filename)
+		assert file_matches(result.path, SHA256)
+		assert [p[1] for p in progress if p[0] == filename] == [4096, 8192, 10000]
+
+	assert isinstance(results["missing.tar.gz"].error, requests.HTTPError)
+	assert not (tmp_pathplus / "dl" / "missing.tar.gz").exists()
+
+	# Already downloaded, so skipped
+	results = {result.file.filename: result for result in client.download_files(files[:2], tmp_pathplus / "dl")}
+	assert all(result.skipped for result in results.values())
+	assert all(result.size == len(CONTENT) for result in results.values())
+
+	# Modified on disk, so downloaded again
+	(tmp_pathplus / "dl" / "example-1.0.0.tar.gz").write_bytes(b"corrupted")
+	result = next(client.download_files(files[:1], tmp_pathplus / "dl"))
+	assert not result.skipped
+	assert file_matches(result.path, SHA256)
+
+
+def test_download_result():
+	result = DownloadResult(FileSpec(URL, "example-1.0.0.tar.gz"), "example-1.0.0.tar.gz", 1000, 0.5)
+	assert result.throughput == 2000
+	assert DownloadResult(FileSpec(URL, "example-1.0.0.tar.gz"), "example-1.0.0.tar.gz").throughput == 0
+	assert not file_matches("does-not-exist.tar.gz", SHA256)
+
+
+def range_handler(request: requests.PreparedRequest) -> requests.Response:
+	if request.url != URL:
+		return make_response(404)
+
+	range_header = request.headers.get("Range")
+	if range_header is None:
+		return make_response(200, CONTENT)
+
+	start, stop = range_header[len("bytes="):].split('-')
+	end = int(stop) + 1 if stop else len(CONTENT)
+	if int(start) >= len(CONTENT):
+		return make_response(416)
+
+	content_range = f"bytes {start}-{end - 1}/{len(CONTENT)}"
+	return make_response(206, CONTENT[int(start):end], {"Content-Range": content_range})
+
+
+def test_download_resume(client: PyPIJSON, tmp_pathplus: PathPlus):
+	adapter = FakeAdapter(range_handler)
+	client.endpoint.session.mount("https://", adapter)
+	part_file = tmp_pathplus / "example-1.0.0.tar.gz.part"
+
+	part_file.write_bytes(CONTENT[:4000])
+	assert client.download_to(make_file(), tmp_pathplus, resume=True) == SHA256
+	assert adapter.requests[-1].headers["Range"] == "bytes=4000-"
+	assert (tmp_pathplus / "example-1.0.0.tar.gz").read_bytes() == CONTENT
+	assert not part_file.exists()
+
+	# Size not known
+	part_file.write_bytes(CONTENT[:4000])
+	assert client.download_to(URL, tmp_pathplus, resume=True) == SHA256
+	assert adapter.requests[-1].headers["Range"] == "bytes=4000-"
+
+	# Already complete
+	part_file.write_bytes(CONTENT)
+	assert client.download_to(make_file(), tmp_pathplus, resume=True) == SHA256
+	assert len(adapter.requests) == 2
+
+	# Range not satisfiable
+	part_file.write_bytes(CONTENT + b"extra")
+	assert client.download_to(URL, tmp_pathplus, resume=True) == SHA256
+	assert "Range" not in adapter.requests[-1].headers
+
+	# Larger than expected
+	part_file.write_bytes(CONTENT + b"extra")
+	assert client.download_to(make_file(), tmp_pathplus, resume=True) == SHA256
+	assert "Range" not in adapter.requests[-1].headers
+
+	# The partial file doesn't match, so is discarded
+	part_file.write_bytes(b"X" * 4000)
+	with pytest.raises(DigestMismatchError, match="sha256 digest mismatch"):
+		client.download_to(make_file(), tmp_pathplus, resume=True)
+	assert not part_file.exists()
+
+	# Server doesn't support ranges
+	client.endpoint.session.mount("https://", FakeAdapter(file_handler))
+	part_file.write_bytes(CONTENT[:4000])
+	assert client.download_to(make_file(), tmp_pathplus, resume=True) == SHA256
+	assert (tmp_pathplus / "example-1.0.0.tar.gz").read_bytes() == CONTENT
+
+	# The partial file is kept when the download fails
+	client.endpoint.session.mount("https://", FakeAdapter(lambda r: make_response(503)))
+	part_file.write_bytes(CONTENT[:4000])
+	with pytest.raises(requests.HTTPError):
+		client.download_to(make_file(), tmp_pathplus, resume=True)
+	assert part_file.read_bytes() == CONTENT[:4000]
+
+	# ... but not without resume
+	with pytest.raises(requests.HTTPError):
+		client.download_to(make_file(), tmp_pathplus)
+	assert not part_file.exists()
+
+	with pytest.raises(ValueError, match="Resuming and segmented downloads require 'destination' to be a path."):
+		client.download_to(make_file(), io.BytesIO(), resume=True)
+
+
+def test_download_segments(client: PyPIJSON, tmp_pathplus: PathPlus):
+	adapter = FakeAdapter(range_handler)
+	client.endpoint.session.mount("https://", adapter)
+	progress: List[int] = []
+
+	def callback(file: FileSpec, received: int, size: Optional[int]) -> None:
+		progress.append(received)
+
+	assert client.download_to(make_file(), tmp_pathplus, segments=4, chunk_size=1000, progress=callback) == SHA256
+	assert (tmp_pathplus / "example-1.0.0.tar.gz").read_bytes() == CONTENT
+	assert sorted(r.headers["Range"] for r in adapter.requests) == [
+			"bytes=0-2499",
+			"bytes=2500-4999",
+			"bytes=5000-7499",
+			"bytes=7500-9999",
+			]
+	assert max(progress) == len(CONTENT)
+	assert not (tmp_pathplus / "example-1.0.0.tar.gz.part").exists()
+	assert not (tmp_pathplus / "example-1.0.0.tar.gz.part.segments").exists()
+
+	# Resume, with the first two segments already complete
+	adapter.requests.clear()
+	(tmp_pathplus / "example-1.0.0.tar.gz.part").write_bytes(CONTENT[:5000] + b"\0" * 5000)
+	(tmp_pathplus / "example-1.0.0.tar.gz.part.segments").write_text('{"segments": 4, "completed": [0, 1]}')
+	assert client.download_to(make_file(), tmp_pathplus, segments=4, chunk_size=1000, resume=True) == SHA256
+	assert sorted(r.headers["Range"] for r in adapter.requests) == ["bytes=5000-7499", "bytes=7500-9999"]
+
+	# Too small to split
+	adapter.requests.clear()
+	assert client.download_to(make_file(), tmp_pathplus, segments=4) == SHA256
+	assert len(adapter.requests) == 1
+
+	# Server doesn't support ranges
+	client.endpoint.session.mount("https://", FakeAdapter(file_handler))
+	assert client.download_to(make_file(), tmp_pathplus, segments=4, chunk_size=1000) == SHA256
+	assert (tmp_pathplus / "example-1.0.0.tar.gz").read_bytes() == CONTENT
+
+	with pytest.raises(ValueError, match="'segments' must be at least 1"):
+		client.download_to(make_file(), tmp_pathplus, segments=0)
@@ -0,0 +1,200 @@
+# stdlib
+import io
+import json
+import time
+from typing import List
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.tags import Tag
+
+# this package
+import pypi_json.hashes
+from pypi_json import PyPIJSON
+from pypi_json.hashes import (
+		expand_tag,
+		format_requirement,
+		get_hashes,
+		main,
+		parse_tags,
+		select_files,
+		write_hashes
+		)
+from tests.utils import FakeAdapter, make_response
+
+
+def make_file(filename: str) -> dict:
+	return {"filename": filename, "digests": {"sha256": f"sha256-of-{filename}"}}
+
+
+FILES = {
+		"foo/1.0": [
+				make_file("foo-1.0.tar.gz"),
+				make_file("foo-1.0-cp310-cp310-manylinux_2_17_x86_64.manylinux2014_x86_64.whl"),
+				make_file("foo-1.0-cp310-cp310-win_amd64.whl"),
+				make_file("foo-1.0-cp39-cp39-win_amd64.whl"),
+				],
+		"bar/2.0": [make_file("bar-2.0-py2.py3-none-any.whl")],
+		"baz/3.0": [make_file("baz-3.0.tar.gz")],
+		}
+
+
+class Index:
+
+	def __init__(self):
+		self.requested: List[str] = []
+
+	def __call__(self, request: requests.PreparedRequest) -> requests.Response:
+		assert request.url is not None
+		path = '/'.join(request.url[len("https://pypi.org/pypi/"):].rstrip('/').split('/')[:-1])
+		self.requested.append(path)
+
+		if path == "foo/1.0":
+			# Finish last, to check the results are still in order
+			time.sleep(0.05)
+
+		if path not in FILES:
+			return make_response(404)
+
+		document = {"info": {"name": path.split('/')[0]}, "last_serial": 1, "urls": FILES[path]}
+		return make_response(200, json.dumps(document).encode("UTF-8"))
+
+
+@pytest.fixture()
+def client():
+	with PyPIJSON() as client:
+		client.endpoint.session.mount("https://", FakeAdapter(Index()))
+		yield client
+
+
+def test_parse_tags():
+	assert parse_tags(["py2.py3-none-any", Tag("cp310", "cp310", "win_amd64")]) == {
+			Tag("py2", "none", "any"),
+			Tag("py3", "none", "any"),
+			Tag("cp310", "cp310", "win_amd64"),
+			}
+
+
+def test_select_files():
+	files = FILES["foo/1.0"]
+
+	assert select_files(files) == files  # type: ignore[arg-type]
+	assert select_files(files, sdists=False) == files[1:]  # type: ignore[arg-type]
+	assert select_files(files, ["cp310-cp310-win_amd64"]) == [files[0], files[2]]  # type: ignore[arg-type]
+	assert select_files(
+			files,  # type: ignore[arg-type]
+			["cp310-cp310-manylinux2014_x86_64", "cp39-cp39-win_amd64"],
+			sdists=False,
+			) == [files[1], files[3]]
+
+
+def test_expand_tag():
+	tags = list(map(str, expand_tag("cp310-cp310-manylinux_2_17_x86_64")))
+
+	assert tags[:3] == [
+			"cp310-cp310-manylinux_2_17_x86_64",
+			"cp310-cp310-manylinux2014_x86_64",
+			"cp310-cp310-manylinux_2_16_x86_64",
+			]
+	assert len(tags) == len(set(tags))
+	assert {
+			"cp310-cp310-manylinux1_x86_64",
+			"cp310-abi3-manylinux_2_17_x86_64",
+			"cp37-abi3-manylinux2010_x86_64",
+			"py3-none-manylinux_2_5_x86_64",
+			"py3-none-any",
+			"cp310-none-any",
+			} <= set(tags)
+	assert "cp39-cp39-manylinux_2_17_x86_64" not in tags
+	assert "cp310-cp310-manylinux_2_18_x86_64" not in tags
+
+	assert "cp311-cp311-macosx_10_9_universal2" in set(map(str, expand_tag("cp311-cp311-macosx_11_0_arm64")))
+	assert "py3-none-any" in set(map(str, expand_tag("pp310-pypy310_pp73-win_amd64")))
+	assert expand_tag("py2.py3-none-any") == [Tag("py2", "none", "any"), Tag("py3", "none", "any")]
+	assert expand_tag(Tag("cp310", "cp310", "musllinux_1_2_x86_64"))[:3] == [
+			Tag("cp310", "cp310", "musllinux_1_2_x86_64"),
+			Tag("cp310", "cp310", "musllinux_1_1_x86_64"),
+			Tag("cp310", "cp310", "musllinux_1_0_x86_64"),
+			]
+
+
+def test_select_files_compatible():
+	files = [
+			make_file("foo-1.0.tar.gz"),
+			make_file("foo-1.0-py3-none-any.whl"),
+			make_file("foo-1.0-cp38-abi3-manylinux_2_5_x86_64.whl"),
+			make_file("foo-1.0-cp310-cp310-manylinux_2_28_x86_64.whl"),
+			make_file("foo-1.0-cp310-cp310-macosx_10_9_x86_64.whl"),
+			]
+
+	# Pure Python, stable ABI and older manylinux wheels can all be installed on the target platform
+	assert select_files(
+			files,  # type: ignore[arg-type]
+			["cp310-cp310-manylinux_2_17_x86_64"],
+			sdists=False,
+			) == files[1:3]
+
+
+def test_get_hashes(client: PyPIJSON):
+	results = list(get_hashes(client, ["foo==1.0", ("bar", "2.0"), Requirement("missing==1.0")], sdists=False))
+
+	assert [requirement for requirement, _ in results] == ["foo==1.0", ("bar", "2.0"), Requirement("missing==1.0")]
+	assert results[0][1] == sorted(file["digests"]["sha256"] for file in FILES["foo/1.0"][1:])
+	assert results[1][1] == ["sha256-of-bar-2.0-py2.py3-none-any.whl"]
+	assert isinstance(results[2][1], InvalidRequirement)
+
+	with pytest.raises(ValueError, match="is not pinned"):
+		get_hashes(client, ["foo==1.0", "foo>=1.0"])
+
+
+def test_format_requirement():
+	assert format_requirement(Requirement("foo==1.0; python_version >= '3.7'"), ["aaa", "bbb"]) == (
+			'foo==1.0; python_version >= "3.7" \\\n'
+			"    --hash=sha256:aaa \\\n"
+			"    --hash=sha256:bbb"
+			)
+	assert format_requirement(("foo", "1.0"), []) == "foo==1.0"
+
+
+def test_write_hashes(client: PyPIJSON):
+	output = io.StringIO()
+	requirements = ["foo==1.0", "baz==3.0", "missing==1.0"]
+	failures = write_hashes(client, requirements, output, ["cp310-cp310-win_amd64"], sdists=False)
+
+	assert output.getvalue().splitlines() == [
+			"foo==1.0 \\",
+			"    --hash=sha256:sha256-of-foo-1.0-cp310-cp310-win_amd64.whl",
+			"# baz==3.0: No files match the target platforms",
+			"# missing==1.0: No such project/version 'missing' 1.0",
+			]
+	assert [requirement for requirement, _ in failures] == ["baz==3.0", "missing==1.0"]
+
+	# Pure Python wheels are compatible with every platform
+	output = io.StringIO()
+	assert not write_hashes(client, ["bar==2.0"], output, ["cp310-cp310-manylinux_2_17_x86_64"], sdists=False)
+	assert output.getvalue() == "bar==2.0 \\\n    --hash=sha256:sha256-of-bar-2.0-py2.py3-none-any.whl\n"
+
+
+def test_main(tmp_pathplus: PathPlus, client: PyPIJSON, monkeypatch, capsys):
+	monkeypatch.setattr(pypi_json.hashes, "PyPIJSON", lambda endpoint: client)
+	(tmp_pathplus / "requirements.txt").write_lines(["bar==2.0", "./local/pkg", "baz==3.0", "dist/qux-1.0.whl"])
+
+	assert main(["foo==1.0", "-r", str(tmp_pathplus / "requirements.txt"), "--tag", "py3-none-any"]) == 0
+	assert capsys.readouterr().out.splitlines() == [
+			"foo==1.0 \\",
+			"    --hash=sha256:sha256-of-foo-1.0.tar.gz",
+			"bar==2.0 \\",
+			"    --hash=sha256:sha256-of-bar-2.0-py2.py3-none-any.whl",
+			"baz==3.0 \\",
+			"    --hash=sha256:sha256-of-baz-3.0.tar.gz",
+			]
+
+	assert main(["foo==1.0", "missing==1.0", "-o", str(tmp_pathplus / "out.txt")]) == 1
+	output = (tmp_pathplus / "out.txt").read_text().splitlines()
+	assert output[-1] == "# missing==1.0: No such project/version 'missing' 1.0"
+	assert capsys.readouterr().err == (
+			"Failed to find hashes for missing==1.0: No such project/version 'missing' 1.0\n"
+			)
@@ -0,0 +1,129 @@
+# stdlib
+import json
+from typing import List
+
+# 3rd party
+import pytest
+import requests
+from coincidence.params import param
+from domdf_python_tools.paths import PathPlus
+from packaging.requirements import InvalidRequirement
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.cache import DiskCache, MemoryCache
+from pypi_json.metrics import RequestMetrics, get_retry_count
+from pypi_json.store import MetadataStore
+from tests.utils import FakeAdapter, make_response
+
+DOCUMENT = json.dumps({
+		"info": {"name": "foo", "version": "1.0.0"},
+		"last_serial": 1,
+		"releases": {"1.0.0": []},
+		"urls": [],
+		}).encode("UTF-8")
+
+
+def handler(request: requests.PreparedRequest) -> requests.Response:
+	if request.url == "https://pypi.org/pypi/foo/json/":
+		if request.headers.get("If-None-Match") == '"1"':
+			return make_response(304)
+		return make_response(200, DOCUMENT, {"ETag": '"1"'})
+	elif request.url == "https://files.pythonhosted.org/foo-1.0.0.tar.gz":
+		return make_response(200, b"x" * 100)
+	else:
+		return make_response(404)
+
+
+def test_get_metadata():
+	recorded: List[RequestMetrics] = []
+
+	with PyPIJSON(memory_cache=MemoryCache(), metrics_callback=recorded.append) as client:
+		client.endpoint.session.mount("https://", FakeAdapter(handler))
+
+		client.get_metadata("foo")
+		client.get_metadata("foo")
+
+		with pytest.raises(InvalidRequirement):
+			client.get_metadata("bar", "1.0")
+
+	network, memory, error = recorded
+
+	assert network.operation == "get_metadata"
+	assert network.target == "foo"
+	assert network.version is None
+	assert network.source == "network"
+	assert not network.cache_hit
+	assert network.status_code == 200
+	assert network.size == len(DOCUMENT)
+	assert network.retries == 0
+	assert network.decode_time > 0
+	assert network.parse_time > 0
+	assert network.total_time >= network.request_time + network.download_time + network.decode_time
+	assert network.error is None
+
+	assert memory.source == "memory"
+	assert memory.cache_hit
+	assert memory.status_code is None
+	assert memory.decode_time == 0
+
+	assert error.version == "1.0"
+	assert error.status_code == 404
+	assert isinstance(error.error, InvalidRequirement)
+
+
+@pytest.mark.parametrize("lazy", [param(True, id="lazy"), param(False, id="eager")])
+def test_get_metadata_caches(tmp_pathplus: PathPlus, lazy: bool):
+	recorded: List[RequestMetrics] = []
+
+	with PyPIJSON(disk_cache=DiskCache(tmp_pathplus / "cache"), metrics_callback=recorded.append) as client:
+		client.endpoint.session.mount("https://", FakeAdapter(handler))
+		client.get_metadata("foo", lazy=lazy)
+		client.get_metadata("foo", lazy=lazy)
+
+	assert [metrics.source for metrics in recorded] == ["network", "disk_cache"]
+	assert recorded[1].status_code == 304
+	assert recorded[1].size == len(DOCUMENT)
+	assert (recorded[1].decode_time == 0) is lazy
+
+	with MetadataStore(tmp_pathplus / "store.db") as store:
+		store.set("foo", None, DOCUMENT, last_serial=1, etag=None, last_modified=None)
+
+		with PyPIJSON(store=store, metrics_callback=recorded.append) as client:
+			client.get_metadata("foo", lazy=lazy)
+
+	assert recorded[2].source == "store"
+	assert recorded[2].size == len(DOCUMENT)
+	assert recorded[2].status_code is None
+
+
+def test_download_file():
+	recorded: List[RequestMetrics] = []
+
+	with PyPIJSON(metrics_callback=recorded.append) as client:
+		client.endpoint.session.mount("https://", FakeAdapter(handler))
+		response = client.download_file("https://files.pythonhosted.org/foo-1.0.0.tar.gz")
+		assert response.content == b"x" * 100
+
+	metrics, = recorded
+	assert metrics.operation == "download_file"
+	assert metrics.target == "https://files.pythonhosted.org/foo-1.0.0.tar.gz"
+	assert metrics.size == 100
+	assert metrics.status_code == 200
+
+
+def test_no_callback():
+	with PyPIJSON() as client:
+		adapter = FakeAdapter(handler)
+		client.endpoint.session.mount("https://", adapter)
+		assert client.get_metadata("foo").name == "foo"
+		assert client.download_file("https://files.pythonhosted.org/foo-1.0.0.tar.gz").status_code == 200
+		assert len(adapter.requests) == 2
+
+
+def test_get_retry_count():
+	response = make_response(200)
+	assert get_retry_count(response) == 0
+
+	response.throttle_retries = 2  # type: ignore[attr-defined]
+	assert get_retry_count(response) == 2
@@ -0,0 +1,164 @@
+# stdlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import List
+
+# 3rd party
+import pytest
+
+# this package
+from pypi_json.ratelimit import AdaptiveConcurrency, RateLimiter, TokenBucket, parse_retry_after
+from tests.utils import make_response
+
+
+class FakeClock:
+
+	def __init__(self):
+		self.now = 0.0
+		self.sleeps: List[float] = []
+
+	def __call__(self) -> float:
+		return self.now
+
+	def sleep(self, seconds: float) -> None:
+		self.sleeps.append(seconds)
+		self.now += seconds
+
+
+def test_parse_retry_after():
+	assert parse_retry_after(None) is None
+	assert parse_retry_after('') is None
+	assert parse_retry_after("120") == 120
+	assert parse_retry_after(" 0 ") == 0
+	assert parse_retry_after("soon") is None
+
+	retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+	assert 25 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30  # type: ignore[operator]
+
+	assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_token_bucket():
+	clock = FakeClock()
+	bucket = TokenBucket(10, capacity=2, clock=clock, sleep=clock.sleep)
+
+	assert bucket.try_acquire() == 0
+	assert bucket.try_acquire() == 0
+	assert bucket.try_acquire() == pytest.approx(0.1)
+
+	assert bucket.acquire() == pytest.approx(0.1)
+	assert clock.sleeps == [pytest.approx(0.1)]
+
+	# Tokens accumulate up to the capacity
+	clock.now += 10
+	assert bucket.try_acquire(2) == 0
+	assert bucket.try_acquire() == pytest.approx(0.1)
+
+	with pytest.raises(ValueError, match="Cannot acquire more than 2 tokens at once"):
+		bucket.try_acquire(3)
+
+	with pytest.raises(ValueError, match="'rate' must be greater than zero"):
+		TokenBucket(0)
+
+	assert TokenBucket(0.5).capacity == 1
+	assert TokenBucket(20).capacity == 20
+
+
+def test_adaptive_concurrency():
+	concurrency = AdaptiveConcurrency(maximum=8, minimum=2)
+	assert concurrency.limit == 8
+
+	tokens = [concurrency.acquire() for _ in range(4)]
+	assert concurrency.in_flight == 4
+
+	# Only the first of a batch of throttled operations reduces the limit
+	for token in tokens:
+		concurrency.release(token, throttled=True)
+	assert concurrency.limit == 4
+	assert concurrency.in_flight == 0
+
+	concurrency.release(concurrency.acquire(), throttled=True)
+	concurrency.release(concurrency.acquire(), throttled=True)
+	assert concurrency.limit == 2
+
+	# Additive increase: about one per window of successful operations
+	for _ in range(4):
+		concurrency.release(concurrency.acquire())
+	assert concurrency.limit == 3
+
+	concurrency.release(concurrency.acquire(), adjust=False)
+	assert concurrency.limit == 3
+
+	for _ in range(100):
+		concurrency.release(concurrency.acquire())
+	assert concurrency.limit == 8
+
+	with pytest.raises(ValueError, match="'maximum' must be at least 'minimum'"):
+		AdaptiveConcurrency(maximum=1, minimum=2)
+
+
+def test_adaptive_concurrency_blocks():
+	concurrency = AdaptiveConcurrency(maximum=2)
+	active = 0
+	max_active = 0
+	lock = threading.Lock()
+
+	def work() -> None:
+		nonlocal active, max_active
+		token = concurrency.acquire()
+		with lock:
+			active += 1
+			max_active = max(max_active, active)
+		time.sleep(0.01)
+		with lock:
+			active -= 1
+		concurrency.release(token)
+
+	threads = [threading.Thread(target=work) for _ in range(8)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert max_active == 2
+
+
+def test_rate_limiter():
+	rate_limiter = RateLimiter(max_concurrency=4, backoff_factor=0.25, max_delay=5)
+	assert repr(rate_limiter) == "<RateLimiter(rate=None, concurrency=4)>"
+
+	token = rate_limiter.acquire()
+	assert not rate_limiter.release(token, make_response(200))
+	assert rate_limiter.throttled == 0
+
+	token = rate_limiter.acquire()
+	assert rate_limiter.release(token, make_response(429))
+	assert rate_limiter.throttled == 1
+	assert rate_limiter.concurrency.limit == 2
+
+	token = rate_limiter.acquire()
+	assert not rate_limiter.release(token, None)
+	assert rate_limiter.concurrency.in_flight == 0
+
+	assert rate_limiter.get_retry_delay(make_response(503), 0) == 0.25
+	assert rate_limiter.get_retry_delay(make_response(503), 2) == 1
+	assert rate_limiter.get_retry_delay(make_response(503), 10) == 5
+	assert rate_limiter.get_retry_delay(make_response(429, headers={"Retry-After": '2'}), 0) == 2
+	assert rate_limiter.get_retry_delay(make_response(429, headers={"Retry-After": "3600"}), 0) == 5
+
+	rate_limiter.pause(0.05)
+	start = time.monotonic()
+	rate_limiter.release(rate_limiter.acquire(), None)
+	assert time.monotonic() - start >= 0.04
+
+	assert repr(RateLimiter(rate=5)) == "<RateLimiter(rate=5, concurrency=10)>"
+
+	rate_limiter = RateLimiter(pause_on_throttle=True)
+	assert rate_limiter.backoff(make_response(429, headers={"Retry-After": '0'}), 0) == 0
+
+	rate_limiter.backoff(make_response(503), 0)
+	start = time.monotonic()
+	rate_limiter.release(rate_limiter.acquire(), None)
+	assert time.monotonic() - start >= 0.4
@@ -0,0 +1,277 @@
+# stdlib
+import hashlib
+import io
+import json
+import threading
+import time
+from typing import Any, Dict
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+from packaging.requirements import InvalidRequirement
+from packaging.version import Version
+
+# this package
+import pypi_json.snapshot
+from pypi_json import ProjectMetadata, PyPIJSON
+from pypi_json.ratelimit import RateLimiter
+from pypi_json.snapshot import SnapshotAdapter, build_snapshot, main, open_snapshot
+from tests.utils import FakeAdapter, make_response
+
+SDIST = b"sdist contents"
+WHEEL = b"wheel contents"
+
+
+def make_file(filename: str, content: bytes) -> Any:
+	return {
+			"filename": filename,
+			"url": f"https://files.pythonhosted.org/packages/ab/cd/{filename}",
+			"digests": {"sha256": hashlib.sha256(content).hexdigest()},
+			"size": len(content),
+			}
+
+
+RELEASES = {
+		"0.9": [make_file("foo-0.9.tar.gz", SDIST)],
+		"1.0.0": [make_file("foo-1.0.0.tar.gz", SDIST), make_file("foo-1.0.0-py3-none-any.whl", WHEEL)],
+		}
+
+
+def handler(request: requests.PreparedRequest) -> requests.Response:
+	url = request.url or ''
+
+	if url.startswith("https://files.pythonhosted.org/"):
+		return make_response(200, WHEEL if url.endswith(".whl") else SDIST)
+
+	parts = url.split('/')[4:-1]
+	if parts[0] != "Foo":
+		return make_response(404)
+
+	version = parts[1] if len(parts) == 3 else "1.0.0"
+	document = {
+			"info": {"name": "Foo", "version": version},
+			"last_serial": 1,
+			"urls": RELEASES[version],
+			}
+	if len(parts) == 2:
+		document["releases"] = RELEASES
+
+	return make_response(200, json.dumps(document).encode("UTF-8"))
+
+
+@pytest.fixture()
+def client() -> PyPIJSON:
+	client = PyPIJSON()
+	client.endpoint.session.mount("https://", FakeAdapter(handler))
+	return client
+
+
+def test_build_snapshot(tmp_pathplus: PathPlus, client: PyPIJSON):
+	results = dict(build_snapshot(client, ["Foo", "Bar"], tmp_pathplus, versions=True, files="latest"))
+
+	assert results["Foo"].last_serial == 1  # type: ignore[union-attr]
+	assert isinstance(results["Bar"], InvalidRequirement)
+
+	assert sorted(p.relative_to(tmp_pathplus).as_posix() for p in tmp_pathplus.rglob('*') if p.is_file()) == [
+			"files/foo-1.0.0-py3-none-any.whl",
+			"files/foo-1.0.0.tar.gz",
+			"foo/0.9/json",
+			"foo/1.0.0/json",
+			"foo/json",
+			]
+
+	list(build_snapshot(client, ["Foo"], tmp_pathplus, files="all"))
+	assert (tmp_pathplus / "files" / "foo-0.9.tar.gz").read_bytes() == SDIST
+
+	with pytest.raises(ValueError, match="Unknown value for 'files': 'some'"):
+		list(build_snapshot(client, ["Foo"], tmp_pathplus, files="some"))
+
+
+def test_build_snapshot_concurrency(tmp_pathplus: PathPlus):
+	lock = threading.Lock()
+	active = peak = 0
+	projects = [f"project{i}" for i in range(8)]
+
+	def slow_handler(request: requests.PreparedRequest) -> requests.Response:
+		nonlocal active, peak
+
+		url = request.url or ''
+		if not url.startswith("https://files.pythonhosted.org/"):
+			name = url.split('/')[4]
+			urls = [make_file(f"{name}-1.0-{i}.tar.gz", SDIST) for i in range(4)]
+			document = {"info": {"name": name, "version": "1.0"}, "last_serial": 1, "urls": urls}
+			return make_response(200, json.dumps(document).encode("UTF-8"))
+
+		with lock:
+			active += 1
+			peak = max(peak, active)
+
+		time.sleep(0.01)
+
+		with lock:
+			active -= 1
+
+		if url.endswith("project3-1.0-2.tar.gz"):
+			return make_response(500)
+		return make_response(200, SDIST)
+
+	client = PyPIJSON()
+	client.endpoint.session.mount("https://", FakeAdapter(slow_handler))
+
+	results = dict(build_snapshot(client, projects, tmp_pathplus, files="latest", max_workers=3))
+
+	assert sorted(results) == projects
+	assert isinstance(results.pop("project3"), requests.HTTPError)
+	assert all(isinstance(metadata, ProjectMetadata) for metadata in results.values())
+	assert len(list((tmp_pathplus / "files").iterdir())) == 31
+	assert peak <= 3
+
+
+def test_build_snapshot_unsafe_versions(tmp_pathplus: PathPlus):
+
+	def unsafe_handler(request: requests.PreparedRequest) -> requests.Response:
+		name = (request.url or '').split('/')[4]
+		releases = {"1.0": [], "../../../escaped": []} if name == "Evil" else {"1.0": []}
+		document = {"info": {"name": name, "version": "1.0"}, "last_serial": 1, "urls": [], "releases": releases}
+		return make_response(200, json.dumps(document).encode("UTF-8"))
+
+	client = PyPIJSON()
+	client.endpoint.session.mount("https://", FakeAdapter(unsafe_handler))
+
+	results = dict(build_snapshot(client, ["Evil", "Good"], tmp_pathplus / "snapshot", versions=True))
+	assert isinstance(results["Good"], ProjectMetadata)
+	assert str(results["Evil"]) == "Unsafe path component '../../../escaped' in response from the index"
+
+	assert not (tmp_pathplus / "escaped").exists()
+	assert not (tmp_pathplus / "snapshot" / "evil").exists()
+	assert (tmp_pathplus / "snapshot" / "good" / "1.0" / "json").is_file()
+
+
+def test_build_snapshot_duplicates(tmp_pathplus: PathPlus):
+	index = FakeAdapter(handler)
+	client = PyPIJSON()
+	client.endpoint.session.mount("https://", index)
+
+	results = list(build_snapshot(client, ["Foo", "foo", "FOO"], tmp_pathplus))
+	assert [project for project, _ in results] == ["Foo"]
+	assert len(index.requests) == 1
+
+
+def test_build_snapshot_unsafe_filename(tmp_pathplus: PathPlus):
+
+	def unsafe_handler(request: requests.PreparedRequest) -> requests.Response:
+		file = make_file("foo-1.0.tar.gz", SDIST)
+		file["filename"] = "../foo-1.0.tar.gz"
+		document = {"info": {"name": "Foo", "version": "1.0"}, "last_serial": 1, "urls": [file]}
+		return make_response(200, json.dumps(document).encode("UTF-8"))
+
+	client = PyPIJSON()
+	client.endpoint.session.mount("https://", FakeAdapter(unsafe_handler))
+
+	(project, result), = build_snapshot(client, ["Foo"], tmp_pathplus / "snapshot", files="latest")
+	assert isinstance(result, ValueError)
+	assert not (tmp_pathplus / "foo-1.0.tar.gz").exists()
+
+
+def test_open_snapshot(tmp_pathplus: PathPlus, client: PyPIJSON):
+	list(build_snapshot(client, ["Foo"], tmp_pathplus, versions=True, files="latest"))
+
+	with open_snapshot(tmp_pathplus) as offline:
+		metadata = offline.get_metadata("foo")
+		assert metadata.version == Version("1.0.0")
+		assert offline.get_metadata("Foo", "0.9").version == Version("0.9")
+		assert offline.get_metadata("Foo", Version("1.0")).version == Version("1.0.0")
+
+		with pytest.raises(InvalidRequirement, match="No such project 'Bar'"):
+			offline.get_metadata("Bar")
+
+		with pytest.raises(InvalidRequirement, match="No such project/version 'Foo' 2.0"):
+			offline.get_metadata("Foo", "2.0")
+
+		wheel = metadata.urls[1]
+		assert offline.download_file(wheel["url"]).content == WHEEL
+		assert offline.download_file(metadata.releases["0.9"][0]["url"]).status_code == 404  # type: ignore[index]
+
+		buffer = io.BytesIO()
+		assert offline.download_to(wheel, buffer) == wheel["digests"]["sha256"]
+		assert buffer.getvalue() == WHEEL
+
+		(tmp_pathplus / "out").mkdir()
+		offline.download_to(wheel, tmp_pathplus / "out")
+		assert (tmp_pathplus / "out" / "foo-1.0.0-py3-none-any.whl").read_bytes() == WHEEL
+
+
+@pytest.mark.parametrize(
+		"kwargs",
+		[
+				pytest.param({"retries": 3}, id="retries"),
+				pytest.param({"rate_limiter": RateLimiter()}, id="rate_limiter"),
+				pytest.param({"pool_maxsize": 50}, id="pool_maxsize"),
+				pytest.param({"keep_alive": False}, id="keep_alive"),
+				]
+		)
+def test_open_snapshot_transport_options(tmp_pathplus: PathPlus, kwargs: Dict[str, Any]):
+	# These would replace the SnapshotAdapter and send requests to the network
+	with pytest.raises(ValueError, match="custom transport adapter"):
+		open_snapshot(tmp_pathplus, **kwargs)
+
+
+def test_snapshot_adapter(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "foo").mkdir()
+	(tmp_pathplus / "foo" / "json").write_text("{}")
+
+	adapter = SnapshotAdapter(tmp_pathplus, endpoint="https://example.com/pypi/")
+	assert repr(adapter) == f"<SnapshotAdapter({str(tmp_pathplus)!r})>"
+
+	session = requests.Session()
+	session.mount("https://", adapter)
+
+	response = session.get("https://example.com/pypi/Foo/json/")
+	assert response.status_code == 200
+	assert response.headers["Content-Length"] == "2"
+	assert response.content == b"{}"
+
+	response = session.head("https://example.com/pypi/Foo/json/")
+	assert response.status_code == 200
+	assert response.content == b''
+
+	assert session.get("https://example.com/pypi/Foo/").status_code == 404
+	assert session.get("https://example.com/pypi/Foo/a/b/json/").status_code == 404
+	assert session.get("https://example.com/").status_code == 404
+
+
+def test_snapshot_adapter_traversal(tmp_pathplus: PathPlus):
+	(tmp_pathplus / "secret").write_text("secret")
+	(tmp_pathplus / "json").write_text("{}")
+	(tmp_pathplus / "snapshot" / "files").mkdir(parents=True)
+	(tmp_pathplus / "snapshot" / "files" / "foo-1.0.tar.gz").write_bytes(SDIST)
+
+	session = requests.Session()
+	session.mount("https://", SnapshotAdapter(tmp_pathplus / "snapshot"))
+
+	assert session.get("https://files.pythonhosted.org/ab/foo-1.0.tar.gz").content == SDIST
+
+	for url in [
+			"https://files.pythonhosted.org/ab/..%2Fsecret",
+			"https://files.pythonhosted.org/ab/..%2F..%2Fsecret",
+			"https://files.pythonhosted.org/ab/%2E%2E",
+			"https://pypi.org/pypi/..%2F..%2F/json",
+			"https://pypi.org/pypi/foo/..%2F..%2F../json",
+			"https://pypi.org/pypi/../json",
+			]:
+		assert session.get(url).status_code == 404, url
+
+
+def test_main(tmp_pathplus: PathPlus, client: PyPIJSON, monkeypatch, capsys):
+	monkeypatch.setattr(pypi_json.snapshot, "PyPIJSON", lambda endpoint: client)
+
+	assert main([str(tmp_pathplus), "Foo", "--files", "latest"]) == 0
+	assert capsys.readouterr().out == "Saved foo (last_serial 1)\n"
+	assert (tmp_pathplus / "foo" / "json").is_file()
+	assert (tmp_pathplus / "files" / "foo-1.0.0.tar.gz").is_file()
+	assert not (tmp_pathplus / "foo" / "1.0.0").exists()
+
+	assert main([str(tmp_pathplus), "Bar"]) == 1
+	assert capsys.readouterr().err == "Failed to save Bar: No such project 'Bar'\n"
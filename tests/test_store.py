@@ -0,0 +1,136 @@
+# stdlib
+import json
+import os
+from typing import Dict
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+from packaging.requirements import InvalidRequirement
+from packaging.version import Version
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.cache import MemoryCache
+from pypi_json.store import MetadataStore, StoreEntry
+from tests.utils import FakeAdapter, make_response
+
+
+def make_document(name: str, serial: int) -> bytes:
+	return json.dumps({
+			"info": {"name": name, "version": "1.0.0"},
+			"last_serial": serial,
+			"releases": {"1.0.0": []},
+			"urls": [],
+			}).encode("UTF-8")
+
+
+class Index:
+	"""
+	A fake JSON API which supports conditional requests.
+	"""
+
+	def __init__(self, serials: Dict[str, int]):
+		self.serials = serials
+
+	def __call__(self, request: requests.PreparedRequest) -> requests.Response:
+		name = (request.url or '').split('/')[4]
+
+		if name not in self.serials:
+			return make_response(404)
+
+		etag = f'"{self.serials[name]}"'
+		if request.headers.get("If-None-Match") == etag:
+			return make_response(304, headers={"ETag": etag})
+
+		return make_response(
+				200,
+				make_document(name, self.serials[name]),
+				{"ETag": etag, "X-PyPI-Last-Serial": str(self.serials[name])},
+				)
+
+
+def test_metadata_store(tmp_pathplus: PathPlus):
+	with MetadataStore(tmp_pathplus / "store.db") as store:
+		assert repr(store) == f"<MetadataStore({os.fspath(tmp_pathplus / 'store.db')!r})>"
+		assert len(store) == 0
+		assert store.get("Foo_Bar") is None
+		assert store.read("Foo_Bar") is None
+
+		store.set("Foo_Bar", None, b"latest", last_serial=1, etag='"1"')
+		store.set("foo-bar", Version("1.0"), b"one", last_modified="yesterday")
+
+		entry = store.get("foo.bar")
+		assert entry is not None
+		assert entry._replace(fetched=0) == StoreEntry("foo-bar", None, 1, '"1"', None, 0)
+		assert entry.conditional_headers() == {"If-None-Match": '"1"'}
+		assert store.get("foo-bar", "1.0").conditional_headers() == {"If-Modified-Since": "yesterday"}  # type: ignore[union-attr]
+		assert store.read("FOO-BAR") == b"latest"
+		assert store.read("foo-bar", "1.0") == b"one"
+		assert len(store) == 2
+		assert list(store.projects()) == ["foo-bar"]
+
+		store.touch("foo-bar")
+		assert store.get("foo-bar").fetched >= entry.fetched  # type: ignore[union-attr]
+
+		store.delete("foo-bar", "1.0")
+		assert store.read("foo-bar", "1.0") is None
+		assert len(store) == 1
+
+	# Persisted between connections
+	with MetadataStore(tmp_pathplus / "store.db") as store:
+		assert store.read("foo-bar") == b"latest"
+
+		store.clear()
+		assert len(store) == 0
+
+
+def test_store_read_through(tmp_pathplus: PathPlus):
+	adapter = FakeAdapter(Index({"foo": 1}))
+
+	with MetadataStore(tmp_pathplus / "store.db") as store, PyPIJSON(store=store) as client:
+		client.endpoint.session.mount("https://", adapter)
+
+		metadata = client.get_metadata("foo")
+		assert metadata.last_serial == 1
+		assert len(adapter.requests) == 1
+		assert store.get("foo").last_serial == 1  # type: ignore[union-attr]
+
+		assert client.get_metadata("Foo") == metadata
+		assert len(adapter.requests) == 1
+
+		with pytest.raises(InvalidRequirement, match="No such project 'bar'"):
+			client.get_metadata("bar")
+
+		assert store.get("bar") is None
+
+
+def test_sync(tmp_pathplus: PathPlus):
+	index = Index({"foo": 1, "bar": 1})
+	adapter = FakeAdapter(index)
+	memory_cache = MemoryCache()
+
+	with MetadataStore(tmp_pathplus / "store.db") as store:
+		with PyPIJSON(store=store, memory_cache=memory_cache) as client:
+			client.endpoint.session.mount("https://", adapter)
+
+			assert dict(client.sync(["foo", "bar"])) == {"foo": True, "bar": True}
+			assert client.get_metadata("foo").last_serial == 1
+			assert len(adapter.requests) == 2
+
+			index.serials["foo"] = 2
+			assert dict(client.sync(["foo", "bar"])) == {"foo": True, "bar": False}
+			assert adapter.requests[-1].headers["If-None-Match"] == '"1"'
+			assert store.get("foo").last_serial == 2  # type: ignore[union-attr]
+
+			# The stale metadata was discarded from the memory cache
+			assert client.get_metadata("foo").last_serial == 2
+
+			del index.serials["bar"]
+			results = dict(client.sync(["bar"]))
+			assert isinstance(results["bar"], InvalidRequirement)
+			assert store.get("bar") is None
+
+		with pytest.raises(ValueError, match="Cannot sync without a 'store'"):
+			PyPIJSON().sync(["foo"])
@@ -0,0 +1,201 @@
+# stdlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+# 3rd party
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# this package
+from pypi_json import PyPIJSON
+from pypi_json.metrics import RequestMetrics
+from pypi_json.ratelimit import RateLimiter
+from pypi_json.transport import RETRY_STATUSES, RateLimitedAdapter, configure_session, make_retry
+from tests.utils import FakeAdapter, make_response
+
+
+class FlakyServer(ThreadingHTTPServer):
+	"""
+	Responds with ``503 Service Unavailable`` to the first ``failures`` requests.
+	"""
+
+	failures: int
+	paths: List[str]
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+	server: FlakyServer
+
+	def do_GET(self) -> None:  # noqa: N802
+		self.server.paths.append(self.path)
+
+		if self.server.failures:
+			self.server.failures -= 1
+			self.send_response(503)
+			self.send_header("Retry-After", '0')
+			self.send_header("Content-Length", '0')
+			self.end_headers()
+			return
+
+		body = b'{"info": {"name": "foo", "version": "1.0"}, "last_serial": 1}'
+		self.send_response(200)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args) -> None:  # noqa: MAN002
+		pass
+
+
+@pytest.fixture()
+def server() -> Iterator[FlakyServer]:
+	server = FlakyServer(("127.0.0.1", 0), FlakyHandler)
+	server.failures = 0
+	server.paths = []
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+
+	try:
+		yield server
+	finally:
+		server.shutdown()
+		server.server_close()
+
+
+def test_make_retry():
+	retry = make_retry()
+	assert retry.total == 3
+	assert retry.backoff_factor == 0.5
+	assert retry.status_forcelist == RETRY_STATUSES
+	assert retry.respect_retry_after_header
+	assert not retry.raise_on_status
+	assert retry.is_retry("GET", 429, has_retry_after=True)
+	assert not retry.is_retry("POST", 503)
+	assert not retry.is_retry("GET", 404)
+
+	assert make_retry(5, backoff_factor=0, status_forcelist=[503]).status_forcelist == {503}
+
+
+def test_configure_session():
+	session = requests.Session()
+	adapter = configure_session(session, pool_connections=4, pool_maxsize=32, retries=2, keep_alive=False)
+
+	assert session.get_adapter("https://pypi.org") is adapter
+	assert session.get_adapter("http://localhost") is adapter
+	assert adapter._pool_connections == 4  # type: ignore[attr-defined]
+	assert adapter._pool_maxsize == 32  # type: ignore[attr-defined]
+	assert adapter.max_retries.total == 2
+	assert session.headers["Connection"] == "close"
+
+	retry = Retry(total=1)
+	assert configure_session(requests.Session(), retries=retry).max_retries is retry
+	assert configure_session(requests.Session()).max_retries.total == 0
+
+	# Custom adapters are not replaced
+	session = requests.Session()
+	fake_adapter = FakeAdapter(lambda request: make_response(200))
+	session.mount("https://", fake_adapter)
+
+	with pytest.raises(ValueError, match="custom transport adapter"):
+		configure_session(session, retries=3)
+
+	with pytest.raises(ValueError, match="custom transport adapter"):
+		PyPIJSON(session=session, rate_limiter=RateLimiter())
+
+	assert session.get_adapter("https://pypi.org") is fake_adapter
+
+	# Nor are subclasses of HTTPAdapter, such as caching adapters
+	class CachingAdapter(HTTPAdapter):
+		pass
+
+	session = requests.Session()
+	caching_adapter = CachingAdapter()
+	session.mount("http://", caching_adapter)
+
+	with pytest.raises(ValueError, match="custom transport adapter"):
+		configure_session(session, pool_maxsize=16)
+
+	assert session.get_adapter("http://localhost") is caching_adapter
+
+	# The adapters mounted by configure_session itself can be reconfigured
+	session = requests.Session()
+	configure_session(session, rate_limiter=RateLimiter())
+	adapter = configure_session(session, pool_maxsize=16)
+	assert type(adapter) is HTTPAdapter
+	assert session.get_adapter("https://pypi.org") is adapter
+
+
+def test_client_options():
+	client = PyPIJSON(pool_maxsize=50, retries=3)
+	adapter = client.endpoint.session.get_adapter("https://pypi.org")
+	assert isinstance(adapter, HTTPAdapter)
+	assert adapter._pool_maxsize == 50  # type: ignore[attr-defined]
+	assert adapter.max_retries.total == 3
+	assert client.endpoint.session.headers["Connection"] == "keep-alive"
+
+	# A session passed in is left alone unless options are given
+	session = requests.Session()
+	original_adapter = session.get_adapter("https://pypi.org")
+	assert PyPIJSON(session=session).endpoint.session.get_adapter("https://pypi.org") is original_adapter
+
+	PyPIJSON(session=session, keep_alive=False)
+	assert session.get_adapter("https://pypi.org") is not original_adapter
+	assert session.headers["Connection"] == "close"
+
+
+def test_retries(server: FlakyServer):
+	endpoint = f"http://127.0.0.1:{server.server_address[1]}/pypi"
+	server.failures = 2
+
+	recorded: List[RequestMetrics] = []
+
+	with PyPIJSON(endpoint, retries=make_retry(3, backoff_factor=0), metrics_callback=recorded.append) as client:
+		assert client.get_metadata("foo").last_serial == 1
+		assert server.paths == ["/pypi/foo/json/"] * 3
+		assert recorded[0].retries == 2
+
+	server.failures = 5
+
+	with PyPIJSON(endpoint, retries=make_retry(1, backoff_factor=0)) as client:
+		with pytest.raises(requests.HTTPError, match="HTTP Status 503"):
+			client.get_metadata("foo")
+
+
+def test_rate_limiter(server: FlakyServer):
+	endpoint = f"http://127.0.0.1:{server.server_address[1]}/pypi"
+	rate_limiter = RateLimiter(max_concurrency=4, max_retries=3)
+	recorded: List[RequestMetrics] = []
+
+	with PyPIJSON(endpoint, rate_limiter=rate_limiter, retries=2) as client:
+		adapter = client.endpoint.session.get_adapter(endpoint)
+		assert isinstance(adapter, RateLimitedAdapter)
+		assert adapter.rate_limiter is rate_limiter
+
+		# 503 is left to the rate limiter
+		assert adapter.max_retries.status_forcelist == {500, 502, 504}
+
+		server.failures = 2
+		assert client.get_metadata("foo").last_serial == 1
+		assert server.paths == ["/pypi/foo/json/"] * 3
+		assert rate_limiter.throttled == 2
+
+		client.metrics_callback = recorded.append
+		server.failures = 1
+		client.get_metadata("baz")
+		assert recorded[-1].retries == 1
+		client.metrics_callback = None
+		assert rate_limiter.concurrency.limit == 2
+		assert rate_limiter.concurrency.in_flight == 0
+
+		server.failures = 5
+		with pytest.raises(requests.HTTPError, match="HTTP Status 503"):
+			client.get_metadata("bar")
+		assert rate_limiter.throttled == 7
+
+		for project, metadata in client.get_many_metadata(f"project-{i}" for i in range(20)):
+			assert not isinstance(metadata, Exception)
+
+		assert rate_limiter.concurrency.limit == 4
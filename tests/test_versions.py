@@ -0,0 +1,123 @@
+# stdlib
+import pickle
+from typing import Dict, List
+
+# 3rd party
+import pytest
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+
+# this package
+from pypi_json import ProjectMetadata
+from pypi_json.typehints import DistributionPackageDict
+from pypi_json.versions import VersionIndex
+
+RELEASES: Dict[str, List[DistributionPackageDict]] = {
+		"0.1.0": [{"yanked": False}],  # type: ignore[typeddict-item]
+		"0.10.0": [{"yanked": False}],  # type: ignore[typeddict-item]
+		"0.2.0": [{"yanked": False}],  # type: ignore[typeddict-item]
+		"1.0.0": [{"yanked": False}, {"yanked": False}],  # type: ignore[typeddict-item]
+		"1.0.1": [],
+		"1.1.0": [{"yanked": True}],  # type: ignore[typeddict-item]
+		"2.0.0rc1": [{"yanked": False}],  # type: ignore[typeddict-item]
+		"not-a-version": [],
+		}
+
+
+def test_version_index():
+	index = VersionIndex(RELEASES)
+
+	assert len(index) == 7
+	assert repr(index) == "<VersionIndex(7 versions)>"
+	assert index.versions == [
+			Version("0.1.0"),
+			Version("0.2.0"),
+			Version("0.10.0"),
+			Version("1.0.0"),
+			Version("1.0.1"),
+			Version("1.1.0"),
+			Version("2.0.0rc1"),
+			]
+	assert list(reversed(index))[0] == Version("2.0.0rc1")
+
+	assert "1.0" in index
+	assert Version("1.0.0") in index
+	assert "3.0" not in index
+	assert "not-a-version" not in index
+
+	assert index.key_for("1.0") == "1.0.0"
+	assert index.key_for(Version("0.10")) == "0.10.0"
+
+	with pytest.raises(KeyError):
+		index.key_for("3.0")
+
+	with pytest.raises(KeyError):
+		index.key_for("not-a-version")
+
+
+def test_version_index_latest():
+	index = VersionIndex(RELEASES)
+
+	assert index.latest() == Version("2.0.0rc1")
+	assert index.latest(prereleases=False) == Version("1.1.0")
+	assert index.latest(prereleases=False, yanked=False) == Version("1.0.1")
+
+	assert index.is_yanked("1.1.0")
+	assert not index.is_yanked("1.0.1")
+
+	assert VersionIndex({}).latest() is None
+	assert VersionIndex({"1.0rc1": []}).latest(prereleases=False) is None
+
+
+@pytest.mark.parametrize(
+		"specifier",
+		[
+				">=0.2",
+				">0.2",
+				"<=1.0",
+				"<1.0",
+				"==1.0",
+				"==1.*",
+				"!=1.0.0",
+				"~=0.2",
+				">=0.2,<1.1",
+				">1.0,<=1.1",
+				">=1.0,<1.0",
+				">=2.0.0rc1",
+				"===1.0.0",
+				"<3",
+				]
+		)
+@pytest.mark.parametrize("prereleases", [None, True, False])
+def test_version_index_filter(specifier: str, prereleases: bool):
+	index = VersionIndex(RELEASES)
+	expected = list(SpecifierSet(specifier).filter(index.versions, prereleases=prereleases))
+
+	assert index.filter(specifier, prereleases=prereleases) == expected
+	assert index.filter(SpecifierSet(specifier), prereleases=prereleases) == expected
+
+
+def test_version_index_filter_local():
+	index = VersionIndex({"1.0": [], "1.0+local": [], "1.1": []})
+
+	assert index.filter("==1.0") == [Version("1.0"), Version("1.0+local")]
+	assert index.filter("<=1.0") == [Version("1.0"), Version("1.0+local")]
+	assert index.filter(">1.0") == [Version("1.1")]
+
+
+def test_project_metadata_version_index():
+	metadata = ProjectMetadata(info={"name": "foo", "version": "1.0.0"}, last_serial=1, releases=RELEASES)  # type: ignore[typeddict-item]
+
+	assert metadata.version_index is metadata.version_index
+	assert metadata.version is metadata.version
+	assert metadata.get_latest_version() == Version("2.0.0rc1")
+	assert metadata.get_latest_version(prereleases=False) == Version("1.1.0")
+	assert metadata.get_latest_version(prereleases=False, yanked=False) == Version("1.0.1")
+
+	with pytest.raises(ValueError, match="No matching versions found."):
+		ProjectMetadata(info={}, last_serial=1, releases={}).get_latest_version()  # type: ignore[typeddict-item]
+
+	unpickled = pickle.loads(pickle.dumps(metadata))  # nosec: B301
+	assert unpickled == metadata
+	assert "_version_index" not in unpickled.__dict__
+	assert metadata._replace(last_serial=2).version_index is not metadata.version_index
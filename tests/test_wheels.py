@@ -0,0 +1,132 @@
+# stdlib
+from typing import Iterator, List
+
+# 3rd party
+import pytest
+from betamax import Betamax  # type: ignore[import]
+from packaging.tags import Tag, compatible_tags, cpython_tags, sys_tags
+
+# this package
+from pypi_json import ProjectMetadata, PyPIJSON
+from pypi_json.wheels import WheelTagIndex, parse_wheel_tags, tag_priorities
+
+
+@pytest.fixture(scope="module")
+def numpy_metadata() -> Iterator[ProjectMetadata]:
+	with PyPIJSON() as client, Betamax(client.endpoint.session) as vcr:
+		vcr.use_cassette("test_get_wheel_tag_mapping[numpy]", record="none")
+		yield client.get_metadata("numpy", "1.20.3")
+
+
+@pytest.fixture(scope="module")
+def coverage_metadata() -> Iterator[ProjectMetadata]:
+	with PyPIJSON() as client, Betamax(client.endpoint.session) as vcr:
+		vcr.use_cassette("test_get_wheel_tag_mapping[coverage]", record="none")
+		yield client.get_metadata("coverage")
+
+
+def target_tags(platform: str) -> List[Tag]:
+	return [
+			*cpython_tags(python_version=(3, 9), abis=["cp39"], platforms=[platform]),
+			*compatible_tags(python_version=(3, 9), interpreter="cp39", platforms=[platform]),
+			]
+
+
+def test_tag_priorities():
+	tags = [Tag("cp39", "cp39", "win_amd64"), Tag("py3", "none", "any"), Tag("cp39", "cp39", "win_amd64")]
+	priorities = tag_priorities(tags)
+
+	assert priorities == {Tag("cp39", "cp39", "win_amd64"): 0, Tag("py3", "none", "any"): 1}
+	assert tag_priorities(priorities) is priorities
+	assert tag_priorities() is tag_priorities()
+	assert list(tag_priorities()) == list(dict.fromkeys(sys_tags()))
+
+
+def test_wheel_tag_index():
+	files = [
+			{"filename": "foo-1.0.tar.gz"},
+			{"filename": "foo-1.0-py3-none-any.whl"},
+			{"filename": "foo-1.0-cp39-cp39-win_amd64.whl"},
+			]
+	index = WheelTagIndex(files)  # type: ignore[arg-type]
+
+	assert index.non_wheels == [files[0]]
+	assert index.wheels == {Tag("py3", "none", "any"): files[1], Tag("cp39", "cp39", "win_amd64"): files[2]}
+	assert repr(index) == "<WheelTagIndex(2 tags, 1 non-wheel files)>"
+
+	assert index.best(target_tags("win_amd64")) is files[2]
+	assert index.best(target_tags("linux_x86_64")) is files[1]
+	assert index.best([Tag("cp27", "cp27m", "win32")]) is None
+
+
+@pytest.mark.parametrize(
+		"platform, filename",
+		[
+				("manylinux2014_x86_64", None),
+				("manylinux2010_x86_64", "numpy-1.20.3-cp39-cp39-manylinux_2_12_x86_64.manylinux2010_x86_64.whl"),
+				("manylinux_2_17_aarch64", "numpy-1.20.3-cp39-cp39-manylinux_2_17_aarch64.manylinux2014_aarch64.whl"),
+				("win_amd64", "numpy-1.20.3-cp39-cp39-win_amd64.whl"),
+				("linux_armv7l", None),
+				],
+		)
+def test_select_best_wheel(numpy_metadata: ProjectMetadata, platform: str, filename: str):
+	wheel = numpy_metadata.select_best_wheel("1.20.3", target_tags(platform))
+
+	if filename is None:
+		assert wheel is None
+	else:
+		assert wheel is not None
+		assert wheel["filename"] == filename
+
+	assert numpy_metadata.select_best_wheel(tags=tag_priorities(target_tags(platform))) == wheel
+
+
+def test_select_best_wheel_cached(numpy_metadata: ProjectMetadata):
+	numpy_metadata.select_best_wheel()
+	index = numpy_metadata.__dict__["_wheel_tag_indexes"]["1.20.3"]
+
+	numpy_metadata.select_best_wheel("1.20.3")
+	numpy_metadata.get_wheel_tag_mapping("1.20.3")
+	assert numpy_metadata.__dict__["_wheel_tag_indexes"]["1.20.3"] is index
+
+
+def test_select_best_wheel_sys_tags(numpy_metadata: ProjectMetadata):
+	tag_url_map = numpy_metadata.get_wheel_tag_mapping()[0]
+	expected = next((str(tag_url_map[tag]) for tag in sys_tags() if tag in tag_url_map), None)
+
+	wheel = numpy_metadata.select_best_wheel()
+	assert (wheel and wheel["url"]) == expected
+
+
+def test_parse_wheel_tags():
+	parse_wheel_tags.cache_clear()
+
+	tags = parse_wheel_tags("numpy-1.20.3-cp39-cp39-manylinux_2_12_x86_64.manylinux2010_x86_64.whl")
+	assert tags == {Tag("cp39", "cp39", "manylinux_2_12_x86_64"), Tag("cp39", "cp39", "manylinux2010_x86_64")}
+
+	assert parse_wheel_tags("numpy-1.20.3-cp39-cp39-manylinux_2_12_x86_64.manylinux2010_x86_64.whl") is tags
+	assert parse_wheel_tags.cache_info().hits == 1
+
+
+def test_get_wheel_availability(coverage_metadata: ProjectMetadata):
+	platforms = {
+			"linux": target_tags("manylinux1_x86_64"),
+			"windows": tag_priorities(target_tags("win_amd64")),
+			"armv7l": target_tags("linux_armv7l"),
+			}
+	matrix = coverage_metadata.get_wheel_availability(platforms)
+
+	assert list(matrix) == list(coverage_metadata.releases)  # type: ignore[arg-type]
+
+	for version, row in matrix.items():
+		assert list(row) == ["linux", "windows", "armv7l"]
+
+		if coverage_metadata.releases[version]:  # type: ignore[index]
+			for platform, tags in platforms.items():
+				assert row[platform] == coverage_metadata.select_best_wheel(version, tags)
+		else:
+			assert row == {"linux": None, "windows": None, "armv7l": None}
+
+	assert matrix["5.5"]["linux"]["filename"] == "coverage-5.5-cp39-cp39-manylinux1_x86_64.whl"  # type: ignore[index]
+	assert matrix["5.5"]["windows"]["filename"] == "coverage-5.5-cp39-cp39-win_amd64.whl"  # type: ignore[index]
+	assert matrix["5.5"]["armv7l"] is None
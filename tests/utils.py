@@ -0,0 +1,36 @@
+# stdlib
+from typing import Any, Callable, Dict, List
+
+# 3rd party
+import requests
+from requests.adapters import BaseAdapter
+
+
+class FakeAdapter(BaseAdapter):
+	"""
+	A transport adapter which passes requests to ``handler`` rather than sending them over the network.
+	"""
+
+	def __init__(self, handler: Callable[[requests.PreparedRequest], requests.Response]):
+		super().__init__()
+		self.handler = handler
+		self.requests: List[requests.PreparedRequest] = []
+
+	def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+		self.requests.append(request)
+		response = self.handler(request)
+		response.request = request
+		response.url = request.url or ''
+		return response
+
+	def close(self) -> None:
+		pass
+
+
+def make_response(status_code: int, content: bytes = b'', headers: Dict[str, str] = {}) -> requests.Response:
+	response = requests.Response()
+	response.status_code = status_code
+	response._content = content
+	response._content_consumed = True
+	response.headers.update(headers)
+	return response